@@ -0,0 +1,76 @@
+"""In-process fan-out of dashboard events to Server-Sent Events subscribers"""
+import asyncio
+import json
+from typing import Any, Dict, Optional, Set
+
+
+class Subscription:
+    """A single subscriber's bounded queue of pending events"""
+
+    def __init__(self, max_pending: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.dropped = 0
+
+    def offer(self, message: str):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A stalled client loses its oldest events instead of holding up everyone else
+            self.queue.get_nowait()
+            self.queue.put_nowait(message)
+            self.dropped += 1
+
+    async def next(self, timeout: float) -> Optional[str]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broadcaster:
+    """Publishes each event once; every subscriber gets it from its own queue.
+
+    Publishing is synchronous and never awaits a subscriber, so idle or slow
+    connections cost one queue each and nothing on the write path. Events are
+    encoded once per publish, not once per subscriber.
+    """
+
+    def __init__(self, max_pending: int = 100):
+        self.max_pending = max_pending
+        self._subscribers: Set[Subscription] = set()
+        self._event_id = 0
+        self.published = 0
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.max_pending)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    def publish(self, event: str, data: Dict[str, Any]):
+        self._event_id += 1
+        self.published += 1
+        message = f"id: {self._event_id}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+        for subscription in self._subscribers:
+            subscription.offer(message)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": sum(s.dropped for s in self._subscribers),
+        }
+
+
+async def sse_events(broadcaster: Broadcaster, hello: Dict[str, Any], heartbeat_seconds: float = 15.0):
+    """Async generator feeding a StreamingResponse; comment lines keep idle proxies from closing it"""
+    subscription = broadcaster.subscribe()
+    try:
+        yield f"event: hello\ndata: {json.dumps(hello, default=str)}\n\n"
+        while True:
+            message = await subscription.next(heartbeat_seconds)
+            yield message if message is not None else ": keep-alive\n\n"
+    finally:
+        broadcaster.unsubscribe(subscription)
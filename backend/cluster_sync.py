@@ -0,0 +1,204 @@
+"""Cross-process invalidation and event fan-out for multi-worker deployments"""
+import asyncio
+import inspect
+import logging
+import os
+import socket
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Union
+
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid, DuplicateKeyError, OperationFailure
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+Handler = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+
+
+async def acquire_lease(collection, name: str, owner: str, seconds: float) -> bool:
+    """Take (or renew) a named lease unless another owner holds an unexpired one"""
+    now = datetime.utcnow()
+    try:
+        await collection.find_one_and_update(
+            {"_id": name, "$or": [{"owner": owner}, {"expires_at": {"$lt": now}}]},
+            {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=seconds)}},
+            upsert=True,
+        )
+        return True
+    except DuplicateKeyError:
+        return False
+
+
+class LeaseLostError(Exception):
+    """Another owner took over a lease while work done under it was still running"""
+
+
+async def run_with_lease(collection, name: str, owner: str, seconds: float, work: Callable[[], Awaitable[Any]]) -> Any:
+    """Run `work()` under a lease the caller holds, renewing it every third of `seconds`.
+
+    Work that outlasts a single lease term keeps it this way. If the lease is
+    lost anyway (e.g. renewals stalled past expiry and another owner took it),
+    the work is cancelled and LeaseLostError raised.
+    """
+    task = asyncio.ensure_future(work())
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=seconds / 3)
+            if done:
+                return task.result()
+            try:
+                renewed = await acquire_lease(collection, name, owner, seconds)
+            except Exception as e:
+                logging.error(f"Error renewing lease {name}: {str(e)}")
+                continue
+            if not renewed:
+                raise LeaseLostError(f"Lease {name} was taken over by another owner")
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+class ClusterSync:
+    """Relays events between worker processes through a capped collection.
+
+    ``publish()`` inserts ``{origin, type, data, at}``; every process tails the
+    collection with an awaitable tailable cursor and hands events from *other*
+    origins to the handlers registered with ``on()``. This works on a
+    standalone mongod (change streams would need a replica set) and costs one
+    small insert per published event. Delivery is best-effort: a publish that
+    fails is logged and the write it describes still succeeds, and the
+    response cache TTL bounds how long another worker can serve stale data.
+    """
+
+    def __init__(self, db, collection_name: str = "cluster_events", worker_id: str = WORKER_ID,
+                 size_bytes: int = 16 * 1024 * 1024, retry_seconds: float = 1.0):
+        self.db = db
+        self.collection_name = collection_name
+        self.collection = db[collection_name]
+        self.state_collection = db["worker_state"]
+        self.worker_id = worker_id
+        self.size_bytes = size_bytes
+        self.retry_seconds = retry_seconds
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._share_task: Optional[asyncio.Task] = None
+        self._seen: Deque[Any] = deque(maxlen=1000)
+        self._seen_set: Set[Any] = set()
+        self.published = 0
+        self.received = 0
+        self.errors = 0
+
+    def on(self, event_type: str, handler: Handler):
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    async def ensure_collection(self):
+        try:
+            await self.db.create_collection(self.collection_name, capped=True, size=self.size_bytes)
+        except (CollectionInvalid, OperationFailure):
+            # Another worker created it first
+            pass
+
+    async def publish(self, event_type: str, data: Dict[str, Any]):
+        try:
+            await self.collection.insert_one({
+                "origin": self.worker_id,
+                "type": event_type,
+                "data": data,
+                "at": datetime.utcnow(),
+            })
+            self.published += 1
+        except Exception as e:
+            self.errors += 1
+            logging.error(f"Error publishing {event_type} to other workers: {str(e)}")
+
+    def start(self, share: Optional[Callable[[], Dict[str, Any]]] = None, share_seconds: float = 10.0):
+        """Start tailing; with `share`, also publish its result as this worker's state every `share_seconds`"""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._tail())
+        if share is not None and self._share_task is None:
+            self._share_task = asyncio.ensure_future(self._share(share, share_seconds))
+
+    async def stop(self):
+        for task in (self._task, self._share_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._share_task = None
+        try:
+            await self.state_collection.delete_one({"_id": self.worker_id})
+        except Exception as e:
+            logging.error(f"Error removing worker state: {str(e)}")
+
+    async def _share(self, share: Callable[[], Dict[str, Any]], interval: float):
+        while True:
+            try:
+                await self.state_collection.replace_one(
+                    {"_id": self.worker_id},
+                    {"state": share(), "updated_at": datetime.utcnow()},
+                    upsert=True,
+                )
+            except Exception as e:
+                self.errors += 1
+                logging.error(f"Error sharing worker state: {str(e)}")
+            await asyncio.sleep(interval)
+
+    async def peer_states(self, max_age_seconds: float) -> List[Dict[str, Any]]:
+        """Latest shared state of every other live worker"""
+        cutoff = datetime.utcnow() - timedelta(seconds=max_age_seconds)
+        cursor = self.state_collection.find({"_id": {"$ne": self.worker_id}, "updated_at": {"$gte": cutoff}})
+        return [doc["state"] async for doc in cursor]
+
+    async def _tail(self):
+        # Only events published after this worker started are relevant
+        since = datetime.utcnow()
+        await self.publish("worker_started", {})
+        while True:
+            try:
+                cursor = self.collection.find({"at": {"$gte": since}}, cursor_type=CursorType.TAILABLE_AWAIT)
+                while cursor.alive:
+                    async for doc in cursor:
+                        since = doc["at"]
+                        if self._remember(doc["_id"]) and doc["origin"] != self.worker_id:
+                            await self._dispatch(doc)
+                    await asyncio.sleep(0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logging.error(f"Error tailing {self.collection_name}: {str(e)}")
+            # Dead cursor (collection rolled over or was recreated): resume from the last event seen
+            await asyncio.sleep(self.retry_seconds)
+
+    def _remember(self, event_id: Any) -> bool:
+        """False for an event already handled, e.g. when a resumed cursor re-reads the boundary timestamp"""
+        if event_id in self._seen_set:
+            return False
+        if len(self._seen) == self._seen.maxlen:
+            self._seen_set.discard(self._seen[0])
+        self._seen.append(event_id)
+        self._seen_set.add(event_id)
+        return True
+
+    async def _dispatch(self, doc: Dict[str, Any]):
+        self.received += 1
+        for handler in self._handlers.get(doc["type"], []):
+            try:
+                result = handler(doc.get("data") or {})
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logging.error(f"Error handling {doc['type']} from {doc['origin']}: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "tailing": self._task is not None and not self._task.done(),
+            "published": self.published,
+            "received": self.received,
+            "errors": self.errors,
+        }
@@ -0,0 +1,27 @@
+"""Response compression that leaves server-sent event streams alone"""
+from typing import Iterable
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class GZipExceptStreamsMiddleware:
+    """GZipMiddleware for every path except the given prefixes.
+
+    The gzip responder holds streamed chunks in the compressor until it has a
+    full block, which would delay SSE events (and heartbeats) indefinitely, so
+    event-stream routes bypass it. Streaming exports still go through it: they
+    are downloads, where compression matters more than per-chunk latency.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, compresslevel: int = 6,
+                 exclude_prefixes: Iterable[str] = ()):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.exclude_prefixes = tuple(exclude_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and not scope["path"].startswith(self.exclude_prefixes):
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
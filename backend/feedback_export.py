@@ -0,0 +1,138 @@
+"""Streaming encoders for exporting feedback documents as NDJSON, CSV or Parquet"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List
+
+EXPORT_FIELDS = [
+    "id",
+    "employee_id",
+    "feedback_text",
+    "department",
+    "timestamp",
+    "sentiment",
+    "confidence_score",
+    "processed",
+    "analysis_tier",
+]
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Bytes buffered before a chunk is handed to the response
+CHUNK_BYTES = 64 * 1024
+
+
+def _json_default(value: Any):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+async def ndjson_stream(docs: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    buffer: List[str] = []
+    size = 0
+    async for doc in docs:
+        line = json.dumps({field: doc.get(field) for field in EXPORT_FIELDS}, default=_json_default) + "\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+async def csv_stream(docs: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(EXPORT_FIELDS)
+    async for doc in docs:
+        writer.writerow([
+            value.isoformat() if isinstance(value, datetime) else ("" if value is None else value)
+            for value in (doc.get(field) for field in EXPORT_FIELDS)
+        ])
+        if out.tell() >= CHUNK_BYTES:
+            yield out.getvalue().encode("utf-8")
+            out.seek(0)
+            out.truncate()
+    if out.tell():
+        yield out.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back to the generator instead of keeping them"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+async def parquet_stream(docs: AsyncIterator[Dict[str, Any]], row_group_size: int = 10000) -> AsyncIterator[bytes]:
+    """Write one row group per `row_group_size` documents, yielding the bytes as each group completes"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.string()),
+        ("employee_id", pa.string()),
+        ("feedback_text", pa.string()),
+        ("department", pa.string()),
+        ("timestamp", pa.timestamp("ms")),
+        ("sentiment", pa.string()),
+        ("confidence_score", pa.float64()),
+        ("processed", pa.bool_()),
+        ("analysis_tier", pa.string()),
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    rows: List[Dict[str, Any]] = []
+    try:
+        async for doc in docs:
+            rows.append({field: doc.get(field) for field in EXPORT_FIELDS})
+            if len(rows) >= row_group_size:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                rows = []
+                yield sink.drain()
+        if rows:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_stream(fmt: str, docs: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    if fmt == "ndjson":
+        return ndjson_stream(docs)
+    if fmt == "csv":
+        return csv_stream(docs)
+    return parquet_stream(docs)
@@ -0,0 +1,56 @@
+"""Index definitions for the collections queried by server.py"""
+from typing import Any, Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+# Every read sorts newest first, optionally after equality filters on
+# department and/or sentiment (equality fields first, then the sort key).
+# The trailing id matches the (timestamp, id) keyset used to page get_feedback.
+FEEDBACK_INDEXES = [
+    IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    IndexModel([("timestamp", DESCENDING), ("id", DESCENDING)], name="timestamp_id"),
+    # get_feedback?department=, dashboard department filter, distinct("department")
+    IndexModel(
+        [("department", ASCENDING), ("timestamp", DESCENDING), ("id", DESCENDING)],
+        name="department_timestamp_id",
+    ),
+    # get_feedback?sentiment=, insights' negative feedback scan
+    IndexModel(
+        [("sentiment", ASCENDING), ("timestamp", DESCENDING), ("id", DESCENDING)],
+        name="sentiment_timestamp_id",
+    ),
+    # get_feedback?department=&sentiment=
+    IndexModel(
+        [("department", ASCENDING), ("sentiment", ASCENDING), ("timestamp", DESCENDING), ("id", DESCENDING)],
+        name="department_sentiment_timestamp_id",
+    ),
+    # Background sentiment queue: oldest unprocessed document first
+    IndexModel([("processed", ASCENDING), ("timestamp", ASCENDING)], name="processed_timestamp"),
+]
+
+
+async def ensure_indexes(db) -> List[str]:
+    """Create any missing indexes; a no-op for ones that already exist with the same spec"""
+    return await ensure_collection_indexes(db.employee_feedback)
+
+
+async def ensure_collection_indexes(collection) -> List[str]:
+    """ensure_indexes for one feedback collection, e.g. a monthly partition"""
+    return await collection.create_indexes(FEEDBACK_INDEXES)
+
+
+async def index_usage_report(collection) -> List[Dict[str, Any]]:
+    """Per-index operation counts since the server started, from $indexStats"""
+    stats = await collection.aggregate([{"$indexStats": {}}]).to_list(None)
+    report = []
+    for entry in stats:
+        accesses = entry.get("accesses", {})
+        report.append({
+            "name": entry["name"],
+            "key": entry.get("key", {}),
+            "ops": accesses.get("ops", 0),
+            "since": accesses.get("since"),
+            "host": entry.get("host"),
+        })
+    report.sort(key=lambda item: item["ops"], reverse=True)
+    return report
@@ -0,0 +1,128 @@
+"""Micro-batching of concurrent LLM requests into a single prompt"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Set, Tuple
+
+Pending = Tuple[Any, asyncio.Future]
+
+
+class MicroBatcher:
+    """Collects items for up to ``max_items`` or ``max_wait_ms`` and sends them as one batch.
+
+    ``send_batch`` receives the collected items and returns one result per
+    item, in order; an entry of ``None`` (or a malformed answer, i.e. a
+    ``ValueError``) sends those items through ``send_one`` individually
+    instead. Any other error (timeouts, an open circuit, a full concurrency
+    limit) is raised to every caller in the batch, since splitting it into
+    single calls would only multiply the load on a provider already failing.
+    ``max_items <= 1`` turns batching off.
+    """
+
+    def __init__(self, send_batch: Callable[[Sequence[Any]], Awaitable[List[Optional[Any]]]],
+                 send_one: Callable[[Any], Awaitable[Any]], max_items: int = 16, max_wait_ms: float = 20.0):
+        self.send_batch = send_batch
+        self.send_one = send_one
+        self.max_items = max_items
+        self.max_wait = max_wait_ms / 1000
+        self._pending: List[Pending] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.submitted = 0
+        self.batches = 0
+        self.batched_items = 0
+        self.single_calls = 0
+        self.fallback_items = 0
+        self.failed_items = 0
+
+    async def submit(self, item: Any) -> Any:
+        self.submitted += 1
+        if self.max_items <= 1:
+            self.single_calls += 1
+            return await self.send_one(item)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Pending]):
+        live = [(item, future) for item, future in batch if not future.done()]
+        if not live:
+            return
+        if len(live) == 1:
+            self.single_calls += 1
+            await self._run_one(live[0])
+            return
+
+        self.batches += 1
+        self.batched_items += len(live)
+        try:
+            results = await self.send_batch([item for item, _ in live])
+            if len(results) != len(live):
+                raise ValueError(f"expected {len(live)} results, got {len(results)}")
+        except ValueError as e:
+            # Includes json.JSONDecodeError: the provider answered, just not in a usable shape
+            logging.warning(f"Batch of {len(live)} failed, retrying items individually: {str(e)}")
+            results = [None] * len(live)
+        except Exception as e:
+            self.failed_items += len(live)
+            for _, future in live:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        retry: List[Pending] = []
+        for (item, future), result in zip(live, results):
+            if result is None:
+                retry.append((item, future))
+            elif not future.done():
+                future.set_result(result)
+        if retry:
+            self.fallback_items += len(retry)
+            await asyncio.gather(*(self._run_one(pending) for pending in retry))
+
+    async def _run_one(self, pending: Pending):
+        item, future = pending
+        try:
+            result = await self.send_one(item)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+
+    async def close(self):
+        """Send whatever is still queued and wait for in-flight batches (called on shutdown)"""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self):
+        return {
+            "max_items": self.max_items,
+            "max_wait_ms": self.max_wait * 1000,
+            "submitted": self.submitted,
+            "pending": len(self._pending),
+            "batches": self.batches,
+            "batched_items": self.batched_items,
+            "single_calls": self.single_calls,
+            "fallback_items": self.fallback_items,
+            "failed_items": self.failed_items,
+            "avg_batch_size": self.batched_items / self.batches if self.batches else 0.0,
+        }
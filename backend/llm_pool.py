@@ -0,0 +1,98 @@
+"""Pool of long-lived LLM chat sessions shared across requests"""
+import asyncio
+import inspect
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Callable, List
+
+
+def reset_chat_history(chat: Any):
+    """Drop everything but the system prompt so a pooled session starts each analysis fresh"""
+    messages = getattr(chat, "messages", None)
+    if isinstance(messages, list):
+        messages[:] = [m for m in messages if isinstance(m, dict) and m.get("role") == "system"]
+
+
+class LlmSessionPool:
+    """Fixed-size pool of chat clients created once and reused for every analysis.
+
+    Sessions are built by ``factory`` (which carries the API key, system prompt
+    and model), handed out one caller at a time and returned afterwards, so the
+    setup cost and the underlying HTTP connections are reused instead of being
+    rebuilt per request. A session whose call raised is discarded and replaced,
+    since its state can no longer be trusted.
+    """
+
+    def __init__(self, factory: Callable[[int], Any], size: int = 8):
+        self.factory = factory
+        self.size = max(1, size)
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._created = 0
+        self._closed = False
+        self.acquired = 0
+        self.discarded = 0
+
+    def _create(self) -> Any:
+        self._created += 1
+        return self.factory(self._created)
+
+    def warm(self):
+        """Create every session up front (called from the startup hook)"""
+        while self._created < self.size:
+            self._idle.put_nowait(self._create())
+
+    async def _acquire(self) -> Any:
+        if self._closed:
+            raise RuntimeError("LLM session pool is closed")
+        if self._idle.empty() and self._created < self.size:
+            return self._create()
+        return await self._idle.get()
+
+    @asynccontextmanager
+    async def session(self):
+        chat = await self._acquire()
+        self.acquired += 1
+        try:
+            yield chat
+        except BaseException:
+            self._created -= 1
+            self.discarded += 1
+            if not self._closed:
+                self._idle.put_nowait(self._create())
+            await self._close_chat(chat)
+            raise
+        reset_chat_history(chat)
+        if self._closed:
+            await self._close_chat(chat)
+        else:
+            self._idle.put_nowait(chat)
+
+    async def _close_chat(self, chat: Any):
+        for name in ("aclose", "close"):
+            closer = getattr(chat, name, None)
+            if callable(closer):
+                try:
+                    result = closer()
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    logging.error(f"Error closing LLM session: {str(e)}")
+                return
+
+    async def close(self):
+        self._closed = True
+        sessions: List[Any] = []
+        while not self._idle.empty():
+            sessions.append(self._idle.get_nowait())
+        for chat in sessions:
+            await self._close_chat(chat)
+        self._created -= len(sessions)
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "created": self._created,
+            "idle": self._idle.qsize(),
+            "acquired": self.acquired,
+            "discarded": self.discarded,
+        }
@@ -0,0 +1,353 @@
+"""Circuit breaker, adaptive concurrency limit, hedging and retries around calls to the LLM provider"""
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the provider while the breaker is open"""
+
+
+class ConcurrencyLimitError(Exception):
+    """Raised when no slot under the adaptive limit freed up in time"""
+
+
+class CircuitBreaker:
+    """Trips on the error or slow-call rate over the last ``window_size`` calls.
+
+    closed -> open when at least ``min_calls`` outcomes are recorded and the
+    share of failed or slow ones reaches ``failure_rate``. After
+    ``open_seconds`` it goes half-open and lets ``half_open_probes`` calls
+    through; one good probe closes it, one bad probe reopens it.
+    """
+
+    def __init__(self, failure_rate: float = 0.5, window_size: int = 20, min_calls: int = 10,
+                 slow_call_seconds: float = 15.0, open_seconds: float = 30.0, half_open_probes: int = 1):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._state = "closed"
+        self._opened_at = 0.0
+        self._probes = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == "open" and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = "half_open"
+            self._probes = 0
+        return self._state
+
+    def allow(self) -> bool:
+        """Admit a call, counting it as a probe while half-open"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and self._probes < self.half_open_probes:
+            self._probes += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def release(self):
+        """Give back a half-open probe whose call never reached the provider"""
+        if self._state == "half_open" and self._probes > 0:
+            self._probes -= 1
+
+    def record(self, ok: bool, elapsed: float):
+        bad = not ok or elapsed >= self.slow_call_seconds
+        if self._state == "half_open":
+            if bad:
+                self._trip()
+            else:
+                self._state = "closed"
+                self._outcomes.clear()
+            return
+        self._outcomes.append(bad)
+        if (self._state == "closed" and len(self._outcomes) >= self.min_calls
+                and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate):
+            self._trip()
+
+    def _trip(self):
+        self._state = "open"
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.times_opened += 1
+
+    def stats(self) -> Dict[str, Any]:
+        state = self.state
+        return {
+            "state": state,
+            "window_calls": len(self._outcomes),
+            "window_failure_rate": sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0,
+            "retry_in_seconds": max(0.0, self.open_seconds - (time.monotonic() - self._opened_at)) if state == "open" else 0.0,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+class AdaptiveLimit:
+    """AIMD limit on outstanding calls: +1/limit per good call, halved on a failed or slow one"""
+
+    def __init__(self, initial: float = 8, min_limit: float = 1, max_limit: float = 64,
+                 decrease_factor: float = 0.5, slow_call_seconds: float = 15.0, queue_timeout: float = 5.0):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.slow_call_seconds = slow_call_seconds
+        self.queue_timeout = queue_timeout
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.in_flight = 0
+        self._changed = asyncio.Condition()
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self._changed:
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait_for(lambda: self.in_flight < int(self.limit)),
+                    timeout=self.queue_timeout
+                )
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise ConcurrencyLimitError(f"{self.in_flight} LLM calls outstanding (limit {int(self.limit)})")
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._changed:
+                self.in_flight -= 1
+                self._changed.notify_all()
+
+    def record(self, ok: bool, elapsed: float):
+        if ok and elapsed < self.slow_call_seconds:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        else:
+            self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "limit_exact": round(self.limit, 3),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+        }
+
+
+class LlmGuard:
+    """Admits a provider call through the breaker and the concurrency limit, then records how it went"""
+
+    def __init__(self, breaker: CircuitBreaker, limiter: AdaptiveLimit):
+        self.breaker = breaker
+        self.limiter = limiter
+
+    def check(self):
+        """Fail fast without consuming a half-open probe, e.g. before queueing work for the LLM"""
+        if self.breaker.state == "open":
+            self.breaker.rejected += 1
+            raise CircuitOpenError("LLM circuit breaker is open")
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.breaker.allow():
+            raise CircuitOpenError("LLM circuit breaker is open")
+        recorded = False
+        try:
+            async with self.limiter.slot():
+                started = time.monotonic()
+                try:
+                    result = await fn()
+                except asyncio.CancelledError:
+                    # A cancelled call (e.g. a losing hedge) says nothing about the provider
+                    raise
+                except Exception:
+                    self._record(False, time.monotonic() - started)
+                    recorded = True
+                    raise
+                self._record(True, time.monotonic() - started)
+                recorded = True
+                return result
+        finally:
+            if not recorded:
+                self.breaker.release()
+
+    def _record(self, ok: bool, elapsed: float):
+        self.breaker.record(ok, elapsed)
+        self.limiter.record(ok, elapsed)
+
+    def record_timeout(self, elapsed: float):
+        """A call cut off by its latency budget counts as a failure even though it was cancelled"""
+        self._record(False, elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"breaker": self.breaker.stats(), "concurrency": self.limiter.stats()}
+
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+RETRYABLE_ERROR_NAMES = ("timeout", "ratelimit", "connection", "overloaded", "internalserver", "serviceunavailable")
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Transient provider errors (timeouts, throttling, 5xx) are worth retrying; bad requests are not"""
+    if isinstance(exc, (CircuitOpenError, ConcurrencyLimitError)):
+        return False
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    status = getattr(exc, "status_code", None) or getattr(exc, "status", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS_CODES
+    name = type(exc).__name__.lower().replace("_", "")
+    return any(part in name for part in RETRYABLE_ERROR_NAMES)
+
+
+class LatencyTracker:
+    """Quantiles over the most recent successful call latencies"""
+
+    def __init__(self, window_size: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window_size)
+
+    def observe(self, seconds: float):
+        self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class HedgedCaller:
+    """Runs guarded calls under a total latency budget, with a hedge past the observed p95 and jittered retries.
+
+    If the first attempt has not answered after the ``hedge_quantile`` latency
+    seen for that kind of call (but at least ``hedge_min_delay``), one
+    duplicate is started and whichever answers first wins; the other is
+    cancelled. Hedges are skipped while the breaker is not closed or the
+    concurrency limit is full, so they never add load to a struggling
+    provider. Retryable errors are retried with full-jitter exponential
+    backoff for up to ``max_attempts``, as long as the budget allows.
+    """
+
+    def __init__(self, guard: LlmGuard, budget_seconds: float = 20.0, hedge: bool = True,
+                 hedge_quantile: float = 0.95, hedge_min_delay: float = 0.5, max_attempts: int = 3,
+                 backoff_base: float = 0.25, backoff_max: float = 4.0):
+        self.guard = guard
+        self.budget_seconds = budget_seconds
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay = hedge_min_delay
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._latency: Dict[str, LatencyTracker] = {}
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.failures = 0
+
+    def _tracker(self, kind: str) -> LatencyTracker:
+        if kind not in self._latency:
+            self._latency[kind] = LatencyTracker()
+        return self._latency[kind]
+
+    def hedge_delay(self, kind: str) -> Optional[float]:
+        if not self.hedge:
+            return None
+        observed = self._tracker(kind).quantile(self.hedge_quantile)
+        return None if observed is None else max(self.hedge_min_delay, observed)
+
+    async def call(self, fn: Callable[[], Awaitable[Any]], kind: str = "default") -> Any:
+        self.calls += 1
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.budget_seconds
+        attempt = 0
+        while True:
+            attempt += 1
+            self.attempts += 1
+            try:
+                async with asyncio.timeout_at(deadline) as budget:
+                    return await self._hedged(fn, kind)
+            except Exception as e:
+                # A TimeoutError raised by the provider itself is an ordinary, retryable failure
+                # that the guard has already recorded; only the budget running out is recorded here
+                if budget.expired():
+                    self.timeouts += 1
+                    self.failures += 1
+                    self.guard.record_timeout(loop.time() - started)
+                    raise asyncio.TimeoutError(f"LLM call exceeded its {self.budget_seconds}s budget") from e
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+                if attempt >= self.max_attempts or not is_retryable(e) or loop.time() + delay >= deadline:
+                    self.failures += 1
+                    raise
+                logging.warning(f"Retrying LLM call in {delay:.2f}s after: {str(e)}")
+                self.retries += 1
+                await asyncio.sleep(delay)
+
+    async def _attempt(self, fn: Callable[[], Awaitable[Any]], kind: str) -> Any:
+        started = time.monotonic()
+        result = await self.guard.call(fn)
+        self._tracker(kind).observe(time.monotonic() - started)
+        return result
+
+    async def _hedged(self, fn: Callable[[], Awaitable[Any]], kind: str) -> Any:
+        primary = asyncio.ensure_future(self._attempt(fn, kind))
+        tasks: Set[asyncio.Future] = {primary}
+        try:
+            delay = self.hedge_delay(kind)
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                limiter = self.guard.limiter
+                if not done and self.guard.breaker.state == "closed" and limiter.in_flight < int(limiter.limit):
+                    self.hedges += 1
+                    tasks.add(asyncio.ensure_future(self._attempt(fn, kind)))
+
+            error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        latency = {}
+        for kind, tracker in self._latency.items():
+            latency[kind] = {q: tracker.quantile(value) for q, value in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))}
+            latency[kind]["hedge_after"] = self.hedge_delay(kind)
+        return {
+            "budget_seconds": self.budget_seconds,
+            "hedging": self.hedge,
+            "max_attempts": self.max_attempts,
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": self.hedges / self.calls if self.calls else 0.0,
+            "latency": latency,
+        }
@@ -0,0 +1,158 @@
+"""Maintenance commands, e.g. `python manage.py rebuild-rollups`"""
+import asyncio
+import json
+import os
+import random
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import typer
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import BulkWriteError
+
+import rollups
+from partitions import FeedbackStore, add_months, month_start
+from sentiment_model import DEFAULT_MODEL_PATH, LABELS, LinearSentimentModel, evaluate
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+cli = typer.Typer(help="Msemobora maintenance commands")
+
+FEEDBACK_PARTITIONING = os.environ.get('FEEDBACK_PARTITIONING', 'false').lower() == 'true'
+
+
+def feedback_store(db, partitioned: bool = FEEDBACK_PARTITIONING) -> FeedbackStore:
+    """The feedback layout server.py is configured with"""
+    return FeedbackStore(db, partitioned=partitioned)
+
+
+def run_with_db(command):
+    """Run an async command against the configured database"""
+    async def runner():
+        client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+        try:
+            return await command(client[os.environ['DB_NAME']])
+        finally:
+            client.close()
+    return asyncio.run(runner())
+
+
+@cli.command("rebuild-rollups")
+def rebuild_rollups():
+    """Regenerate sentiment_rollups from employee_feedback (run after backfills)"""
+    async def rebuild(db):
+        rows = await rollups.rebuild(db, feedback_store(db))
+        await rollups.mark_built(db.app_state, rows)
+        return rows
+
+    rows = run_with_db(rebuild)
+    typer.echo(f"Rebuilt sentiment_rollups: {rows} rows")
+
+
+@cli.command("partition-feedback")
+def partition_feedback(batch_size: int = typer.Option(1000)):
+    """Move documents from the single employee_feedback collection into monthly partitions"""
+    async def migrate(db):
+        store = feedback_store(db, partitioned=True)
+        await store.ensure_indexes()
+        moved = 0
+        while True:
+            docs = await db.employee_feedback.find().sort("timestamp", 1).limit(batch_size).to_list(batch_size)
+            if not docs:
+                return moved
+            try:
+                await store.insert_many(docs, ordered=False)
+            except BulkWriteError as e:
+                # Copied by an earlier, interrupted run
+                if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                    raise
+            await db.employee_feedback.delete_many({"_id": {"$in": [doc["_id"] for doc in docs]}})
+            moved += len(docs)
+
+    moved = run_with_db(migrate)
+    typer.echo(f"Moved {moved} documents into monthly partitions; set FEEDBACK_PARTITIONING=true to read them")
+
+
+@cli.command("archive-feedback")
+def archive_feedback(
+    keep_months: int = typer.Option(int(os.environ.get('FEEDBACK_HOT_MONTHS', '12')), help="Months kept in partitions, including the current one"),
+):
+    """Compact partitions older than the kept months into employee_feedback_archive"""
+    if not FEEDBACK_PARTITIONING:
+        typer.echo("Archiving needs FEEDBACK_PARTITIONING=true")
+        raise typer.Exit(code=1)
+    before = add_months(month_start(datetime.utcnow()), -(max(1, keep_months) - 1))
+    moved = run_with_db(lambda db: feedback_store(db).archive(before))
+    typer.echo(json.dumps({"archived_before": before.strftime("%Y-%m"), "moved": moved}, indent=2))
+
+
+@cli.command("check-rollups")
+def check_rollups(days: Optional[int] = typer.Option(None, help="Only compare the most recent N days")):
+    """Compare sentiment_rollups with counts recomputed from employee_feedback"""
+    report = run_with_db(lambda db: rollups.check_consistency(db, feedback_store(db), days=days))
+    typer.echo(json.dumps(report, indent=2, default=str))
+    if not report["consistent"]:
+        raise typer.Exit(code=1)
+
+
+async def load_labelled_feedback(db):
+    """Feedback labelled by the LLM; rows the local tier or the fallback labelled are excluded"""
+    query = {
+        "processed": True,
+        "sentiment": {"$in": list(LABELS)},
+        "analysis_tier": {"$nin": ["local", "fallback"]},
+    }
+    documents = feedback_store(db).stream_oldest(query, {"_id": 0, "feedback_text": 1, "sentiment": 1}, [("timestamp", 1)], 1000)
+    return [(doc["feedback_text"], doc["sentiment"]) async for doc in documents]
+
+
+def split_holdout(rows, holdout: float, seed: int):
+    rows = list(rows)
+    random.Random(seed).shuffle(rows)
+    cut = int(len(rows) * (1 - holdout))
+    return rows[:cut], rows[cut:]
+
+
+@cli.command("train-classifier")
+def train_classifier(
+    output: Path = typer.Option(Path(os.environ.get('SENTIMENT_MODEL_PATH', str(DEFAULT_MODEL_PATH))), help="Where to write the model"),
+    holdout: float = typer.Option(0.2, help="Fraction of rows kept back for evaluation"),
+    epochs: int = typer.Option(30),
+    threshold: float = typer.Option(float(os.environ.get('LOCAL_CLASSIFIER_THRESHOLD', '0.85')), help="Confidence needed to skip the LLM"),
+    seed: int = typer.Option(0),
+):
+    """Train the local sentiment classifier on LLM-labelled feedback and report holdout accuracy"""
+    rows = run_with_db(load_labelled_feedback)
+    if len(rows) < 10:
+        typer.echo(f"Only {len(rows)} labelled rows; not enough to train")
+        raise typer.Exit(code=1)
+    train_rows, test_rows = split_holdout(rows, holdout, seed)
+    texts, labels = zip(*train_rows)
+    model = LinearSentimentModel.train(texts, labels, epochs=epochs, seed=seed)
+    if test_rows:
+        test_texts, test_labels = zip(*test_rows)
+        typer.echo(json.dumps(evaluate(model, test_texts, test_labels, threshold), indent=2))
+    model.save(output)
+    typer.echo(f"Trained on {len(train_rows)} rows, held out {len(test_rows)}; saved to {output}")
+
+
+@cli.command("evaluate-classifier")
+def evaluate_classifier(
+    model_path: Path = typer.Option(Path(os.environ.get('SENTIMENT_MODEL_PATH', str(DEFAULT_MODEL_PATH)))),
+    threshold: float = typer.Option(float(os.environ.get('LOCAL_CLASSIFIER_THRESHOLD', '0.85'))),
+):
+    """Score a saved model against all LLM-labelled feedback, including how often it would skip the LLM"""
+    model = LinearSentimentModel.load(model_path)
+    rows = run_with_db(load_labelled_feedback)
+    if not rows:
+        typer.echo("No labelled rows to evaluate against")
+        raise typer.Exit(code=1)
+    texts, labels = zip(*rows)
+    typer.echo(json.dumps(evaluate(model, texts, labels, threshold), indent=2))
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,330 @@
+"""In-process Prometheus metrics: registry, ASGI middleware and Motor collection wrappers"""
+import math
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _worker_label(worker: Optional[str]) -> str:
+    return f'worker="{_escape(worker)}"' if worker else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def snapshot(self) -> List[Any]:
+        return [[list(labels), value] for labels, value in self._values.items()]
+
+    def render(self, peers: Iterable[Tuple[str, List[Any]]] = (), worker: Optional[str] = None) -> List[str]:
+        lines = self.header()
+        for source, series in [(worker, self.snapshot()), *peers]:
+            tag = _worker_label(source)
+            lines += [f"{self.name}{_labels(self.label_names, tuple(labels), tag)} {_number(value)}" for labels, value in series]
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float):
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (last slot is +Inf), sum
+        self._series: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, *labels: str):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def snapshot(self) -> List[Any]:
+        return [[list(labels), counts, total] for labels, (counts, total) in self._series.items()]
+
+    def render(self, peers: Iterable[Tuple[str, List[Any]]] = (), worker: Optional[str] = None) -> List[str]:
+        lines = self.header()
+        for source, series in [(worker, self.snapshot()), *peers]:
+            tag = _worker_label(source)
+            for labels, counts, total in series:
+                # A peer running with other buckets (e.g. mid-deploy) cannot be rendered against ours
+                if len(counts) != len(self.buckets) + 1:
+                    continue
+                labels = tuple(labels)
+                cumulative = 0
+                for bound, count in zip(self.buckets + (math.inf,), counts):
+                    cumulative += count
+                    le = 'le="' + _number(bound) + '"'
+                    lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, ','.join(filter(None, (tag, le))))} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, labels, tag)} {_number(total)}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, labels, tag)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def snapshot(self) -> Dict[str, List[Any]]:
+        """Plain-data copy of every series, for sharing with other worker processes"""
+        return {metric.name: metric.snapshot() for metric in self._metrics}
+
+    def render(self, extra: Iterable[str] = (), peers: Iterable[Tuple[str, Dict[str, List[Any]]]] = (),
+               worker: Optional[str] = None) -> str:
+        """Text exposition of this process's series and of `peers`, (worker id, snapshot) pairs from other workers.
+
+        With `worker` set, every series carries a worker label rather than being
+        summed across workers: a sum would drop whenever a worker restarts or its
+        shared state ages out, which Prometheus reads as a counter reset.
+        """
+        peers = list(peers)
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render([(peer, snapshot.get(metric.name, [])) for peer, snapshot in peers], worker))
+        lines.extend(extra)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "Request latency by route template", ("method", "route", "status"))
+HTTP_IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "Requests currently being handled")
+
+LLM_CALL_SECONDS = REGISTRY.histogram(
+    "llm_call_duration_seconds", "Latency of individual LLM provider calls", ("kind", "outcome"),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0))
+LLM_IN_FLIGHT = REGISTRY.gauge("llm_calls_in_flight", "LLM provider calls currently outstanding")
+SENTIMENT_OUTCOMES = REGISTRY.counter(
+    "sentiment_analysis_total",
+    "Analyses by outcome: local, cache_hit, coalesced, success, json_parse_fallback, keyword_fallback", ("outcome",))
+
+MONGO_OP_SECONDS = REGISTRY.histogram(
+    "mongo_operation_duration_seconds", "Motor operation latency", ("collection", "operation"))
+MONGO_DOCS_RETURNED = REGISTRY.counter(
+    "mongo_documents_returned_total", "Documents returned to the application", ("collection", "operation"))
+MONGO_IN_FLIGHT = REGISTRY.gauge("mongo_operations_in_flight", "Motor operations currently awaiting the server")
+
+# serverStatus fields reported at scrape time, for scanned-vs-returned ratios across all queries
+SERVER_STATUS_COUNTERS = (
+    ("mongo_server_documents_returned_total", "Documents returned by the server", ("metrics", "document", "returned")),
+    ("mongo_server_documents_examined_total", "Documents examined by query plans", ("metrics", "queryExecutor", "scannedObjects")),
+    ("mongo_server_keys_examined_total", "Index keys examined by query plans", ("metrics", "queryExecutor", "scanned")),
+)
+
+
+def sample_lines(name: str, kind: str, help_text: str, value: float, worker: Optional[str] = None) -> List[str]:
+    """A single sample for values other components already keep (pool sizes, breaker state)"""
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name}{_labels((), (), _worker_label(worker))} {_number(value)}"]
+
+
+def server_status_lines(status: Optional[Dict[str, Any]]) -> List[str]:
+    lines: List[str] = []
+    for name, help_text, path in SERVER_STATUS_COUNTERS:
+        value: Any = status or {}
+        for part in path:
+            value = value.get(part, {}) if isinstance(value, dict) else {}
+        if isinstance(value, (int, float)):
+            lines += sample_lines(name, "counter", help_text, value)
+    return lines
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware, so streaming bodies pass straight through)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500, "stream": False}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                status["stream"] = any(
+                    key == b"content-type" and value.startswith(b"text/event-stream")
+                    for key, value in message.get("headers", [])
+                )
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            # Long-lived event streams would swamp the latency histogram
+            if not status["stream"]:
+                HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, scope["method"], template, str(status["code"]))
+
+
+class _TimedCursor:
+    """Wraps a Motor cursor so to_list() and async iteration are timed and their documents counted"""
+
+    def __init__(self, cursor, collection: str, operation: str):
+        self._cursor = cursor
+        self._collection = collection
+        self._operation = operation
+
+    def __getattr__(self, name):
+        attr = getattr(self._cursor, name)
+        if name in ("sort", "limit", "skip", "hint", "batch_size", "max_time_ms", "collation", "comment"):
+            def chain(*args, **kwargs):
+                attr(*args, **kwargs)
+                return self
+            return chain
+        return attr
+
+    async def to_list(self, length=None):
+        started = time.perf_counter()
+        MONGO_IN_FLIGHT.inc()
+        try:
+            docs = await self._cursor.to_list(length)
+        finally:
+            MONGO_IN_FLIGHT.dec()
+            MONGO_OP_SECONDS.observe(time.perf_counter() - started, self._collection, self._operation)
+        MONGO_DOCS_RETURNED.inc(self._collection, self._operation, amount=len(docs))
+        return docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        started = time.perf_counter()
+        returned = 0
+        try:
+            async for doc in self._cursor:
+                returned += 1
+                yield doc
+        finally:
+            MONGO_OP_SECONDS.observe(time.perf_counter() - started, self._collection, self._operation)
+            MONGO_DOCS_RETURNED.inc(self._collection, self._operation, amount=returned)
+
+
+class InstrumentedCollection:
+    """Motor collection proxy that times every awaited operation; everything else passes through"""
+
+    TIMED = (
+        "insert_one", "insert_many", "update_one", "update_many", "replace_one", "delete_one", "delete_many",
+        "find_one", "find_one_and_update", "find_one_and_delete", "count_documents", "estimated_document_count",
+        "distinct", "bulk_write",
+    )
+
+    def __init__(self, collection):
+        self._collection = collection
+        self._name = collection.name
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if name in self.TIMED:
+            return self._timed(name, attr)
+        if name in ("find", "aggregate"):
+            return lambda *args, **kwargs: _TimedCursor(attr(*args, **kwargs), self._name, name)
+        return attr
+
+    def _timed(self, operation: str, method):
+        async def call(*args, **kwargs):
+            started = time.perf_counter()
+            MONGO_IN_FLIGHT.inc()
+            try:
+                result = await method(*args, **kwargs)
+            finally:
+                MONGO_IN_FLIGHT.dec()
+                MONGO_OP_SECONDS.observe(time.perf_counter() - started, self._name, operation)
+            if operation in ("find_one", "find_one_and_update", "find_one_and_delete"):
+                MONGO_DOCS_RETURNED.inc(self._name, operation, amount=0 if result is None else 1)
+            elif operation == "distinct":
+                MONGO_DOCS_RETURNED.inc(self._name, operation, amount=len(result))
+            return result
+        return call
+
+
+class InstrumentedDatabase:
+    """Motor database proxy handing out instrumented collections"""
+
+    PASSTHROUGH = ("name", "client", "command", "drop_collection", "list_collection_names", "create_collection")
+
+    def __init__(self, database):
+        self._database = database
+        self._collections: Dict[str, InstrumentedCollection] = {}
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name in self.PASSTHROUGH:
+            return getattr(self._database, name)
+        return self[name]
+
+    def __getitem__(self, name: str) -> InstrumentedCollection:
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections[name] = InstrumentedCollection(self._database[name])
+        return collection
@@ -0,0 +1,331 @@
+"""Monthly partitions of employee_feedback, with old months compacted into an archive"""
+import logging
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import BulkWriteError, CollectionInvalid
+
+from indexes import ensure_collection_indexes
+
+ARCHIVE_STATE_ID = "feedback_archive"
+
+# Work-queue bookkeeping written by sentiment_worker; meaningless once a month is archived
+QUEUE_FIELDS = ("analysis_lease_until", "analysis_worker", "analysis_attempts", "analysis_error")
+
+# The archive is read newest first by range and department, like the partitions
+ARCHIVE_INDEXES = [
+    IndexModel([("timestamp", DESCENDING), ("id", DESCENDING)], name="timestamp_id"),
+    IndexModel([("department", ASCENDING), ("timestamp", DESCENDING)], name="department_timestamp"),
+]
+
+Source = Tuple[Any, Dict[str, Any]]
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def month_start(value: datetime) -> datetime:
+    return to_naive_utc(value).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, count: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def timestamp_bounds(query: Dict[str, Any]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """(start, end) of a top-level timestamp range in a Mongo filter; None for an open side"""
+    condition = query.get("timestamp")
+    if isinstance(condition, datetime):
+        return condition, condition
+    if not isinstance(condition, dict):
+        return None, None
+    start = condition.get("$gte", condition.get("$gt"))
+    end = condition.get("$lte", condition.get("$lt"))
+    return start, end
+
+
+class FeedbackStore:
+    """Where feedback documents live and which collections a query has to read.
+
+    Unpartitioned, everything resolves to the single ``employee_feedback``
+    collection and queries run exactly as they are written. Partitioned,
+    documents go to ``employee_feedback_YYYYMM`` by timestamp month, and
+    ``archive()`` compacts whole months into ``employee_feedback_archive`` (a
+    time-series collection on ``timestamp`` with ``department`` as the
+    metafield, where the server supports one). Reads ask ``sources()`` for the
+    collections overlapping the query's timestamp range, so a recent window
+    touches one or two partitions however much history has piled up.
+
+    The archive boundary lives in app_state and is only advanced after a month
+    has been copied completely; archive reads are bounded by it, so a month is
+    never read from both its partition and the archive.
+    """
+
+    def __init__(self, db, base: str = "employee_feedback", partitioned: bool = False,
+                 refresh_seconds: float = 60.0, queue_months: int = 2):
+        self.db = db
+        self.base = base
+        self.partitioned = partitioned
+        self.archive_name = f"{base}_archive"
+        self.refresh_seconds = refresh_seconds
+        self.queue_months = queue_months
+        self._partition_re = re.compile(rf"^{re.escape(base)}_(\d{{4}})(\d{{2}})$")
+        self._months: List[datetime] = []
+        self._archived_before: Optional[datetime] = None
+        self._refreshed_at: Optional[float] = None
+        self._indexed: set = set()
+
+    def partition_name(self, month: datetime) -> str:
+        return f"{self.base}_{month:%Y%m}"
+
+    @property
+    def queue(self):
+        """Collection (or partition view) the background sentiment workers drain"""
+        if not self.partitioned:
+            return self.db[self.base]
+        return PartitionView(self)
+
+    async def refresh(self, force: bool = False):
+        """Reload the partition list and archive boundary, at most every `refresh_seconds`"""
+        if not self.partitioned:
+            return
+        if not force and self._refreshed_at is not None \
+                and time.monotonic() - self._refreshed_at < self.refresh_seconds:
+            return
+        months = []
+        for name in await self.db.list_collection_names():
+            match = self._partition_re.match(name)
+            if match:
+                months.append(datetime(int(match.group(1)), int(match.group(2)), 1))
+        state = await self.db.app_state.find_one({"_id": ARCHIVE_STATE_ID})
+        self._months = sorted(months)
+        self._archived_before = state.get("archived_before") if state else None
+        self._refreshed_at = time.monotonic()
+
+    def _live_months(self) -> List[datetime]:
+        # The current month is always a candidate, even before this process has seen it created
+        months = set(self._months)
+        months.add(month_start(datetime.utcnow()))
+        return sorted(month for month in months if not self._archived_before or month >= self._archived_before)
+
+    async def sources(self, query: Optional[Dict[str, Any]] = None, start: Optional[datetime] = None,
+                      end: Optional[datetime] = None) -> List[Source]:
+        """(collection, filter) pairs that can hold matches, newest first.
+
+        The range is the query's own timestamp condition, narrowed by `start`
+        and `end` for callers whose range lives elsewhere (a keyset cursor, a
+        later $match stage).
+        """
+        query = query or {}
+        if not self.partitioned:
+            return [(self.db[self.base], query)]
+        await self.refresh()
+        query_start, query_end = timestamp_bounds(query)
+        starts = [to_naive_utc(value) for value in (start, query_start) if value is not None]
+        ends = [to_naive_utc(value) for value in (end, query_end) if value is not None]
+        start, end = (max(starts) if starts else None), (min(ends) if ends else None)
+
+        sources: List[Source] = []
+        for month in reversed(self._live_months()):
+            if end is not None and month > end:
+                continue
+            if start is not None and add_months(month, 1) <= start:
+                break
+            sources.append((self.db[self.partition_name(month)], query))
+        if self._archived_before and (start is None or start < self._archived_before):
+            sources.append((self.db[self.archive_name], {"$and": [query, {"timestamp": {"$lt": self._archived_before}}]}))
+        return sources
+
+    async def find_newest(self, query: Dict[str, Any], projection: Dict[str, Any], sort: Sequence[Tuple[str, int]],
+                          limit: int, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Up to `limit` documents in newest-first `sort` order, stopping once enough partitions were read"""
+        docs: List[Dict[str, Any]] = []
+        if limit <= 0:
+            return docs
+        for collection, scoped in await self.sources(query, end=end):
+            remaining = limit - len(docs)
+            docs.extend(await collection.find(scoped, projection).sort(list(sort)).limit(remaining).to_list(remaining))
+            if len(docs) >= limit:
+                break
+        return docs
+
+    async def stream_oldest(self, query: Dict[str, Any], projection: Dict[str, Any], sort: Sequence[Tuple[str, int]],
+                            batch_size: int) -> AsyncIterator[Dict[str, Any]]:
+        """Every match in oldest-first `sort` order, one partition cursor at a time"""
+        for collection, scoped in reversed(await self.sources(query)):
+            cursor = collection.find(scoped, projection).sort(list(sort)).batch_size(batch_size)
+            try:
+                async for doc in cursor:
+                    yield doc
+            finally:
+                await cursor.close()
+
+    async def aggregate(self, query: Dict[str, Any], stages: List[Dict[str, Any]],
+                        start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Run `[{"$match": query}] + stages` over every overlapping source, joined with $unionWith"""
+        sources = await self.sources(query, start, end) or [(self.db[self.partition_name(month_start(datetime.utcnow()))], query)]
+        (first, first_query), rest = sources[0], sources[1:]
+        pipeline = [{"$match": first_query}]
+        pipeline += [{"$unionWith": {"coll": collection.name, "pipeline": [{"$match": scoped}]}} for collection, scoped in rest]
+        return await first.aggregate(pipeline + stages).to_list(None)
+
+    async def distinct(self, field: str, query: Optional[Dict[str, Any]] = None) -> List[Any]:
+        values = set()
+        for collection, scoped in await self.sources(query):
+            values.update(await collection.distinct(field, scoped))
+        return sorted(values, key=str)
+
+    async def find_one(self, query: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        for collection, scoped in await self.sources(query):
+            doc = await collection.find_one(scoped)
+            if doc is not None:
+                return doc
+        return None
+
+    async def collection_for(self, timestamp: datetime):
+        """Partition a document stamped `timestamp` is written to, with its indexes in place"""
+        if not self.partitioned:
+            return self.db[self.base]
+        month = month_start(timestamp)
+        name = self.partition_name(month)
+        if name not in self._indexed:
+            await ensure_collection_indexes(self.db[name])
+            self._indexed.add(name)
+            if month not in self._months:
+                self._months = sorted(self._months + [month])
+        return self.db[name]
+
+    async def insert_one(self, doc: Dict[str, Any]):
+        return await (await self.collection_for(doc["timestamp"])).insert_one(doc)
+
+    async def insert_many(self, docs: List[Dict[str, Any]], ordered: bool = False):
+        """insert_many across partitions; a BulkWriteError reports indexes into `docs`, like a single collection"""
+        if not self.partitioned:
+            return await self.db[self.base].insert_many(docs, ordered=ordered)
+        groups: Dict[datetime, List[int]] = {}
+        for position, doc in enumerate(docs):
+            groups.setdefault(month_start(doc["timestamp"]), []).append(position)
+        write_errors: List[Dict[str, Any]] = []
+        inserted = 0
+        for month, positions in sorted(groups.items()):
+            collection = await self.collection_for(month)
+            try:
+                await collection.insert_many([docs[position] for position in positions], ordered=ordered)
+                inserted += len(positions)
+            except BulkWriteError as e:
+                inserted += e.details.get("nInserted", 0)
+                write_errors += [{**error, "index": positions[error["index"]]} for error in e.details.get("writeErrors", [])]
+                if ordered:
+                    break
+        if write_errors:
+            raise BulkWriteError({
+                "writeErrors": write_errors, "writeConcernErrors": [], "nInserted": inserted,
+                "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": [],
+            })
+
+    async def ensure_indexes(self):
+        if not self.partitioned:
+            await ensure_collection_indexes(self.db[self.base])
+            return
+        await self.refresh(force=True)
+        for month in self._live_months():
+            await self.collection_for(month)
+        if self._archived_before:
+            await self.ensure_archive()
+
+    async def ensure_archive(self):
+        try:
+            await self.db.create_collection(
+                self.archive_name,
+                timeseries={"timeField": "timestamp", "metaField": "department", "granularity": "hours"}
+            )
+        except CollectionInvalid:
+            pass
+        except Exception as e:
+            # Time-series collections need MongoDB 5.0; a plain collection holds the same documents
+            logging.error(f"Error creating time-series archive, using a regular collection: {str(e)}")
+        try:
+            await self.db[self.archive_name].create_indexes(ARCHIVE_INDEXES)
+        except Exception as e:
+            logging.error(f"Error creating archive indexes: {str(e)}")
+
+    async def archive(self, before: datetime, batch_size: int = 1000) -> Dict[str, int]:
+        """Move every partition older than the month of `before` into the archive, oldest first"""
+        if not self.partitioned:
+            raise ValueError("Archiving needs the partitioned feedback layout")
+        await self.refresh(force=True)
+        await self.ensure_archive()
+        archive = self.db[self.archive_name]
+        projection = {field: 0 for field in ("_id",) + QUEUE_FIELDS}
+        moved = {}
+        for month in self._live_months():
+            if month >= month_start(before):
+                break
+            following = add_months(month, 1)
+            # Leftovers of an interrupted run are past the boundary, so no reader has seen them
+            await archive.delete_many({"timestamp": {"$gte": month, "$lt": following}})
+            partition = self.db[self.partition_name(month)]
+            count, batch = 0, []
+            async for doc in partition.find({}, projection).batch_size(batch_size):
+                batch.append(doc)
+                if len(batch) >= batch_size:
+                    await archive.insert_many(batch, ordered=False)
+                    count, batch = count + len(batch), []
+            if batch:
+                await archive.insert_many(batch, ordered=False)
+                count += len(batch)
+            await self.db.app_state.update_one(
+                {"_id": ARCHIVE_STATE_ID}, {"$set": {"archived_before": following}}, upsert=True
+            )
+            await partition.drop()
+            moved[f"{month:%Y-%m}"] = count
+        await self.refresh(force=True)
+        return moved
+
+
+class PartitionView:
+    """The recent partitions as one collection, for the sentiment work queue.
+
+    New feedback is stamped with the current time, so unprocessed documents
+    sit in the last ``queue_months`` partitions. Collections are tried oldest
+    first, which keeps a timestamp-ascending claim order across them.
+    """
+
+    def __init__(self, store: FeedbackStore):
+        self.store = store
+
+    def _collections(self) -> List[Any]:
+        current = month_start(datetime.utcnow())
+        months = [add_months(current, -offset) for offset in reversed(range(self.store.queue_months))]
+        return [self.store.db[self.store.partition_name(month)] for month in months]
+
+    async def find_one_and_update(self, filter, update, **kwargs):
+        for collection in self._collections():
+            doc = await collection.find_one_and_update(filter, update, **kwargs)
+            if doc is not None:
+                return doc
+        return None
+
+    async def update_one(self, filter, update, **kwargs):
+        for collection in self._collections():
+            result = await collection.update_one(filter, update, **kwargs)
+            if result.matched_count:
+                return result
+        return result
+
+    async def count_documents(self, filter, **kwargs) -> int:
+        return sum([await collection.count_documents(filter, **kwargs) for collection in self._collections()])
+
+    async def find_one(self, filter=None, *args, **kwargs):
+        for collection in self._collections():
+            doc = await collection.find_one(filter, *args, **kwargs)
+            if doc is not None:
+                return doc
+        return None
@@ -0,0 +1,106 @@
+"""Serialized response cache for read endpoints, invalidated by a data version"""
+import gzip
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, NamedTuple, Optional
+
+
+class CachedResponse(NamedTuple):
+    version: Any
+    body: bytes
+    etag: str
+    expires_at: float
+    gzip_body: Optional[bytes] = None
+
+
+def normalize_params(params: Mapping[str, Any], list_params=("departments",)) -> str:
+    """Stable key for query parameters: sorted names, comma lists sorted, empty values dropped"""
+    normalized = {}
+    for name, value in params.items():
+        if value is None or value == "":
+            continue
+        if name in list_params and isinstance(value, str):
+            value = ",".join(sorted(part.strip() for part in value.split(",") if part.strip()))
+        normalized[name] = value
+    return json.dumps(normalized, sort_keys=True, default=str)
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+def gzip_etag(etag: str) -> str:
+    """Validator for the gzip-coded representation; a strong ETag must differ per content coding"""
+    return etag[:-1] + '-gz"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether If-None-Match names either coding of the body tagged `etag`"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates or gzip_etag(etag) in candidates
+
+
+class ResponseCache:
+    """LRU of serialized responses keyed by route + normalized params.
+
+    Each entry remembers the data version it was computed at; any later
+    version makes it a miss. ``ttl_seconds`` additionally bounds staleness for
+    responses that depend on the clock (e.g. "last 7 days" windows). Bodies
+    of at least ``gzip_min_bytes`` are also stored compressed, so cache hits
+    do not pay for gzip again.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 60.0, gzip_min_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.gzip_min_bytes = gzip_min_bytes
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def key(route: str, params: Mapping[str, Any]) -> str:
+        return f"{route}?{normalize_params(params)}"
+
+    def get(self, key: str, version: Any) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None or entry.version != version or entry.expires_at < time.monotonic():
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, version: Any, body: bytes) -> CachedResponse:
+        gzip_body = None
+        if self.gzip_min_bytes is not None and len(body) >= self.gzip_min_bytes:
+            gzip_body = gzip.compress(body, compresslevel=6)
+        entry = CachedResponse(version, body, etag_for(body), time.monotonic() + self.ttl_seconds, gzip_body)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,169 @@
+"""Per (department, day, sentiment) feedback counters kept alongside employee_feedback (or its partitions)"""
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import ASCENDING, IndexModel, UpdateOne
+
+from partitions import FeedbackStore
+
+ROLLUP_INDEXES = [
+    IndexModel(
+        [("department", ASCENDING), ("day", ASCENDING), ("sentiment", ASCENDING)],
+        name="department_day_sentiment",
+        unique=True,
+    ),
+    IndexModel([("day", ASCENDING)], name="day"),
+]
+
+RollupKey = Tuple[str, datetime, Optional[str]]
+
+# app_state document recording that the rollups cover all existing feedback
+BUILT_STATE_ID = "sentiment_rollups_built"
+
+
+def rollup_day(timestamp: datetime) -> datetime:
+    """UTC midnight of the day a document falls into"""
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def rollup_key(doc: Dict[str, Any]) -> RollupKey:
+    # Documents still waiting for analysis are counted under a null sentiment
+    return doc.get("department") or "Unknown", rollup_day(doc["timestamp"]), doc.get("sentiment")
+
+
+def is_day_aligned(value: Optional[datetime]) -> bool:
+    return value is None or value == rollup_day(value)
+
+
+async def ensure_indexes(collection):
+    await collection.create_indexes(ROLLUP_INDEXES)
+
+
+async def apply_increments(collection, increments: Dict[RollupKey, int]):
+    operations = [
+        UpdateOne(
+            {"department": department, "day": day, "sentiment": sentiment},
+            {"$inc": {"count": delta}},
+            upsert=True,
+        )
+        for (department, day, sentiment), delta in increments.items()
+        if delta
+    ]
+    if operations:
+        await collection.bulk_write(operations, ordered=False)
+
+
+async def record_inserted(collection, docs: Iterable[Dict[str, Any]]):
+    """Count freshly inserted feedback documents"""
+    await apply_increments(collection, Counter(rollup_key(doc) for doc in docs))
+
+
+async def record_sentiment_change(collection, doc: Dict[str, Any], new_sentiment: str):
+    """Move one document's count from its previous sentiment to the new one"""
+    old_key = rollup_key(doc)
+    new_key = (old_key[0], old_key[1], new_sentiment)
+    if old_key != new_key:
+        await apply_increments(collection, {old_key: -1, new_key: 1})
+
+
+def rollup_group_stages() -> List[Dict[str, Any]]:
+    """Aggregation stages recomputing rollup rows from (matched) raw feedback"""
+    return [
+        {"$group": {
+            "_id": {
+                "department": {"$ifNull": ["$department", "Unknown"]},
+                "day": {"$dateTrunc": {"date": "$timestamp", "unit": "day"}},
+                "sentiment": "$sentiment",
+            },
+            "count": {"$sum": 1},
+        }},
+        {"$project": {
+            "_id": 0,
+            "department": "$_id.department",
+            "day": "$_id.day",
+            "sentiment": "$_id.sentiment",
+            "count": 1,
+        }},
+    ]
+
+
+async def rebuild(db, feedback=None, target: str = "sentiment_rollups") -> int:
+    """Regenerate the rollups from raw data and swap them in atomically.
+
+    `feedback` is a partitions.FeedbackStore, so partitions and the archive
+    are all counted; by default the single employee_feedback collection.
+    """
+    feedback = feedback or FeedbackStore(db)
+    staging = f"{target}_rebuild"
+    await db[staging].drop()
+    await feedback.aggregate({}, rollup_group_stages() + [{"$out": staging}])
+    await ensure_indexes(db[staging])
+    await db[staging].rename(target, dropTarget=True)
+    return await db[target].count_documents({})
+
+
+async def mark_built(state, rows: int):
+    """Record that the rollups are complete, so every worker may answer dashboards from them"""
+    await state.update_one(
+        {"_id": BUILT_STATE_ID},
+        {"$set": {"built_at": datetime.utcnow(), "rows": rows}},
+        upsert=True,
+    )
+
+
+async def is_built(state) -> bool:
+    return await state.find_one({"_id": BUILT_STATE_ID}) is not None
+
+
+async def check_consistency(db, feedback=None, target: str = "sentiment_rollups",
+                            days: Optional[int] = None) -> Dict[str, Any]:
+    """Compare stored rollups with counts recomputed from raw feedback"""
+    feedback = feedback or FeedbackStore(db)
+    match: Dict[str, Any] = {}
+    rollup_match: Dict[str, Any] = {}
+    if days:
+        since = rollup_day(datetime.utcnow()) - timedelta(days=days - 1)
+        match = {"timestamp": {"$gte": since}}
+        rollup_match = {"day": {"$gte": since}}
+
+    expected = {
+        (row["department"], row["day"], row["sentiment"]): row["count"]
+        for row in await feedback.aggregate(match, rollup_group_stages())
+    }
+    actual = {
+        (row["department"], row["day"], row.get("sentiment")): row["count"]
+        async for row in db[target].find(rollup_match, {"_id": 0})
+    }
+
+    mismatches = []
+    for key in sorted(set(expected) | set(actual), key=lambda k: (k[0], k[1], k[2] or "")):
+        if expected.get(key, 0) != actual.get(key, 0):
+            department, day, sentiment = key
+            mismatches.append({
+                "department": department,
+                "day": day.strftime("%Y-%m-%d"),
+                "sentiment": sentiment,
+                "expected": expected.get(key, 0),
+                "actual": actual.get(key, 0),
+            })
+    return {"consistent": not mismatches, "rows_checked": len(expected), "mismatches": mismatches}
+
+
+async def load_rows(collection, departments: Optional[List[str]] = None,
+                    start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Rollup rows for an optional department list and day range.
+
+    A midnight ``end`` is exclusive, matching a raw ``timestamp <= end`` filter
+    up to documents stamped exactly at midnight; any other ``end`` includes its day.
+    """
+    query: Dict[str, Any] = {"count": {"$gt": 0}}
+    if departments:
+        query["department"] = {"$in": departments}
+    if start or end:
+        query["day"] = {}
+        if start:
+            query["day"]["$gte"] = rollup_day(start)
+        if end:
+            query["day"]["$lt" if end == rollup_day(end) else "$lte"] = end
+    return await collection.find(query, {"_id": 0}).to_list(None)
@@ -0,0 +1,142 @@
+"""Content-addressed cache for sentiment analysis results"""
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = " \t\n\"'`.,!?;:-_()[]{}"
+
+
+def normalize_feedback_text(text: str) -> str:
+    """Fold case, unicode forms, whitespace and edge punctuation so trivially different comments share a key"""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _WHITESPACE_RE.sub(" ", text)
+    return text.strip(_EDGE_PUNCTUATION)
+
+
+def cache_namespace(model: str, system_prompt: str) -> str:
+    """Fingerprint of everything besides the text that determines an analysis"""
+    return hashlib.sha256(f"{model}\0{system_prompt}".encode("utf-8")).hexdigest()[:16]
+
+
+class SentimentCache:
+    """Two-tier cache: an in-process LRU with TTL in front of a MongoDB collection.
+
+    Keys are hashes of the normalized feedback text scoped by a namespace derived
+    from the model name and system prompt, so changing either one stops old
+    entries from matching; ``invalidate`` removes them for good.
+    """
+
+    def __init__(
+        self,
+        collection,
+        namespace: str,
+        max_entries: int = 10000,
+        ttl_seconds: float = 3600.0,
+        persistent_ttl_seconds: int = 30 * 24 * 3600,
+    ):
+        self.collection = collection
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persistent_ttl_seconds = persistent_ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def key_for(self, text: str) -> str:
+        normalized = normalize_feedback_text(text)
+        return hashlib.sha256(f"{self.namespace}\0{normalized}".encode("utf-8")).hexdigest()
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("created_at", expireAfterSeconds=self.persistent_ttl_seconds)
+        await self.collection.create_index("namespace")
+
+    def _remember(self, key: str, value: Dict[str, Any]):
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _lookup_memory(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.evictions += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def get(self, text: str) -> Optional[Dict[str, Any]]:
+        key = self.key_for(text)
+        value = self._lookup_memory(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+
+        try:
+            doc = await self.collection.find_one(
+                {"_id": key, "namespace": self.namespace},
+                {"_id": 0, "sentiment": 1, "confidence_score": 1, "reasoning": 1},
+            )
+        except Exception as e:
+            logging.error(f"Error reading sentiment cache: {str(e)}")
+            doc = None
+
+        if doc is None:
+            self.misses += 1
+            return None
+        self.persistent_hits += 1
+        self._remember(key, doc)
+        return doc
+
+    async def set(self, text: str, value: Dict[str, Any]):
+        key = self.key_for(text)
+        self._remember(key, value)
+        self.writes += 1
+        try:
+            await self.collection.replace_one(
+                {"_id": key},
+                {**value, "_id": key, "namespace": self.namespace, "created_at": datetime.utcnow()},
+                upsert=True,
+            )
+        except Exception as e:
+            logging.error(f"Error writing sentiment cache: {str(e)}")
+
+    def forget_local(self):
+        """Drop only the in-memory tier, e.g. after another worker invalidated the shared one"""
+        self._entries.clear()
+
+    async def invalidate(self, all_namespaces: bool = False) -> int:
+        """Drop cached entries; by default only those left behind by other models or prompts"""
+        self._entries.clear()
+        query = {} if all_namespaces else {"namespace": {"$ne": self.namespace}}
+        result = await self.collection.delete_many(query)
+        return result.deleted_count
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.persistent_hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "memory_entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "memory_hits": self.memory_hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_ratio": (self.memory_hits + self.persistent_hits) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,156 @@
+"""Local first-tier sentiment classifiers: a word lexicon and a hashed-feature linear model"""
+import re
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+LABELS = ("Positive", "Neutral", "Negative")
+
+DEFAULT_MODEL_PATH = Path(__file__).parent / "models" / "sentiment_model.npz"
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+_CLAUSE_RE = re.compile(r"[.,;:!?\n]+")
+_NEGATIONS = {"not", "no", "never", "dont", "don't", "isn't", "wasn't", "aren't", "can't", "cannot", "won't", "hardly"}
+
+POSITIVE_WORDS = {
+    "good", "great", "excellent", "happy", "satisfied", "love", "amazing", "wonderful", "supportive",
+    "appreciate", "appreciated", "helpful", "enjoy", "enjoying", "fantastic", "motivated", "valued",
+    "awesome", "proud", "thanks", "thank", "grateful", "positive", "pleased", "flexible", "fair",
+}
+NEGATIVE_WORDS = {
+    "bad", "terrible", "hate", "awful", "frustrated", "frustrating", "disappointed", "angry", "upset",
+    "poor", "unfair", "overworked", "undervalued", "stressed", "stressful", "toxic", "burnout", "worse",
+    "worst", "horrible", "unhappy", "ignored", "unrealistic", "problem", "problems", "lacking", "micromanaged",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Whole-word tokens, so "badge" no longer counts as "bad" """
+    return _TOKEN_RE.findall(text.lower())
+
+
+def lexicon_classify(text: str) -> Tuple[str, float]:
+    """Count polarity words, flipping a word negated earlier in its clause ("not very good")"""
+    positive = negative = 0
+    for clause in _CLAUSE_RE.split(text):
+        tokens = tokenize(clause)
+        for i, token in enumerate(tokens):
+            negated = any(prev in _NEGATIONS for prev in tokens[max(0, i - 2):i])
+            if token in POSITIVE_WORDS:
+                if negated:
+                    negative += 1
+                else:
+                    positive += 1
+            elif token in NEGATIVE_WORDS:
+                if negated:
+                    positive += 1
+                else:
+                    negative += 1
+
+    if positive == negative:
+        return "Neutral", 0.5 if positive else 0.55
+    label = "Positive" if positive > negative else "Negative"
+    margin = abs(positive - negative) / (positive + negative)
+    return label, round(0.55 + 0.35 * margin * min(1.0, (positive + negative) / 3), 3)
+
+
+def feature_indices(text: str, dims: int) -> np.ndarray:
+    """Distinct hashed unigram + bigram features (crc32 is stable across processes, unlike hash())"""
+    tokens = tokenize(text)
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return np.unique(np.fromiter((zlib.crc32(g.encode("utf-8")) % dims for g in grams), dtype=np.int64, count=len(grams)))
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    logits = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class LinearSentimentModel:
+    """Multinomial logistic regression over hashed binary n-gram features"""
+
+    def __init__(self, weights: np.ndarray, bias: np.ndarray, metadata: Optional[Dict[str, Any]] = None):
+        self.weights = weights
+        self.bias = bias
+        self.dims = weights.shape[0]
+        self.metadata = metadata or {}
+
+    def predict_proba(self, text: str) -> np.ndarray:
+        return _softmax(self.weights[feature_indices(text, self.dims)].sum(axis=0) + self.bias)
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        probabilities = self.predict_proba(text)
+        best = int(probabilities.argmax())
+        return LABELS[best], float(probabilities[best])
+
+    @classmethod
+    def train(cls, texts: Sequence[str], labels: Sequence[str], dims: int = 2 ** 18, epochs: int = 30,
+              learning_rate: float = 0.5, l2: float = 1e-4, batch_size: int = 256, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        features = [feature_indices(text, dims) for text in texts]
+        targets = np.array([LABELS.index(label) for label in labels])
+        weights = np.zeros((dims, len(LABELS)))
+        bias = np.zeros(len(LABELS))
+
+        for _ in range(epochs):
+            order = rng.permutation(len(features))
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                indices = [features[i] for i in batch]
+                lengths = np.array([len(idx) for idx in indices])
+                flat = np.concatenate(indices) if lengths.sum() else np.zeros(0, dtype=np.int64)
+                owners = np.repeat(np.arange(len(batch)), lengths)
+
+                logits = np.zeros((len(batch), len(LABELS))) + bias
+                np.add.at(logits, owners, weights[flat])
+                error = _softmax(logits)
+                error[np.arange(len(batch)), targets[batch]] -= 1.0
+                error /= len(batch)
+
+                gradient = np.zeros((len(flat), len(LABELS)))
+                gradient[:] = error[owners]
+                touched = np.unique(flat)
+                weights[touched] *= 1.0 - learning_rate * l2
+                np.add.at(weights, flat, -learning_rate * gradient)
+                bias -= learning_rate * error.sum(axis=0)
+
+        return cls(weights, bias, {"dims": dims, "epochs": epochs, "examples": len(features)})
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as fh:
+            np.savez_compressed(fh, weights=self.weights.astype(np.float32), bias=self.bias,
+                                labels=np.array(LABELS), metadata=np.array([repr(self.metadata)]))
+
+    @classmethod
+    def load(cls, path: Path) -> "LinearSentimentModel":
+        data = np.load(path, allow_pickle=False)
+        if tuple(data["labels"]) != LABELS:
+            raise ValueError(f"Model at {path} was trained with labels {tuple(data['labels'])}")
+        return cls(data["weights"].astype(np.float64), data["bias"], {"source": str(path)})
+
+
+def evaluate(model: LinearSentimentModel, texts: Iterable[str], labels: Iterable[str],
+             threshold: float) -> Dict[str, Any]:
+    """Accuracy overall and on the items the model would answer without escalating"""
+    total = correct = accepted = accepted_correct = 0
+    confusion = {actual: {predicted: 0 for predicted in LABELS} for actual in LABELS}
+    for text, label in zip(texts, labels):
+        predicted, confidence = model.predict(text)
+        total += 1
+        correct += predicted == label
+        confusion[label][predicted] += 1
+        if confidence >= threshold:
+            accepted += 1
+            accepted_correct += predicted == label
+    return {
+        "examples": total,
+        "accuracy": correct / total if total else 0.0,
+        "threshold": threshold,
+        "local_rate": accepted / total if total else 0.0,
+        "local_accuracy": accepted_correct / accepted if accepted else 0.0,
+        "confusion": confusion,
+    }
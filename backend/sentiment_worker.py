@@ -0,0 +1,209 @@
+"""Background sentiment analysis for feedback stored with processed=False"""
+import asyncio
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pymongo import ReturnDocument
+
+
+class SentimentWorkerPool:
+    """Pool of asyncio workers draining unprocessed feedback from MongoDB.
+
+    The employee_feedback collection itself is the queue: a worker claims the
+    oldest unprocessed document by setting a lease, analyzes it and writes the
+    result back. Leases that expire (e.g. the process died mid-analysis) make
+    the document claimable again, and failed attempts are retried with
+    exponential backoff until ``max_attempts`` is reached. If the last attempt
+    fails too, ``fallback`` (when given) supplies the result instead of the
+    document being left as a dead letter.
+    """
+
+    def __init__(
+        self,
+        collection,
+        analyze: Callable[[str], Awaitable[Any]],
+        on_processed: Optional[Callable[[Dict[str, Any], Any], Awaitable[None]]] = None,
+        size: int = 4,
+        max_attempts: int = 3,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 1.0,
+        retry_backoff: float = 2.0,
+        fallback: Optional[Callable[[str], Any]] = None,
+    ):
+        self.collection = collection
+        self.analyze = analyze
+        self.on_processed = on_processed
+        self.size = size
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.retry_backoff = retry_backoff
+        self.fallback = fallback
+        self.pool_id = uuid.uuid4().hex[:8]
+        self.processed_count = 0
+        self.retry_count = 0
+        self.failed_count = 0
+        self.fallback_count = 0
+        self.last_processed_at: Optional[datetime] = None
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._heartbeats: Dict[str, datetime] = {}
+        self._running = False
+
+    def pending_query(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Filter matching documents that still need analysis and are claimable"""
+        now = now or datetime.utcnow()
+        return {
+            "processed": False,
+            "analysis_attempts": {"$not": {"$gte": self.max_attempts}},
+            "$or": [
+                {"analysis_lease_until": None},
+                {"analysis_lease_until": {"$lte": now}},
+            ],
+        }
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        for n in range(self.size):
+            name = f"{self.pool_id}-{n}"
+            self._tasks.append(asyncio.create_task(self._run(name), name=f"sentiment-worker-{name}"))
+        logging.info(f"Started {self.size} sentiment workers")
+
+    async def stop(self):
+        self._running = False
+        self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """Wake idle workers after a new document has been queued"""
+        self._wakeup.set()
+
+    async def _claim(self, worker_name: str) -> Optional[Dict[str, Any]]:
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            self.pending_query(now),
+            {
+                "$set": {
+                    "analysis_lease_until": now + timedelta(seconds=self.lease_seconds),
+                    "analysis_worker": worker_name,
+                },
+                "$inc": {"analysis_attempts": 1},
+            },
+            sort=[("timestamp", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _analyze(self, doc: Dict[str, Any]) -> Any:
+        try:
+            return await self.analyze(doc["feedback_text"])
+        except Exception as e:
+            if self.fallback is None or doc.get("analysis_attempts", 1) < self.max_attempts:
+                raise
+            logging.warning(f"Using fallback analysis for queued feedback {doc.get('id')} after {self.max_attempts} attempts: {str(e)}")
+            self.fallback_count += 1
+            return self.fallback(doc["feedback_text"])
+
+    async def _process(self, doc: Dict[str, Any]):
+        try:
+            analysis = await self._analyze(doc)
+            # Guarded on processed=False so a worker whose lease expired cannot apply a result twice
+            result = await self.collection.update_one(
+                {"id": doc["id"], "processed": False},
+                {
+                    "$set": {
+                        "sentiment": analysis.sentiment,
+                        "confidence_score": analysis.confidence_score,
+                        "analysis_tier": getattr(analysis, "tier", None),
+                        "processed": True,
+                        "processed_at": datetime.utcnow(),
+                    },
+                    "$unset": {"analysis_lease_until": "", "analysis_worker": "", "analysis_error": ""},
+                },
+            )
+            if not result.modified_count:
+                return
+            self.processed_count += 1
+            self.last_processed_at = datetime.utcnow()
+            if self.on_processed:
+                await self.on_processed(doc, analysis)
+        except Exception as e:
+            attempts = doc.get("analysis_attempts", 1)
+            logging.error(f"Error analyzing queued feedback {doc.get('id')} (attempt {attempts}): {str(e)}")
+            if attempts >= self.max_attempts:
+                self.failed_count += 1
+                update = {"$set": {"analysis_error": str(e)}, "$unset": {"analysis_lease_until": ""}}
+            else:
+                self.retry_count += 1
+                # Keep the lease until the backoff elapses so the retry is delayed
+                delay = self.retry_backoff ** attempts * (0.5 + random.random())
+                update = {
+                    "$set": {
+                        "analysis_error": str(e),
+                        "analysis_lease_until": datetime.utcnow() + timedelta(seconds=delay),
+                    }
+                }
+            # Only while this claim is current: if the lease expired, another worker may have
+            # claimed (and perhaps processed) the document since, and its outcome must stand
+            await self.collection.update_one(
+                {"id": doc["id"], "processed": False, "analysis_attempts": attempts}, update
+            )
+
+    async def _run(self, worker_name: str):
+        while self._running:
+            self._heartbeats[worker_name] = datetime.utcnow()
+            try:
+                doc = await self._claim(worker_name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Sentiment worker {worker_name} failed to claim work: {str(e)}")
+                doc = None
+
+            if doc is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._process(doc)
+
+    async def status(self) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        queue_depth = await self.collection.count_documents(
+            {"processed": False, "analysis_attempts": {"$not": {"$gte": self.max_attempts}}}
+        )
+        dead_letters = await self.collection.count_documents(
+            {"processed": False, "analysis_attempts": {"$gte": self.max_attempts}}
+        )
+        oldest = await self.collection.find_one(
+            {"processed": False, "analysis_attempts": {"$not": {"$gte": self.max_attempts}}},
+            {"timestamp": 1},
+            sort=[("timestamp", 1)],
+        )
+        return {
+            "running": self._running,
+            "pool_size": self.size,
+            "max_attempts": self.max_attempts,
+            "queue_depth": queue_depth,
+            "failed_documents": dead_letters,
+            "worker_lag_seconds": (now - oldest["timestamp"]).total_seconds() if oldest else 0.0,
+            "processed": self.processed_count,
+            "retries": self.retry_count,
+            "failures": self.failed_count,
+            "fallbacks": self.fallback_count,
+            "last_processed_at": self.last_processed_at,
+            "workers": {
+                name: {"last_heartbeat_seconds_ago": (now - beat).total_seconds()}
+                for name, beat in self._heartbeats.items()
+            },
+        }
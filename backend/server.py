@@ -1,29 +1,57 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import BulkWriteError
 import os
+import json
+import orjson
+import base64
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 import uuid
+import time
 from datetime import datetime
 import asyncio
 
-# Import the LLM integration
-from emergentintegrations.llm.chat import LlmChat, UserMessage
+# The LLM integration (emergentintegrations) is imported lazily by llm_chat_module()
+import feedback_export
+from broadcaster import Broadcaster, sse_events
+from cluster_sync import WORKER_ID, ClusterSync, acquire_lease, run_with_lease
+from compression import GZipExceptStreamsMiddleware
+import rollups
+import timeline
+import metrics
+from indexes import index_usage_report
+from llm_batcher import MicroBatcher
+from llm_pool import LlmSessionPool
+from llm_resilience import AdaptiveLimit, CircuitBreaker, CircuitOpenError, HedgedCaller, LlmGuard
+from partitions import FeedbackStore
+from response_cache import ResponseCache, etag_matches, gzip_etag
+from sentiment_model import DEFAULT_MODEL_PATH, LinearSentimentModel, lexicon_classify
+from sentiment_cache import SentimentCache, cache_namespace, normalize_feedback_text
+from single_flight import SingleFlight
+from write_buffer import WriteBuffer
+from sentiment_worker import SentimentWorkerPool
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection; motor opens no sockets until the first operation, which the startup warm-up makes
 mongo_url = os.environ['MONGO_URL']
 client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# Every collection handed out by `db` times its operations for /api/metrics
+db = metrics.InstrumentedDatabase(client[os.environ['DB_NAME']])
 
 # Create the main app without a prefix
-app = FastAPI(title="Msemobora - Employee Sentiment Analysis", version="1.0.0")
+app = FastAPI(
+    title="Msemobora - Employee Sentiment Analysis",
+    version="1.0.0",
+    default_response_class=ORJSONResponse
+)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -31,6 +59,100 @@ api_router = APIRouter(prefix="/api")
 # Get API key from environment
 ANTHROPIC_API_KEY = os.environ.get('ANTHROPIC_API_KEY')
 
+# Storage layout: monthly employee_feedback_YYYYMM partitions (old months compacted into an
+# archive by `manage.py archive-feedback`) instead of one employee_feedback collection
+FEEDBACK_PARTITIONING = os.environ.get('FEEDBACK_PARTITIONING', 'false').lower() == 'true'
+FEEDBACK_PARTITION_REFRESH_SECONDS = float(os.environ.get('FEEDBACK_PARTITION_REFRESH_SECONDS', '60'))
+
+# Serve day-aligned dashboard queries from the sentiment_rollups counters
+DASHBOARD_USE_ROLLUPS = os.environ.get('DASHBOARD_USE_ROLLUPS', 'true').lower() == 'true'
+
+# Cached read responses (invalidated on every feedback write; TTL bounds clock-relative windows)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '512'))
+RESPONSE_CACHE_TTL_SECONDS = float(os.environ.get('RESPONSE_CACHE_TTL_SECONDS', '60'))
+
+# Largest page GET /api/feedback returns; reading everything is what the streaming export is for
+FEEDBACK_MAX_LIMIT = int(os.environ.get('FEEDBACK_MAX_LIMIT', '1000'))
+
+# Documents fetched per round trip when streaming exports
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '1000'))
+
+# Responses at least this large are gzipped for clients that accept it (event streams never are)
+GZIP_MIN_BYTES = int(os.environ.get('GZIP_MIN_BYTES', '1024'))
+
+# Server-Sent Events push channel
+STREAM_HEARTBEAT_SECONDS = float(os.environ.get('STREAM_HEARTBEAT_SECONDS', '15'))
+STREAM_MAX_PENDING_EVENTS = int(os.environ.get('STREAM_MAX_PENDING_EVENTS', '100'))
+
+# Worker processes (entrypoint.sh); with more than one, caches, SSE events and metrics are synchronized through Mongo
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', '1'))
+CLUSTER_SYNC = os.environ.get('CLUSTER_SYNC', 'true' if WEB_CONCURRENCY > 1 else 'false').lower() == 'true'
+METRICS_SHARE_SECONDS = float(os.environ.get('METRICS_SHARE_SECONDS', '10'))
+
+# Local first-tier classifier; only answers below the threshold are escalated to the LLM
+SENTIMENT_MODEL_PATH = Path(os.environ.get('SENTIMENT_MODEL_PATH', str(DEFAULT_MODEL_PATH)))
+LOCAL_CLASSIFIER_THRESHOLD = float(os.environ.get('LOCAL_CLASSIFIER_THRESHOLD', '0.85'))
+
+# Number of long-lived LLM sessions shared by all requests
+LLM_POOL_SIZE = int(os.environ.get('LLM_POOL_SIZE', '8'))
+
+# Circuit breaker: trips when this share of the last N calls failed or took longer than the slow-call threshold
+LLM_BREAKER_FAILURE_RATE = float(os.environ.get('LLM_BREAKER_FAILURE_RATE', '0.5'))
+LLM_BREAKER_WINDOW = int(os.environ.get('LLM_BREAKER_WINDOW', '20'))
+LLM_BREAKER_MIN_CALLS = int(os.environ.get('LLM_BREAKER_MIN_CALLS', '10'))
+LLM_BREAKER_OPEN_SECONDS = float(os.environ.get('LLM_BREAKER_OPEN_SECONDS', '30'))
+LLM_SLOW_CALL_SECONDS = float(os.environ.get('LLM_SLOW_CALL_SECONDS', '15'))
+
+# AIMD limit on outstanding LLM calls, bounded above by the session pool
+LLM_CONCURRENCY_MIN = int(os.environ.get('LLM_CONCURRENCY_MIN', '1'))
+LLM_CONCURRENCY_QUEUE_TIMEOUT_SECONDS = float(os.environ.get('LLM_CONCURRENCY_QUEUE_TIMEOUT_SECONDS', '5'))
+
+# Tail latency: total budget per analysis call, a hedged duplicate past the observed quantile, retries with jitter
+LLM_CALL_BUDGET_SECONDS = float(os.environ.get('LLM_CALL_BUDGET_SECONDS', '20'))
+LLM_HEDGE_ENABLED = os.environ.get('LLM_HEDGE_ENABLED', 'true').lower() == 'true'
+LLM_HEDGE_QUANTILE = float(os.environ.get('LLM_HEDGE_QUANTILE', '0.95'))
+LLM_HEDGE_MIN_DELAY_SECONDS = float(os.environ.get('LLM_HEDGE_MIN_DELAY_SECONDS', '0.5'))
+LLM_MAX_ATTEMPTS = int(os.environ.get('LLM_MAX_ATTEMPTS', '3'))
+LLM_RETRY_BASE_SECONDS = float(os.environ.get('LLM_RETRY_BASE_SECONDS', '0.25'))
+LLM_RETRY_MAX_SECONDS = float(os.environ.get('LLM_RETRY_MAX_SECONDS', '4'))
+
+# Concurrent analyses are sent to the LLM together, up to this many items or this long a wait (1 disables)
+SENTIMENT_BATCH_MAX_ITEMS = int(os.environ.get('SENTIMENT_BATCH_MAX_ITEMS', '16'))
+SENTIMENT_BATCH_MAX_WAIT_MS = float(os.environ.get('SENTIMENT_BATCH_MAX_WAIT_MS', '20'))
+
+# Bulk ingestion tuning
+BULK_ANALYSIS_CONCURRENCY = int(os.environ.get('BULK_ANALYSIS_CONCURRENCY', '16'))
+BULK_INSERT_CHUNK_SIZE = int(os.environ.get('BULK_INSERT_CHUNK_SIZE', '500'))
+
+# Optional write-behind buffer for POST /feedback: one insert_many per this many docs or this long a wait
+FEEDBACK_WRITE_BUFFER = os.environ.get('FEEDBACK_WRITE_BUFFER', 'false').lower() == 'true'
+FEEDBACK_WRITE_BUFFER_MAX_DOCS = int(os.environ.get('FEEDBACK_WRITE_BUFFER_MAX_DOCS', '500'))
+FEEDBACK_WRITE_BUFFER_MAX_WAIT_MS = float(os.environ.get('FEEDBACK_WRITE_BUFFER_MAX_WAIT_MS', '10'))
+
+# Background sentiment pipeline
+SENTIMENT_ASYNC_MODE = os.environ.get('SENTIMENT_ASYNC_MODE', 'false').lower() == 'true'
+SENTIMENT_WORKER_POOL_SIZE = int(os.environ.get('SENTIMENT_WORKER_POOL_SIZE', '4'))
+SENTIMENT_WORKER_MAX_ATTEMPTS = int(os.environ.get('SENTIMENT_WORKER_MAX_ATTEMPTS', '3'))
+SENTIMENT_WORKER_LEASE_SECONDS = float(os.environ.get('SENTIMENT_WORKER_LEASE_SECONDS', '60'))
+
+# Readiness probe (GET /api/health/ready) gives Mongo this long to answer a ping
+HEALTH_CHECK_TIMEOUT_SECONDS = float(os.environ.get('HEALTH_CHECK_TIMEOUT_SECONDS', '2'))
+STARTUP_RETRY_SECONDS = float(os.environ.get('STARTUP_RETRY_SECONDS', '1'))
+# Term of the lease held while rebuilding rollups at startup; renewed until the rebuild finishes
+ROLLUP_REBUILD_LEASE_SECONDS = float(os.environ.get('ROLLUP_REBUILD_LEASE_SECONDS', '300'))
+
+# Sentiment result cache
+SENTIMENT_CACHE_MAX_ENTRIES = int(os.environ.get('SENTIMENT_CACHE_MAX_ENTRIES', '10000'))
+SENTIMENT_CACHE_TTL_SECONDS = float(os.environ.get('SENTIMENT_CACHE_TTL_SECONDS', '3600'))
+SENTIMENT_CACHE_PERSISTENT_TTL_SECONDS = int(os.environ.get('SENTIMENT_CACHE_PERSISTENT_TTL_SECONDS', str(30 * 24 * 3600)))
+
+# Resolves which collection(s) feedback reads and writes go to
+feedback_store = FeedbackStore(
+    db,
+    partitioned=FEEDBACK_PARTITIONING,
+    refresh_seconds=FEEDBACK_PARTITION_REFRESH_SECONDS
+)
+
 # Define Models
 class EmployeeFeedback(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -41,16 +163,49 @@ class EmployeeFeedback(BaseModel):
     sentiment: Optional[str] = None
     confidence_score: Optional[float] = None
     processed: bool = False
+    analysis_tier: Optional[str] = None  # local | llm | fallback
+
+# Fields returned to clients; keeps Mongo's _id and queue bookkeeping out of reads
+FEEDBACK_PROJECTION = {field: 1 for field in EmployeeFeedback.model_fields}
+FEEDBACK_PROJECTION["_id"] = 0
+
+def feedback_from_db(doc: Dict[str, Any]) -> EmployeeFeedback:
+    """Build a response model from a stored document without revalidating it; extra keys are dropped"""
+    return EmployeeFeedback.model_construct(**doc)
+
+# Newest first, with id as a tiebreaker so keyset pagination is stable
+FEEDBACK_SORT = [("timestamp", -1), ("id", -1)]
 
 class EmployeeFeedbackCreate(BaseModel):
     employee_id: Optional[str] = None
     feedback_text: str
     department: str
 
+class FeedbackPage(BaseModel):
+    items: List[EmployeeFeedback]
+    next_cursor: Optional[str] = None
+
+class BulkFeedbackItemResult(BaseModel):
+    index: int
+    status: str  # created | invalid | failed
+    id: Optional[str] = None
+    sentiment: Optional[str] = None
+    confidence_score: Optional[float] = None
+    error: Optional[str] = None
+
+class BulkFeedbackResponse(BaseModel):
+    total: int
+    created: int
+    failed: int
+    results: List[BulkFeedbackItemResult]
+
 class SentimentAnalysis(BaseModel):
     sentiment: str
     confidence_score: float
     reasoning: str
+    tier: str = "llm"
+    # How this answer was produced, for the sentiment_analysis_total metric; never stored or cached
+    outcome: str = Field("success", exclude=True)
 
 class FilterParams(BaseModel):
     departments: Optional[List[str]] = None
@@ -72,14 +227,9 @@ class ActionableInsight(BaseModel):
     affected_departments: List[str]
     suggested_actions: List[str]
 
-async def analyze_sentiment_with_llm(feedback_text: str) -> SentimentAnalysis:
-    """Analyze sentiment using Claude via emergentintegrations"""
-    try:
-        # Create a new LLM chat instance for each analysis
-        chat = LlmChat(
-            api_key=ANTHROPIC_API_KEY,
-            session_id=f"sentiment_{uuid.uuid4()}",
-            system_message="""You are an expert HR sentiment analyst. Analyze employee feedback and categorize it as one of: Positive, Neutral, or Negative.
+SENTIMENT_LLM_PROVIDER = "anthropic"
+SENTIMENT_LLM_MODEL = "claude-sonnet-4-20250514"
+SENTIMENT_SYSTEM_PROMPT = """You are an expert HR sentiment analyst. Analyze employee feedback and categorize it as one of: Positive, Neutral, or Negative.
 
 Provide your response in this exact JSON format:
 {
@@ -94,72 +244,375 @@ Guidelines:
 - Neutral: Factual statements, suggestions without emotion, balanced feedback
 - Confidence score should be between 0.0 and 1.0
 - Keep reasoning concise but insightful"""
-        ).with_model("anthropic", "claude-sonnet-4-20250514")
 
-        # Create user message
-        user_message = UserMessage(
-            text=f"Analyze this employee feedback for sentiment:\n\n'{feedback_text}'"
-        )
+sentiment_cache = SentimentCache(
+    db.sentiment_cache,
+    namespace=cache_namespace(f"{SENTIMENT_LLM_PROVIDER}/{SENTIMENT_LLM_MODEL}", SENTIMENT_SYSTEM_PROMPT),
+    max_entries=SENTIMENT_CACHE_MAX_ENTRIES,
+    ttl_seconds=SENTIMENT_CACHE_TTL_SECONDS,
+    persistent_ttl_seconds=SENTIMENT_CACHE_PERSISTENT_TTL_SECONDS,
+)
+
+def llm_chat_module():
+    """emergentintegrations pulls in the provider SDKs, so it is imported on first use instead of at startup"""
+    from emergentintegrations.llm import chat
+    return chat
+
+def create_sentiment_chat(slot: int):
+    return llm_chat_module().LlmChat(
+        api_key=ANTHROPIC_API_KEY,
+        session_id=f"sentiment_pool_{slot}_{uuid.uuid4()}",
+        system_message=SENTIMENT_SYSTEM_PROMPT
+    ).with_model(SENTIMENT_LLM_PROVIDER, SENTIMENT_LLM_MODEL)
+
+llm_pool = LlmSessionPool(create_sentiment_chat, size=LLM_POOL_SIZE)
+
+llm_guard = LlmGuard(
+    CircuitBreaker(
+        failure_rate=LLM_BREAKER_FAILURE_RATE,
+        window_size=LLM_BREAKER_WINDOW,
+        min_calls=LLM_BREAKER_MIN_CALLS,
+        slow_call_seconds=LLM_SLOW_CALL_SECONDS,
+        open_seconds=LLM_BREAKER_OPEN_SECONDS
+    ),
+    AdaptiveLimit(
+        initial=LLM_POOL_SIZE,
+        min_limit=LLM_CONCURRENCY_MIN,
+        max_limit=LLM_POOL_SIZE,
+        slow_call_seconds=LLM_SLOW_CALL_SECONDS,
+        queue_timeout=LLM_CONCURRENCY_QUEUE_TIMEOUT_SECONDS
+    )
+)
+
+llm_caller = HedgedCaller(
+    llm_guard,
+    budget_seconds=LLM_CALL_BUDGET_SECONDS,
+    hedge=LLM_HEDGE_ENABLED,
+    hedge_quantile=LLM_HEDGE_QUANTILE,
+    hedge_min_delay=LLM_HEDGE_MIN_DELAY_SECONDS,
+    max_attempts=LLM_MAX_ATTEMPTS,
+    backoff_base=LLM_RETRY_BASE_SECONDS,
+    backoff_max=LLM_RETRY_MAX_SECONDS
+)
+
+async def send_llm_message(user_message, kind: str = "single") -> str:
+    """Send one prompt on a pooled session, within the latency budget and through the circuit breaker"""
+    async def call():
+        async with llm_pool.session() as chat:
+            started = time.perf_counter()
+            outcome = "error"
+            metrics.LLM_IN_FLIGHT.inc()
+            try:
+                response = await chat.send_message(user_message)
+                outcome = "success"
+                return response
+            except asyncio.CancelledError:
+                outcome = "cancelled"
+                raise
+            finally:
+                metrics.LLM_IN_FLIGHT.dec()
+                metrics.LLM_CALL_SECONDS.observe(time.perf_counter() - started, kind, outcome)
+    return await llm_caller.call(call, kind=kind)
 
-        # Get response from LLM
-        response = await chat.send_message(user_message)
+def parse_llm_analysis(response: str) -> SentimentAnalysis:
+    """Parse a single-item LLM response"""
+    try:
+        result = json.loads(response)
+        return SentimentAnalysis(
+            sentiment=result["sentiment"],
+            confidence_score=result["confidence_score"],
+            reasoning=result["reasoning"]
+        )
+    except json.JSONDecodeError:
+        # Fallback parsing if response isn't pure JSON
+        if "Positive" in response:
+            sentiment = "Positive"
+        elif "Negative" in response:
+            sentiment = "Negative"
+        else:
+            sentiment = "Neutral"
         
-        # Parse the JSON response
-        import json
+        return SentimentAnalysis(
+            sentiment=sentiment,
+            confidence_score=0.8,
+            reasoning="AI analysis based on text content",
+            outcome="json_parse_fallback"
+        )
+
+async def request_llm_analysis(feedback_text: str) -> SentimentAnalysis:
+    """One feedback item, one LLM call"""
+    user_message = llm_chat_module().UserMessage(
+        text=f"Analyze this employee feedback for sentiment:\n\n'{feedback_text}'"
+    )
+
+    return parse_llm_analysis(await send_llm_message(user_message))
+
+async def request_llm_batch(texts: List[str]) -> List[Optional[SentimentAnalysis]]:
+    """Several feedback items in one LLM call; items missing from the answer come back as None"""
+    items = "\n".join(f"{index}. {json.dumps(text)}" for index, text in enumerate(texts))
+    user_message = llm_chat_module().UserMessage(
+        text=(
+            f"Analyze each of these {len(texts)} employee feedback items for sentiment. "
+            "Respond with only a JSON array holding one object per item, in the format above "
+            "plus an \"index\" field with the item's number:\n\n" + items
+        )
+    )
+
+    response = await send_llm_message(user_message, kind="batch")
+
+    # Tolerate prose or code fences around the array; anything else fails the whole batch
+    start, end = response.find("["), response.rfind("]")
+    if start < 0 or end < start:
+        raise ValueError("no JSON array in batch response")
+    results = json.loads(response[start:end + 1])
+    analyses: List[Optional[SentimentAnalysis]] = [None] * len(texts)
+    for result in results:
         try:
-            result = json.loads(response)
-            return SentimentAnalysis(
+            index = int(result["index"])
+            if result["sentiment"] not in ("Positive", "Neutral", "Negative") or not 0 <= index < len(texts):
+                continue
+            analyses[index] = SentimentAnalysis(
                 sentiment=result["sentiment"],
                 confidence_score=result["confidence_score"],
                 reasoning=result["reasoning"]
             )
-        except json.JSONDecodeError:
-            # Fallback parsing if response isn't pure JSON
-            if "Positive" in response:
-                sentiment = "Positive"
-            elif "Negative" in response:
-                sentiment = "Negative"
-            else:
-                sentiment = "Neutral"
-            
+        except (KeyError, TypeError, ValueError):
+            continue
+    return analyses
+
+sentiment_batcher = MicroBatcher(
+    request_llm_batch,
+    request_llm_analysis,
+    max_items=SENTIMENT_BATCH_MAX_ITEMS,
+    max_wait_ms=SENTIMENT_BATCH_MAX_WAIT_MS,
+)
+
+# Concurrent analyses of the same (normalized) text share one call
+sentiment_flights = SingleFlight()
+
+# Loaded at startup when a trained model exists (see `manage.py train-classifier`)
+local_model: Optional[LinearSentimentModel] = None
+sentiment_tier_counts: Dict[str, int] = {"local": 0, "llm": 0, "fallback": 0}
+
+def load_local_model():
+    global local_model
+    if SENTIMENT_MODEL_PATH.exists():
+        try:
+            local_model = LinearSentimentModel.load(SENTIMENT_MODEL_PATH)
+            logging.info(f"Loaded local sentiment model from {SENTIMENT_MODEL_PATH}")
+        except Exception as e:
+            logging.error(f"Error loading local sentiment model: {str(e)}")
+
+async def analyze_sentiment_with_llm(feedback_text: str, fallback: bool = True) -> SentimentAnalysis:
+    """Analyze sentiment locally when confident, otherwise using Claude via emergentintegrations.
+
+    With fallback=False, LLM and circuit-breaker errors are raised instead of
+    being answered from the keyword lexicon, so the caller can retry.
+    """
+    key = normalize_feedback_text(feedback_text)
+    led = False
+
+    async def lead():
+        nonlocal led
+        led = True
+        return await analyze_sentiment_tiered(feedback_text, fallback)
+
+    analysis = await sentiment_flights.do(key if fallback else f"strict:{key}", lead)
+    # Callers that joined another caller's analysis are counted apart from it
+    record_sentiment_outcome(analysis, analysis.outcome if led else "coalesced")
+    return analysis
+
+def record_sentiment_outcome(analysis: SentimentAnalysis, outcome: str):
+    """Count one finished analysis; every answer handed out is recorded exactly once"""
+    sentiment_tier_counts[analysis.tier] = sentiment_tier_counts.get(analysis.tier, 0) + 1
+    metrics.SENTIMENT_OUTCOMES.inc(outcome)
+
+def keyword_sentiment_analysis(feedback_text: str) -> SentimentAnalysis:
+    """Whole-word lexicon analysis used when the LLM is unavailable"""
+    sentiment, _ = lexicon_classify(feedback_text)
+    return SentimentAnalysis(
+        sentiment=sentiment,
+        confidence_score=0.6,
+        reasoning="Fallback keyword-based analysis",
+        tier="fallback",
+        outcome="keyword_fallback"
+    )
+
+async def analyze_sentiment_tiered(feedback_text: str, fallback: bool = True) -> SentimentAnalysis:
+    if local_model is not None:
+        sentiment, confidence = local_model.predict(feedback_text)
+        if confidence >= LOCAL_CLASSIFIER_THRESHOLD:
             return SentimentAnalysis(
                 sentiment=sentiment,
-                confidence_score=0.8,
-                reasoning="AI analysis based on text content"
+                confidence_score=round(confidence, 3),
+                reasoning="Local classifier",
+                tier="local",
+                outcome="local"
             )
+
+    cached = await sentiment_cache.get(feedback_text)
+    if cached is not None:
+        return SentimentAnalysis(**cached, outcome="cache_hit")
+
+    try:
+        # While the breaker is open, go straight to the fallback instead of queueing for the LLM
+        llm_guard.check()
+        analysis = await sentiment_batcher.submit(feedback_text)
+
+        # Only LLM answers are cached; keyword fallbacks below are not worth keeping
+        await sentiment_cache.set(feedback_text, analysis.model_dump())
+        return analysis
             
     except Exception as e:
-        logging.error(f"Error in sentiment analysis: {str(e)}")
-        # Fallback to simple keyword-based analysis
-        positive_words = ["good", "great", "excellent", "happy", "satisfied", "love", "amazing", "wonderful"]
-        negative_words = ["bad", "terrible", "hate", "awful", "frustrated", "disappointed", "angry", "upset"]
-        
-        text_lower = feedback_text.lower()
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
-        
-        if positive_count > negative_count:
-            sentiment = "Positive"
-        elif negative_count > positive_count:
-            sentiment = "Negative"
-        else:
-            sentiment = "Neutral"
-            
-        return SentimentAnalysis(
-            sentiment=sentiment,
-            confidence_score=0.6,
-            reasoning="Fallback keyword-based analysis"
-        )
+        if not fallback:
+            raise
+        if not isinstance(e, CircuitOpenError):
+            logging.error(f"Error in sentiment analysis: {str(e)}")
+        return keyword_sentiment_analysis(feedback_text)
 
 # API Routes
+# Bumped on every feedback write so results derived from the collection can be reused until then
+feedback_version = 0
+
+def mark_feedback_changed():
+    global feedback_version
+    feedback_version += 1
+
+# Live dashboard subscribers (GET /api/stream/dashboard)
+dashboard_events = Broadcaster(max_pending=STREAM_MAX_PENDING_EVENTS)
+
+# Other workers' writes: invalidate this process's caches and forward the delta to its subscribers.
+# Tailing uses the raw database so the long-poll cursor stays out of the Mongo latency metrics.
+cluster = ClusterSync(client[os.environ['DB_NAME']]) if CLUSTER_SYNC else None
+
+def apply_remote_feedback(delta: Dict[str, Any]):
+    mark_feedback_changed()
+    dashboard_events.publish("feedback", delta)
+
+if cluster is not None:
+    cluster.on("feedback", apply_remote_feedback)
+    cluster.on("sentiment_cache_invalidated", lambda _: sentiment_cache.forget_local())
+
+response_cache = ResponseCache(
+    max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=RESPONSE_CACHE_TTL_SECONDS,
+    gzip_min_bytes=GZIP_MIN_BYTES
+)
+
+read_flights = SingleFlight()
+
+def encode_model(obj: Any):
+    """orjson fallback for pydantic models: their field values, which orjson encodes natively"""
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+async def cached_json_response(request: Request, route: str, params: Dict[str, Any], compute) -> Response:
+    """Serve `compute()` from the response cache, answering If-None-Match with 304 when unchanged"""
+    key = response_cache.key(route, params)
+    version = feedback_version
+    entry = response_cache.get(key, version)
+    if entry is None:
+        async def build():
+            body = orjson.dumps(await compute(), default=encode_model)
+            return response_cache.put(key, version, body)
+
+        # Identical misses at the same data version wait on the first one instead of recomputing
+        entry = await read_flights.do((key, version), build)
+
+    use_gzip = entry.gzip_body is not None and "gzip" in request.headers.get("accept-encoding", "")
+    etag = gzip_etag(entry.etag) if use_gzip else entry.etag
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        response_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    # Compressed once when cached; the gzip middleware passes bodies that already carry an encoding
+    if use_gzip:
+        return Response(content=entry.gzip_body, media_type="application/json", headers={**headers, "Content-Encoding": "gzip"})
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+def feedback_delta(docs: List[Dict[str, Any]], counted_in_total: bool = True) -> Dict[str, Any]:
+    """Increments a dashboard applies for newly stored (or newly analyzed) documents"""
+    delta = {"total": len(docs) if counted_in_total else 0, "sentiment": {}, "department": {}, "timeline": {}}
+    for doc in docs:
+        sentiment = doc.get("sentiment")
+        if not sentiment:
+            continue
+        dept = doc.get("department") or "Unknown"
+        day = doc["timestamp"].strftime("%Y-%m-%d")
+        delta["sentiment"][sentiment] = delta["sentiment"].get(sentiment, 0) + 1
+        delta["department"].setdefault(dept, {})
+        delta["department"][dept][sentiment] = delta["department"][dept].get(sentiment, 0) + 1
+        delta["timeline"].setdefault(day, {})
+        delta["timeline"][day][sentiment.lower()] = delta["timeline"][day].get(sentiment.lower(), 0) + 1
+    newest = sorted(docs, key=lambda d: d["timestamp"], reverse=True)[:10]
+    delta["recent"] = [feedback_from_db(doc).model_dump(mode="json") for doc in newest]
+    return delta
+
+async def on_feedback_inserted(docs: List[Dict[str, Any]]):
+    """Propagate new documents to rollups, caches and live dashboards"""
+    if not docs:
+        return
+    mark_feedback_changed()
+    delta = feedback_delta(docs)
+    dashboard_events.publish("feedback", delta)
+    if cluster is not None:
+        await cluster.publish("feedback", delta)
+    try:
+        # Drift is repaired by `manage.py rebuild-rollups`
+        await rollups.record_inserted(db.sentiment_rollups, docs)
+    except Exception as e:
+        logging.error(f"Error updating sentiment rollups: {str(e)}")
+
+async def on_feedback_processed(doc: Dict[str, Any], analysis: SentimentAnalysis):
+    """A queued document received its sentiment from the background workers"""
+    mark_feedback_changed()
+    analyzed = {
+        **doc,
+        "sentiment": analysis.sentiment,
+        "confidence_score": analysis.confidence_score,
+        "analysis_tier": analysis.tier,
+        "processed": True
+    }
+    delta = feedback_delta([analyzed], counted_in_total=False)
+    dashboard_events.publish("feedback", delta)
+    if cluster is not None:
+        await cluster.publish("feedback", delta)
+    try:
+        await rollups.record_sentiment_change(db.sentiment_rollups, doc, analysis.sentiment)
+    except Exception as e:
+        logging.error(f"Error updating sentiment rollups: {str(e)}")
+
+feedback_writes = WriteBuffer(
+    feedback_store,
+    max_docs=FEEDBACK_WRITE_BUFFER_MAX_DOCS,
+    max_wait_ms=FEEDBACK_WRITE_BUFFER_MAX_WAIT_MS,
+    on_flushed=on_feedback_inserted
+) if FEEDBACK_WRITE_BUFFER else None
+
+async def store_feedback(doc: Dict[str, Any]):
+    """Insert one feedback document, returning once it is written (batched with others when buffering)"""
+    if feedback_writes is not None:
+        await feedback_writes.insert(doc)
+        return
+    await feedback_store.insert_one(doc)
+    await on_feedback_inserted([doc])
+
 @api_router.get("/")
 async def root():
     return {"message": "Msemobora - AI-Powered Employee Sentiment Analysis Platform"}
 
 @api_router.post("/feedback", response_model=EmployeeFeedback)
-async def create_feedback(feedback_data: EmployeeFeedbackCreate):
+async def create_feedback(feedback_data: EmployeeFeedbackCreate, async_analysis: bool = SENTIMENT_ASYNC_MODE):
     """Create new employee feedback and analyze sentiment"""
     try:
+        if async_analysis:
+            # Store immediately and let the worker pool fill in the sentiment
+            feedback = EmployeeFeedback(**feedback_data.model_dump(), processed=False)
+            await store_feedback(feedback.model_dump())
+            sentiment_workers.notify()
+            return feedback
+
         # Analyze sentiment
         sentiment_analysis = await analyze_sentiment_with_llm(feedback_data.feedback_text)
         
@@ -168,174 +621,665 @@ async def create_feedback(feedback_data: EmployeeFeedbackCreate):
             **feedback_data.model_dump(),
             sentiment=sentiment_analysis.sentiment,
             confidence_score=sentiment_analysis.confidence_score,
+            analysis_tier=sentiment_analysis.tier,
             processed=True
         )
         
         # Save to database
-        await db.employee_feedback.insert_one(feedback.model_dump())
-        
+        await store_feedback(feedback.model_dump())
+
         return feedback
     except Exception as e:
         logging.error(f"Error creating feedback: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing feedback: {str(e)}")
 
-@api_router.get("/feedback", response_model=List[EmployeeFeedback])
+def parse_bulk_feedback_body(body: bytes, content_type: str) -> List[Any]:
+    """Decode a bulk upload given either as a JSON array or as NDJSON"""
+    text = body.decode("utf-8")
+    stripped = text.lstrip()
+    if "ndjson" not in content_type and stripped.startswith("["):
+        items = json.loads(stripped)
+        if not isinstance(items, list):
+            raise ValueError("Expected a JSON array of feedback items")
+        return items
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+async def ingest_feedback_bulk(raw_items: List[Any], concurrency: int) -> BulkFeedbackResponse:
+    """Analyze raw items with at most `concurrency` LLM calls in flight and store them in chunks"""
+    results: List[Optional[BulkFeedbackItemResult]] = [None] * len(raw_items)
+    # Documents awaiting insert, and the position of each one in raw_items
+    pending: List[Dict[str, Any]] = []
+    pending_indexes: List[int] = []
+    work = iter(enumerate(raw_items))
+
+    async def flush(docs: List[Dict[str, Any]], indexes: List[int]):
+        # Unordered so one bad document does not abort the rest of the chunk
+        failed_positions = {}
+        try:
+            await feedback_store.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                failed_positions[error["index"]] = error.get("errmsg", "write error")
+        except Exception as e:
+            failed_positions = {position: str(e) for position in range(len(docs))}
+        for position, index in enumerate(indexes):
+            if position in failed_positions:
+                results[index].status = "failed"
+                results[index].error = failed_positions[position]
+        await on_feedback_inserted([doc for position, doc in enumerate(docs) if position not in failed_positions])
+
+    async def worker():
+        nonlocal pending, pending_indexes
+        for index, raw in work:
+            try:
+                feedback_data = EmployeeFeedbackCreate(**raw)
+            except Exception as e:
+                results[index] = BulkFeedbackItemResult(index=index, status="invalid", error=str(e))
+                continue
+
+            sentiment_analysis = await analyze_sentiment_with_llm(feedback_data.feedback_text)
+            feedback = EmployeeFeedback(
+                **feedback_data.model_dump(),
+                sentiment=sentiment_analysis.sentiment,
+                confidence_score=sentiment_analysis.confidence_score,
+                analysis_tier=sentiment_analysis.tier,
+                processed=True
+            )
+            results[index] = BulkFeedbackItemResult(
+                index=index,
+                status="created",
+                id=feedback.id,
+                sentiment=feedback.sentiment,
+                confidence_score=feedback.confidence_score
+            )
+            pending.append(feedback.model_dump())
+            pending_indexes.append(index)
+            if len(pending) >= BULK_INSERT_CHUNK_SIZE:
+                docs, indexes = pending, pending_indexes
+                pending, pending_indexes = [], []
+                await flush(docs, indexes)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, len(raw_items))))))
+    if pending:
+        await flush(pending, pending_indexes)
+
+    created = sum(1 for r in results if r.status == "created")
+    return BulkFeedbackResponse(
+        total=len(results),
+        created=created,
+        failed=len(results) - created,
+        results=results
+    )
+
+@api_router.post("/feedback/bulk", response_model=BulkFeedbackResponse)
+async def create_feedback_bulk(request: Request, concurrency: Optional[int] = None):
+    """Bulk-import feedback from a JSON array or NDJSON body"""
+    try:
+        raw_items = parse_bulk_feedback_body(await request.body(), request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid bulk payload: {str(e)}")
+
+    # Callers may lower the fan-out but never exceed the configured cap
+    limit = min(concurrency or BULK_ANALYSIS_CONCURRENCY, BULK_ANALYSIS_CONCURRENCY)
+    try:
+        return await ingest_feedback_bulk(raw_items, limit)
+    except Exception as e:
+        logging.error(f"Error in bulk feedback ingestion: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error processing bulk feedback: {str(e)}")
+
+def encode_feedback_cursor(doc: Dict[str, Any]) -> str:
+    """Opaque keyset cursor pointing just past `doc` in (timestamp, id) descending order"""
+    raw = json.dumps({"t": doc["timestamp"].isoformat(), "id": doc["id"]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_feedback_cursor(cursor: str) -> Dict[str, Any]:
+    """Filter selecting documents after the cursor position"""
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        timestamp, last_id = datetime.fromisoformat(raw["t"]), str(raw["id"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+    return {"$or": [
+        {"timestamp": {"$lt": timestamp}},
+        {"timestamp": timestamp, "id": {"$lt": last_id}}
+    ]}
+
+@api_router.get("/feedback", response_model=Union[List[EmployeeFeedback], FeedbackPage])
 async def get_feedback(
+    request: Request,
     department: Optional[str] = None,
     sentiment: Optional[str] = None,
-    limit: int = 100
+    limit: int = Query(100, ge=1, le=FEEDBACK_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    paginate: bool = False
 ):
-    """Get employee feedback with optional filtering"""
+    """Get employee feedback with optional filtering.
+
+    With paginate=true (or a cursor) the response is a page with `items` and a
+    `next_cursor` to pass back for the following page.
+    """
+    query = {}
+    if department:
+        query["department"] = department
+    if sentiment:
+        query["sentiment"] = sentiment
+    cursor_end = None
+    if cursor:
+        try:
+            query.update(decode_feedback_cursor(cursor))
+            # Partitions newer than the cursor position cannot hold the next page
+            cursor_end = query["$or"][1]["timestamp"]
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    paged = paginate or cursor is not None
+
+    async def compute():
+        # One extra row tells us whether another page exists
+        fetch = limit + 1 if paged else limit
+        feedback_list = await feedback_store.find_newest(query, FEEDBACK_PROJECTION, FEEDBACK_SORT, fetch, end=cursor_end)
+        items = [feedback_from_db(feedback) for feedback in feedback_list[:limit]]
+        if not paged:
+            return items
+        next_cursor = encode_feedback_cursor(feedback_list[limit - 1]) if len(feedback_list) > limit else None
+        return FeedbackPage(items=items, next_cursor=next_cursor)
+
     try:
-        query = {}
-        if department:
-            query["department"] = department
-        if sentiment:
-            query["sentiment"] = sentiment
-            
-        feedback_list = await db.employee_feedback.find(query).sort("timestamp", -1).limit(limit).to_list(limit)
-        return [EmployeeFeedback(**feedback) for feedback in feedback_list]
+        params = {
+            "department": department,
+            "sentiment": sentiment,
+            "limit": limit,
+            "cursor": cursor,
+            "paginate": paged
+        }
+        return await cached_json_response(request, "feedback", params, compute)
     except Exception as e:
         logging.error(f"Error retrieving feedback: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving feedback: {str(e)}")
 
+def parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value.replace('Z', '+00:00')) if value else None
+
+def build_feedback_filter(start_date: Optional[str], end_date: Optional[str], departments: Optional[str]) -> Dict[str, Any]:
+    """Mongo filter shared by the dashboard-style read endpoints"""
+    query = {}
+    if start_date:
+        query["timestamp"] = {"$gte": parse_iso_datetime(start_date)}
+    if end_date:
+        if "timestamp" not in query:
+            query["timestamp"] = {}
+        query["timestamp"]["$lte"] = parse_iso_datetime(end_date)
+    if departments:
+        dept_list = departments.split(',')
+        query["department"] = {"$in": dept_list}
+    return query
+
+def resolve_timeline_window(start_date: Optional[str], end_date: Optional[str], granularity: str, timezone: str):
+    """Validate timeline options, returning (tz, start, end) as naive UTC bounds"""
+    if granularity not in timeline.GRANULARITIES:
+        raise ValueError(f"granularity must be one of {', '.join(timeline.GRANULARITIES)}")
+    tz = timeline.resolve_timezone(timezone)
+    start, end = timeline.resolve_range(parse_iso_datetime(start_date), parse_iso_datetime(end_date), granularity, tz)
+    # Rejects ranges with too many buckets before any query runs
+    timeline.bucket_labels(start, end, granularity, tz)
+    return tz, start, end
+
+def timeline_stages(start: datetime, end: datetime, granularity: str, timezone: str) -> List[Dict[str, Any]]:
+    return [
+        {"$match": {"timestamp": {"$gte": start, "$lte": end}, "sentiment": {"$ne": None}}},
+        timeline.timeline_group_stage(granularity, timezone)
+    ]
+
+def summarize_sentiment_rows(rows: List[Dict[str, Any]]):
+    """Sentiment distribution and department breakdown from (department, sentiment, count) rows"""
+    sentiment_dist = {"Positive": 0, "Neutral": 0, "Negative": 0}
+    department_breakdown = {}
+    for row in rows:
+        sentiment = row.get("sentiment")
+        if not sentiment:
+            continue
+        dept = row.get("department") or "Unknown"
+        sentiment_dist[sentiment] = sentiment_dist.get(sentiment, 0) + row["count"]
+        if dept not in department_breakdown:
+            department_breakdown[dept] = {"Positive": 0, "Neutral": 0, "Negative": 0}
+        department_breakdown[dept][sentiment] = department_breakdown[dept].get(sentiment, 0) + row["count"]
+    return sentiment_dist, department_breakdown
+
+# Set by prepare_rollups once the rollups cover all existing feedback; until then dashboards read raw feedback
+rollups_built = False
+
+def rollups_can_serve(start_date: Optional[str], end_date: Optional[str], granularity: str, timezone: str) -> bool:
+    """Rollups are per UTC day, so they only answer day-aligned UTC queries exactly"""
+    if not DASHBOARD_USE_ROLLUPS or not rollups_built or granularity == "hour" or timezone != "UTC":
+        return False
+    start, end = parse_iso_datetime(start_date), parse_iso_datetime(end_date)
+    return rollups.is_day_aligned(start and timeline.to_naive_utc(start)) and \
+        rollups.is_day_aligned(end and timeline.to_naive_utc(end))
+
+def rollup_timeline_rows(rows: List[Dict[str, Any]], granularity: str) -> List[Dict[str, Any]]:
+    """Reshape daily rollup rows like the $dateTrunc group output expected by timeline.build_timeline"""
+    return [
+        {"_id": {"bucket": timeline.truncate(row["day"], granularity), "sentiment": row["sentiment"]}, "count": row["count"]}
+        for row in rows
+        if row.get("sentiment")
+    ]
+
+async def dashboard_from_rollups(query, dept_list, start_date, end_date, granularity, tz, timeline_start, timeline_end):
+    start, end = parse_iso_datetime(start_date), parse_iso_datetime(end_date)
+    rows = await rollups.load_rows(
+        db.sentiment_rollups,
+        departments=dept_list,
+        start=start and timeline.to_naive_utc(start),
+        end=end and timeline.to_naive_utc(end)
+    )
+    sentiment_dist, department_breakdown = summarize_sentiment_rows(rows)
+
+    timeline_rows = rollup_timeline_rows(
+        [row for row in rows if timeline_start <= row["day"] <= timeline_end], granularity
+    )
+    recent = await feedback_store.find_newest(query, FEEDBACK_PROJECTION, FEEDBACK_SORT, 10)
+
+    return DashboardData(
+        total_feedback=sum(row["count"] for row in rows),
+        sentiment_distribution=sentiment_dist,
+        sentiment_timeline=timeline.build_timeline(timeline_rows, timeline_start, timeline_end, granularity, tz),
+        department_breakdown=department_breakdown,
+        recent_feedback=[feedback_from_db(f) for f in recent]
+    )
+
+async def dashboard_from_feedback(query, granularity, timezone, tz, timeline_start, timeline_end):
+    # Everything is counted server-side in one pass; only small per-group rows come back
+    facet = [
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "by_department": [
+                {"$match": {"sentiment": {"$ne": None}}},
+                {"$group": {
+                    "_id": {"department": "$department", "sentiment": "$sentiment"},
+                    "count": {"$sum": 1}
+                }},
+                {"$project": {"_id": 0, "department": "$_id.department", "sentiment": "$_id.sentiment", "count": 1}}
+            ],
+            "timeline": timeline_stages(timeline_start, timeline_end, granularity, timezone),
+            "recent": [
+                {"$sort": dict(FEEDBACK_SORT)},
+                {"$limit": 10},
+                {"$project": FEEDBACK_PROJECTION}
+            ]
+        }}
+    ]
+    facets = (await feedback_store.aggregate(query, facet))[0]
+    sentiment_dist, department_breakdown = summarize_sentiment_rows(facets["by_department"])
+
+    return DashboardData(
+        total_feedback=facets["total"][0]["count"] if facets["total"] else 0,
+        sentiment_distribution=sentiment_dist,
+        sentiment_timeline=timeline.build_timeline(facets["timeline"], timeline_start, timeline_end, granularity, tz),
+        department_breakdown=department_breakdown,
+        recent_feedback=[feedback_from_db(f) for f in facets["recent"]]
+    )
+
 @api_router.get("/dashboard", response_model=DashboardData)
 async def get_dashboard_data(
+    request: Request,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    departments: Optional[str] = None
+    departments: Optional[str] = None,
+    granularity: str = "day",
+    timezone: str = "UTC"
 ):
     """Get dashboard analytics data"""
     try:
-        # Build query
-        query = {}
-        if start_date:
-            query["timestamp"] = {"$gte": datetime.fromisoformat(start_date.replace('Z', '+00:00'))}
-        if end_date:
-            if "timestamp" not in query:
-                query["timestamp"] = {}
-            query["timestamp"]["$lte"] = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-        if departments:
-            dept_list = departments.split(',')
-            query["department"] = {"$in": dept_list}
-
-        # Get all feedback
-        all_feedback = await db.employee_feedback.find(query).to_list(1000)
-        
-        # Calculate sentiment distribution
-        sentiment_dist = {"Positive": 0, "Neutral": 0, "Negative": 0}
-        department_breakdown = {}
-        
-        for feedback in all_feedback:
-            # Sentiment distribution
-            sentiment = feedback.get("sentiment", "Neutral")
-            sentiment_dist[sentiment] = sentiment_dist.get(sentiment, 0) + 1
-            
-            # Department breakdown
-            dept = feedback.get("department", "Unknown")
-            if dept not in department_breakdown:
-                department_breakdown[dept] = {"Positive": 0, "Neutral": 0, "Negative": 0}
-            department_breakdown[dept][sentiment] = department_breakdown[dept].get(sentiment, 0) + 1
-
-        # Generate timeline data (last 7 days)
-        from datetime import timedelta
-        timeline_data = []
-        for i in range(7):
-            date = datetime.utcnow() - timedelta(days=i)
-            date_str = date.strftime("%Y-%m-%d")
-            day_feedback = [f for f in all_feedback if f["timestamp"].date() == date.date()]
-            
-            day_sentiment = {"Positive": 0, "Neutral": 0, "Negative": 0}
-            for feedback in day_feedback:
-                sentiment = feedback.get("sentiment", "Neutral")
-                day_sentiment[sentiment] += 1
-            
-            timeline_data.append({
-                "date": date_str,
-                "positive": day_sentiment["Positive"],
-                "neutral": day_sentiment["Neutral"],
-                "negative": day_sentiment["Negative"]
-            })
-        
-        timeline_data.reverse()  # Show oldest to newest
+        query = build_feedback_filter(start_date, end_date, departments)
+        tz, timeline_start, timeline_end = resolve_timeline_window(start_date, end_date, granularity, timezone)
+        use_rollups = rollups_can_serve(start_date, end_date, granularity, timezone)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        # Get recent feedback
-        recent_feedback = [EmployeeFeedback(**f) for f in all_feedback[:10]]
+    async def compute():
+        if use_rollups:
+            dept_list = departments.split(',') if departments else None
+            return await dashboard_from_rollups(
+                query, dept_list, start_date, end_date, granularity, tz, timeline_start, timeline_end
+            )
+        return await dashboard_from_feedback(query, granularity, timezone, tz, timeline_start, timeline_end)
 
-        return DashboardData(
-            total_feedback=len(all_feedback),
-            sentiment_distribution=sentiment_dist,
-            sentiment_timeline=timeline_data,
-            department_breakdown=department_breakdown,
-            recent_feedback=recent_feedback
-        )
+    try:
+        params = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "departments": departments,
+            "granularity": granularity,
+            "timezone": timezone
+        }
+        return await cached_json_response(request, "dashboard", params, compute)
     except Exception as e:
         logging.error(f"Error getting dashboard data: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error getting dashboard data: {str(e)}")
 
+@api_router.get("/feedback/export")
+async def export_feedback(
+    format: str = "ndjson",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    departments: Optional[str] = None
+):
+    """Stream all matching feedback as NDJSON, CSV or Parquet"""
+    if format not in feedback_export.EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(feedback_export.EXPORT_FORMATS)}")
+    if format == "parquet" and not feedback_export.parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow to be installed")
+    try:
+        query = build_feedback_filter(start_date, end_date, departments)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Cursors fetch in batches, so memory stays flat regardless of the row count
+    documents = feedback_store.stream_oldest(
+        query, FEEDBACK_PROJECTION, [("timestamp", 1), ("id", 1)], EXPORT_BATCH_SIZE
+    )
+
+    filename = f"employee_feedback_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.{format}"
+    return StreamingResponse(
+        feedback_export.export_stream(format, documents),
+        media_type=feedback_export.EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@api_router.get("/timeline")
+async def get_sentiment_timeline(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    departments: Optional[str] = None,
+    granularity: str = "day",
+    timezone: str = "UTC"
+):
+    """Get sentiment counts per hour, day, week or month over the requested range"""
+    try:
+        query = build_feedback_filter(None, None, departments)
+        tz, timeline_start, timeline_end = resolve_timeline_window(start_date, end_date, granularity, timezone)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        if rollups_can_serve(start_date, end_date, granularity, timezone):
+            day_rows = await rollups.load_rows(
+                db.sentiment_rollups,
+                departments=departments.split(',') if departments else None,
+                start=timeline_start,
+                end=timeline_end
+            )
+            rows = rollup_timeline_rows(day_rows, granularity)
+        else:
+            rows = await feedback_store.aggregate(
+                query, timeline_stages(timeline_start, timeline_end, granularity, timezone),
+                start=timeline_start, end=timeline_end
+            )
+        return {
+            "granularity": granularity,
+            "timezone": timezone,
+            "timeline": timeline.build_timeline(rows, timeline_start, timeline_end, granularity, tz)
+        }
+    except Exception as e:
+        logging.error(f"Error getting sentiment timeline: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error getting sentiment timeline: {str(e)}")
+
+# Insights only change when feedback does; keyed by feedback_version
+insights_cache: Dict[str, Any] = {"version": None, "insights": None}
+
+async def department_sentiment_counts() -> List[Dict[str, Any]]:
+    """Total and negative feedback per department in a single aggregation"""
+    use_rollups = DASHBOARD_USE_ROLLUPS and rollups_built
+    count = "$count" if use_rollups else 1
+    pipeline = [
+        {"$group": {
+            "_id": {"$ifNull": ["$department", "Unknown"]},
+            "total": {"$sum": count},
+            "negative": {"$sum": {"$cond": [{"$eq": ["$sentiment", "Negative"]}, count, 0]}}
+        }},
+        {"$match": {"total": {"$gt": 0}}},
+        {"$sort": {"negative": -1, "_id": 1}}
+    ]
+    if use_rollups:
+        return await db.sentiment_rollups.aggregate(pipeline).to_list(None)
+    return await feedback_store.aggregate({}, pipeline)
+
+def build_actionable_insights(department_counts: List[Dict[str, Any]]) -> List[ActionableInsight]:
+    insights = []
+
+    # Generate insights for departments with multiple negative feedback
+    for row in department_counts:
+        if row["negative"] >= 2:
+            dept = row["_id"]
+            insights.append(ActionableInsight(
+                priority="High",
+                category="Department Morale",
+                description=f"{dept} department shows concerning sentiment patterns with {row['negative']} negative feedback instances",
+                affected_departments=[dept],
+                suggested_actions=[
+                    "Schedule team meeting to address concerns",
+                    "Conduct one-on-one sessions with team members",
+                    "Review workload distribution and processes",
+                    "Implement feedback follow-up mechanisms"
+                ]
+            ))
+
+    # Add general insights based on overall sentiment
+    total = sum(row["total"] for row in department_counts)
+    if total:
+        negative_ratio = sum(row["negative"] for row in department_counts) / total
+
+        if negative_ratio > 0.3:
+            insights.append(ActionableInsight(
+                priority="Critical",
+                category="Overall Sentiment",
+                description=f"High negative sentiment ratio ({negative_ratio:.1%}) across organization",
+                affected_departments=sorted(row["_id"] for row in department_counts),
+                suggested_actions=[
+                    "Conduct organization-wide sentiment survey",
+                    "Review management practices and policies",
+                    "Implement employee wellness programs",
+                    "Establish regular feedback channels"
+                ]
+            ))
+
+    return insights
+
 @api_router.get("/insights", response_model=List[ActionableInsight])
-async def get_actionable_insights():
+async def get_actionable_insights(request: Request):
     """Generate actionable insights based on sentiment analysis"""
-    try:
-        # Get all negative feedback
-        negative_feedback = await db.employee_feedback.find({"sentiment": "Negative"}).to_list(100)
-        
-        insights = []
-        
-        if negative_feedback:
-            # Group by department
-            dept_issues = {}
-            for feedback in negative_feedback:
-                dept = feedback.get("department", "Unknown")
-                if dept not in dept_issues:
-                    dept_issues[dept] = []
-                dept_issues[dept].append(feedback["feedback_text"])
-            
-            # Generate insights for departments with multiple negative feedback
-            for dept, issues in dept_issues.items():
-                if len(issues) >= 2:
-                    insights.append(ActionableInsight(
-                        priority="High",
-                        category="Department Morale",
-                        description=f"{dept} department shows concerning sentiment patterns with {len(issues)} negative feedback instances",
-                        affected_departments=[dept],
-                        suggested_actions=[
-                            "Schedule team meeting to address concerns",
-                            "Conduct one-on-one sessions with team members",
-                            "Review workload distribution and processes",
-                            "Implement feedback follow-up mechanisms"
-                        ]
-                    ))
-        
-        # Add general insights based on overall sentiment
-        all_feedback = await db.employee_feedback.find().to_list(1000)
-        if all_feedback:
-            negative_ratio = len([f for f in all_feedback if f.get("sentiment") == "Negative"]) / len(all_feedback)
-            
-            if negative_ratio > 0.3:
-                insights.append(ActionableInsight(
-                    priority="Critical",
-                    category="Overall Sentiment",
-                    description=f"High negative sentiment ratio ({negative_ratio:.1%}) across organization",
-                    affected_departments=list(set([f.get("department", "Unknown") for f in all_feedback])),
-                    suggested_actions=[
-                        "Conduct organization-wide sentiment survey",
-                        "Review management practices and policies",
-                        "Implement employee wellness programs",
-                        "Establish regular feedback channels"
-                    ]
-                ))
-        
+    async def compute():
+        version = feedback_version
+        if insights_cache["version"] == version:
+            return insights_cache["insights"]
+
+        insights = build_actionable_insights(await department_sentiment_counts())
+        insights_cache.update(version=version, insights=insights)
         return insights
+
+    try:
+        return await cached_json_response(request, "insights", {}, compute)
     except Exception as e:
         logging.error(f"Error generating insights: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating insights: {str(e)}")
 
+@api_router.get("/stream/dashboard")
+async def stream_dashboard():
+    """Push dashboard deltas as Server-Sent Events whenever feedback is stored or analyzed"""
+    return StreamingResponse(
+        sse_events(dashboard_events, {"feedback_version": feedback_version}, STREAM_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@api_router.get("/stream/stats")
+async def get_stream_stats():
+    """Report live dashboard subscriber counts"""
+    return dashboard_events.stats()
+
+@api_router.get("/pipeline/status")
+async def get_pipeline_status():
+    """Report background sentiment queue depth and worker lag"""
+    try:
+        return await sentiment_workers.status()
+    except Exception as e:
+        logging.error(f"Error getting pipeline status: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error getting pipeline status: {str(e)}")
+
+@api_router.get("/llm/pool")
+async def get_llm_pool_stats():
+    """Report usage of the shared LLM session pool"""
+    return llm_pool.stats()
+
+@api_router.get("/llm/circuit")
+async def get_llm_circuit_status():
+    """Report circuit breaker state and the current adaptive concurrency limit"""
+    return llm_guard.stats()
+
+@api_router.get("/llm/latency")
+async def get_llm_latency_stats():
+    """Report call latency quantiles, timeouts, retries and hedges (each hedge is an extra provider call)"""
+    return llm_caller.stats()
+
+@api_router.get("/llm/batcher")
+async def get_llm_batcher_stats():
+    """Report how many analyses were sent to the LLM together"""
+    return sentiment_batcher.stats()
+
+@api_router.get("/response-cache/stats")
+async def get_response_cache_stats():
+    """Report hit/miss/304 counters for cached read endpoints"""
+    return {"feedback_version": feedback_version, **response_cache.stats()}
+
+@api_router.get("/sentiment/tiers")
+async def get_sentiment_tier_stats():
+    """Report how many analyses each tier produced and whether a local model is loaded"""
+    return {
+        "local_model_loaded": local_model is not None,
+        "local_model_path": str(SENTIMENT_MODEL_PATH),
+        "threshold": LOCAL_CLASSIFIER_THRESHOLD,
+        "counts": sentiment_tier_counts
+    }
+
+@api_router.get("/single-flight/stats")
+async def get_single_flight_stats():
+    """Report how many callers shared an in-flight analysis or read computation"""
+    return {"sentiment": sentiment_flights.stats(), "reads": read_flights.stats()}
+
+server_status_readable = True
+
+@api_router.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition of request, LLM and Mongo metrics for this process and its peers"""
+    # With several workers each one's series carry its worker label, so one scrape sees them all
+    worker = WORKER_ID if cluster is not None else None
+    breaker = llm_guard.breaker.stats()
+    caller = llm_caller.stats()
+    pool = llm_pool.stats()
+    extra = (
+        metrics.sample_lines("llm_circuit_open", "gauge", "1 while the LLM circuit breaker is open", int(breaker["state"] == "open"), worker)
+        + metrics.sample_lines("llm_concurrency_limit", "gauge", "Current adaptive limit on LLM calls", llm_guard.limiter.stats()["limit"], worker)
+        + metrics.sample_lines("llm_pool_idle_sessions", "gauge", "Idle pooled LLM sessions", pool["idle"], worker)
+        + metrics.sample_lines("llm_retries_total", "counter", "LLM calls retried after a transient error", caller["retries"], worker)
+        + metrics.sample_lines("llm_hedges_total", "counter", "Hedged duplicate LLM calls sent", caller["hedges"], worker)
+        + metrics.sample_lines("llm_timeouts_total", "counter", "LLM calls cut off by the latency budget", caller["timeouts"], worker)
+    )
+    global server_status_readable
+    if server_status_readable:
+        try:
+            extra += metrics.server_status_lines(await db.command("serverStatus"))
+        except Exception as e:
+            # Typically a user without clusterMonitor; report once rather than on every scrape
+            server_status_readable = False
+            logging.error(f"Error reading serverStatus for metrics, disabling server counters: {str(e)}")
+    # Request, LLM and Mongo series of the other live workers; the samples above are this worker's only
+    peers = []
+    if cluster is not None:
+        try:
+            peers = [
+                (state["worker_id"], state["metrics"])
+                for state in await cluster.peer_states(3 * METRICS_SHARE_SECONDS) if "worker_id" in state and "metrics" in state
+            ]
+        except Exception as e:
+            logging.error(f"Error reading other workers' metrics: {str(e)}")
+    return Response(content=metrics.REGISTRY.render(extra, peers=peers, worker=worker), media_type="text/plain; version=0.0.4")
+
+@api_router.get("/health/live")
+async def health_live():
+    """Liveness: the process is up and serving requests"""
+    return {"status": "alive", "worker_id": WORKER_ID}
+
+@api_router.get("/health/ready")
+async def health_ready():
+    """Readiness: startup finished, Mongo answers a ping and the LLM client is initialized"""
+    checks = {
+        "startup": startup_task is not None and startup_task.done() and startup_error is None,
+        "mongo": readiness["mongo"] and await ping_mongo(),
+        "llm": readiness["llm"],
+    }
+    ready = all(checks.values())
+    payload = {"status": "ready" if ready else "starting", "checks": checks}
+    if startup_error is not None:
+        payload.update(status="failed", error=startup_error)
+    return JSONResponse(payload, status_code=200 if ready else 503)
+
+@api_router.get("/cluster")
+async def get_cluster_status():
+    """Report this worker's identity and cross-worker event relay counters"""
+    if cluster is None:
+        return {"enabled": False, "worker_id": WORKER_ID, "web_concurrency": WEB_CONCURRENCY}
+    return {"enabled": True, "web_concurrency": WEB_CONCURRENCY, **cluster.stats()}
+
+@api_router.get("/write-buffer/stats")
+async def get_write_buffer_stats():
+    """Report batching of buffered feedback inserts"""
+    if feedback_writes is None:
+        return {"enabled": False}
+    return {"enabled": True, **feedback_writes.stats()}
+
+@api_router.get("/sentiment-cache/stats")
+async def get_sentiment_cache_stats():
+    """Report sentiment cache hit/miss counters"""
+    return sentiment_cache.stats()
+
+@api_router.delete("/sentiment-cache")
+async def invalidate_sentiment_cache(all_entries: bool = False):
+    """Drop cached analyses from previous models/prompts, or everything with all_entries=true"""
+    try:
+        deleted = await sentiment_cache.invalidate(all_namespaces=all_entries)
+        if cluster is not None:
+            await cluster.publish("sentiment_cache_invalidated", {"all_entries": all_entries})
+        return {"deleted": deleted}
+    except Exception as e:
+        logging.error(f"Error invalidating sentiment cache: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error invalidating sentiment cache: {str(e)}")
+
+@api_router.get("/admin/indexes")
+async def get_index_usage():
+    """Report how often each index of employee_feedback (or its newest partition) has been used"""
+    try:
+        collection = (await feedback_store.sources())[0][0]
+        return {"collection": collection.name, "indexes": await index_usage_report(collection)}
+    except Exception as e:
+        logging.error(f"Error getting index usage: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error getting index usage: {str(e)}")
+
+@api_router.get("/admin/rollups/check")
+async def check_sentiment_rollups(days: Optional[int] = 30):
+    """Compare sentiment_rollups against counts recomputed from raw feedback"""
+    try:
+        return await rollups.check_consistency(db, feedback_store, days=days)
+    except Exception as e:
+        logging.error(f"Error checking sentiment rollups: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error checking sentiment rollups: {str(e)}")
+
 @api_router.get("/departments")
 async def get_departments():
     """Get list of all departments"""
     try:
-        departments = await db.employee_feedback.distinct("department")
+        if DASHBOARD_USE_ROLLUPS and rollups_built:
+            departments = await db.sentiment_rollups.distinct("department", {"count": {"$gt": 0}})
+        else:
+            departments = await feedback_store.distinct("department")
         return {"departments": departments}
     except Exception as e:
         logging.error(f"Error getting departments: {str(e)}")
@@ -344,6 +1288,10 @@ async def get_departments():
 # Include the router in the main app
 app.include_router(api_router)
 
+app.add_middleware(metrics.MetricsMiddleware)
+
+app.add_middleware(GZipExceptStreamsMiddleware, minimum_size=GZIP_MIN_BYTES, exclude_prefixes=["/api/stream/"])
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -359,8 +1307,139 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def exhausted_sentiment_analysis(feedback_text: str) -> SentimentAnalysis:
+    """Keyword answer for a queued document whose LLM attempts have all failed"""
+    analysis = keyword_sentiment_analysis(feedback_text)
+    record_sentiment_outcome(analysis, analysis.outcome)
+    return analysis
+
+sentiment_workers = SentimentWorkerPool(
+    feedback_store.queue,
+    lambda text: analyze_sentiment_with_llm(text, fallback=False),
+    on_processed=on_feedback_processed,
+    fallback=exhausted_sentiment_analysis,
+    size=SENTIMENT_WORKER_POOL_SIZE,
+    max_attempts=SENTIMENT_WORKER_MAX_ATTEMPTS,
+    lease_seconds=SENTIMENT_WORKER_LEASE_SECONDS,
+)
+
+# Filled in by the startup warm-up; GET /api/health/ready answers 503 until it has finished
+readiness = {"mongo": False, "llm": False}
+startup_task: Optional[asyncio.Task] = None
+startup_error: Optional[str] = None
+rollups_task: Optional[asyncio.Task] = None
+
+async def ping_mongo() -> bool:
+    try:
+        await asyncio.wait_for(client.admin.command("ping"), HEALTH_CHECK_TIMEOUT_SECONDS)
+        return True
+    except Exception:
+        return False
+
+async def prepare_rollups():
+    """Make sure the rollups cover existing feedback before this worker answers dashboards from them.
+
+    One worker (the holder of the rollup_rebuild lease) builds them on the
+    first start after upgrading and then marks them built; the others wait
+    for that marker, serving dashboards from raw feedback meanwhile.
+    """
+    global rollups_built
+    while True:
+        try:
+            await rollups.ensure_indexes(db.sentiment_rollups)
+            if await rollups.is_built(db.app_state):
+                break
+            if await acquire_lease(db.app_state, "rollup_rebuild", WORKER_ID, ROLLUP_REBUILD_LEASE_SECONDS):
+                # Existing rows may be increments for feedback stored since startup, covering
+                # none of the older documents, so they never show the rollups are complete
+                if await feedback_store.find_one():
+                    rows = await run_with_lease(
+                        db.app_state, "rollup_rebuild", WORKER_ID, ROLLUP_REBUILD_LEASE_SECONDS,
+                        lambda: rollups.rebuild(db, feedback_store)
+                    )
+                    logging.info(f"Built {rows} sentiment rollup rows from existing feedback")
+                else:
+                    rows = await db.sentiment_rollups.count_documents({})
+                await rollups.mark_built(db.app_state, rows)
+                break
+            logging.info("Waiting for another worker to build the sentiment rollups")
+        except Exception as e:
+            logging.error(f"Error preparing sentiment rollups: {str(e)}")
+        await asyncio.sleep(STARTUP_RETRY_SECONDS)
+    rollups_built = True
+
+async def prepare_database():
+    """Wait for Mongo, then create indexes, start the background consumers and the rollup build"""
+    global rollups_task
+    while not await ping_mongo():
+        logging.error(f"MongoDB is not reachable yet, retrying in {STARTUP_RETRY_SECONDS}s")
+        await asyncio.sleep(STARTUP_RETRY_SECONDS)
+    try:
+        await feedback_store.ensure_indexes()
+    except Exception as e:
+        logging.error(f"Error creating employee_feedback indexes: {str(e)}")
+    if DASHBOARD_USE_ROLLUPS:
+        # Dashboards read raw feedback until the rollups are built, so readiness need not
+        # wait for a first rebuild that can take minutes on a large collection
+        rollups_task = asyncio.ensure_future(prepare_rollups())
+    try:
+        await sentiment_cache.ensure_indexes()
+    except Exception as e:
+        logging.error(f"Error creating sentiment cache indexes: {str(e)}")
+    if SENTIMENT_WORKER_POOL_SIZE > 0:
+        sentiment_workers.start()
+    if cluster is not None:
+        try:
+            await cluster.ensure_collection()
+            cluster.start(
+                share=lambda: {"worker_id": WORKER_ID, "metrics": metrics.REGISTRY.snapshot()},
+                share_seconds=METRICS_SHARE_SECONDS
+            )
+        except Exception as e:
+            logging.error(f"Error starting cluster sync: {str(e)}")
+    readiness["mongo"] = True
+
+async def prepare_llm():
+    """Load the local classifier and open the LLM sessions, importing the SDK off the event loop"""
+    await asyncio.to_thread(load_local_model)
+    try:
+        await asyncio.to_thread(llm_chat_module)
+        llm_pool.warm()
+        readiness["llm"] = True
+    except Exception as e:
+        logging.error(f"Error initializing LLM client: {str(e)}")
+
+@app.on_event("startup")
+async def startup_db_client():
+    global startup_task
+    # Accept connections (and liveness probes) at once; readiness follows when the warm-up is done
+    startup_task = asyncio.ensure_future(asyncio.gather(prepare_database(), prepare_llm()))
+    startup_task.add_done_callback(report_startup_failure)
+
+def report_startup_failure(task: asyncio.Future):
+    """Log a warm-up that raised (nothing else awaits the task) and keep the error for the readiness probe"""
+    global startup_error
+    if task.cancelled() or task.exception() is None:
+        return
+    startup_error = str(task.exception()) or type(task.exception()).__name__
+    logging.error(f"Startup failed, this worker will not become ready: {startup_error}")
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    for task in (startup_task, rollups_task):
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    if cluster is not None:
+        await cluster.stop()
+    await sentiment_workers.stop()
+    await sentiment_batcher.close()
+    if feedback_writes is not None:
+        await feedback_writes.close()
+    await llm_pool.close()
     client.close()
 
 if __name__ == "__main__":
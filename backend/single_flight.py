@@ -0,0 +1,40 @@
+"""Coalescing of concurrent identical operations onto one in-flight call"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Runs at most one ``fn()`` per key at a time; concurrent callers with the same key share its result.
+
+    The shared call runs as its own task, so a caller that disconnects or is
+    cancelled does not cancel the work the other callers are waiting on.
+    Exceptions are shared the same way. Nothing is remembered once the call
+    finishes: caching is left to the layers above.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            self.executions += 1
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._inflight),
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": self.coalesced / self.calls if self.calls else 0.0,
+        }
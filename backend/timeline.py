@@ -0,0 +1,151 @@
+"""Sentiment timeline bucketing over an arbitrary range, granularity and timezone"""
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
+
+GRANULARITIES = ("hour", "day", "week", "month")
+
+# How far back the timeline reaches when no start_date is requested
+DEFAULT_BUCKETS = {"hour": 24, "day": 7, "week": 12, "month": 12}
+
+# Guards against e.g. hourly buckets over several years
+MAX_BUCKETS = 10000
+
+LABEL_FORMATS = {"hour": "%Y-%m-%dT%H:00", "day": "%Y-%m-%d", "week": "%Y-%m-%d", "month": "%Y-%m"}
+
+# Files in the system zoneinfo directory that ZoneInfo loads but $dateTrunc does not know
+NON_OLSON_ZONES = {"Factory", "localtime", "posixrules"}
+NON_OLSON_PREFIXES = ("posix/", "right/")
+
+
+@lru_cache(maxsize=1)
+def olson_zone_names() -> FrozenSet[str]:
+    """Olson timezone names, the ones Mongo date operators accept"""
+    return frozenset(
+        name for name in available_timezones()
+        if name not in NON_OLSON_ZONES and not name.startswith(NON_OLSON_PREFIXES)
+    )
+
+
+def resolve_timezone(name: str) -> ZoneInfo:
+    if name not in olson_zone_names():
+        raise ValueError(f"Unknown timezone: {name}")
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {name}")
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Mongo stores naive UTC datetimes; convert aware inputs to match"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def truncate(local: datetime, granularity: str) -> datetime:
+    """Start of the bucket containing a (naive, wall-clock) local time"""
+    if granularity == "hour":
+        return local.replace(minute=0, second=0, microsecond=0)
+    day = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def advance(local: datetime, granularity: str) -> datetime:
+    if granularity == "hour":
+        return local + timedelta(hours=1)
+    if granularity == "day":
+        return local + timedelta(days=1)
+    if granularity == "week":
+        return local + timedelta(weeks=1)
+    if local.month == 12:
+        return local.replace(year=local.year + 1, month=1)
+    return local.replace(month=local.month + 1)
+
+
+def resolve_range(
+    start: Optional[datetime],
+    end: Optional[datetime],
+    granularity: str,
+    tz: ZoneInfo,
+    now: Optional[datetime] = None,
+) -> Tuple[datetime, datetime]:
+    """Naive UTC [start, end] for the timeline.
+
+    Without an explicit start the window covers DEFAULT_BUCKETS whole buckets
+    ending with the one that contains ``end``.
+    """
+    end = to_naive_utc(end) if end else (now or datetime.utcnow())
+    if start:
+        return to_naive_utc(start), end
+    local = truncate(end.replace(tzinfo=timezone.utc).astimezone(tz).replace(tzinfo=None), granularity)
+    for _ in range(DEFAULT_BUCKETS[granularity] - 1):
+        local = _step_back(local, granularity)
+    return to_naive_utc(local.replace(tzinfo=tz)), end
+
+
+def _step_back(value: datetime, granularity: str) -> datetime:
+    if granularity == "month":
+        if value.month == 1:
+            return value.replace(year=value.year - 1, month=12, day=1)
+        return value.replace(month=value.month - 1, day=1)
+    return value - {"hour": timedelta(hours=1), "day": timedelta(days=1), "week": timedelta(weeks=1)}[granularity]
+
+
+def _exists(local: datetime, tz: ZoneInfo) -> bool:
+    return local.replace(tzinfo=tz).astimezone(timezone.utc).astimezone(tz).replace(tzinfo=None) == local
+
+
+def bucket_labels(start: datetime, end: datetime, granularity: str, tz: ZoneInfo) -> List[str]:
+    """Every bucket label between naive UTC start and end, in the requested timezone"""
+    local = truncate(start.replace(tzinfo=timezone.utc).astimezone(tz).replace(tzinfo=None), granularity)
+    local_end = end.replace(tzinfo=timezone.utc).astimezone(tz).replace(tzinfo=None)
+    labels = []
+    while local <= local_end:
+        label = local.strftime(LABEL_FORMATS[granularity])
+        # Skip the wall-clock hour a spring-forward change jumps over; no document can fall into it
+        if (not labels or labels[-1] != label) and (granularity != "hour" or _exists(local, tz)):
+            labels.append(label)
+        if len(labels) > MAX_BUCKETS:
+            raise ValueError(f"Timeline would have more than {MAX_BUCKETS} buckets; use a coarser granularity")
+        local = advance(local, granularity)
+    return labels
+
+
+def timeline_group_stage(granularity: str, tz_name: str) -> Dict[str, Any]:
+    """$group stage counting documents per (bucket, sentiment) with $dateTrunc"""
+    trunc = {"date": "$timestamp", "unit": granularity, "timezone": tz_name}
+    if granularity == "week":
+        trunc["startOfWeek"] = "monday"
+    return {
+        "$group": {
+            "_id": {"bucket": {"$dateTrunc": trunc}, "sentiment": "$sentiment"},
+            "count": {"$sum": 1},
+        }
+    }
+
+
+def build_timeline(
+    rows: List[Dict[str, Any]], start: datetime, end: datetime, granularity: str, tz: ZoneInfo
+) -> List[Dict[str, Any]]:
+    """Turn grouped rows into the dashboard's oldest-to-newest list, filling empty buckets"""
+    counts: Dict[Tuple[str, str], int] = {}
+    for row in rows:
+        bucket = row["_id"]["bucket"].replace(tzinfo=timezone.utc).astimezone(tz)
+        key = (bucket.strftime(LABEL_FORMATS[granularity]), row["_id"]["sentiment"])
+        counts[key] = counts.get(key, 0) + row["count"]
+
+    return [
+        {
+            "date": label,
+            "positive": counts.get((label, "Positive"), 0),
+            "neutral": counts.get((label, "Neutral"), 0),
+            "negative": counts.get((label, "Negative"), 0),
+        }
+        for label in bucket_labels(start, end, granularity, tz)
+    ]
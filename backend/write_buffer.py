@@ -0,0 +1,104 @@
+"""Write-behind buffer that turns concurrent single-document inserts into insert_many batches"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from pymongo.errors import BulkWriteError
+
+Pending = Tuple[Dict[str, Any], asyncio.Future]
+
+
+class WriteBuffer:
+    """Collects documents for up to ``max_docs`` or ``max_wait_ms`` and writes them with one insert_many.
+
+    ``insert()`` returns only after the batch holding the document has been
+    written, and raises if that particular document failed (other documents
+    in the batch are unaffected, since the write is unordered).
+    ``on_flushed`` receives the documents that were written, once per batch,
+    before their callers are released.
+    """
+
+    def __init__(self, collection, max_docs: int = 500, max_wait_ms: float = 10.0,
+                 on_flushed: Optional[Callable[[List[Dict[str, Any]]], Awaitable[None]]] = None):
+        self.collection = collection
+        self.max_docs = max_docs
+        self.max_wait = max_wait_ms / 1000
+        self.on_flushed = on_flushed
+        self._pending: List[Pending] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._closed = False
+        self.inserted = 0
+        self.failed = 0
+        self.flushes = 0
+
+    async def insert(self, doc: Dict[str, Any]):
+        if self._closed:
+            raise RuntimeError("Write buffer is closed")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((doc, future))
+        if len(self._pending) >= self.max_docs:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        # Shielded: a caller that goes away must not lose track of a write that is already queued
+        await asyncio.shield(future)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._write(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _write(self, batch: List[Pending]):
+        docs = [doc for doc, _ in batch]
+        errors: Dict[int, Exception] = {}
+        try:
+            await self.collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                errors[error["index"]] = RuntimeError(error.get("errmsg", "write error"))
+        except Exception as e:
+            errors = {position: e for position in range(len(batch))}
+        self.flushes += 1
+        self.failed += len(errors)
+        self.inserted += len(batch) - len(errors)
+
+        written = [doc for position, doc in enumerate(docs) if position not in errors]
+        if written and self.on_flushed is not None:
+            try:
+                await self.on_flushed(written)
+            except Exception as e:
+                logging.error(f"Error propagating buffered feedback writes: {str(e)}")
+
+        for position, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if position in errors:
+                future.set_exception(errors[position])
+            else:
+                future.set_result(None)
+
+    async def close(self):
+        """Write anything still buffered and wait for in-flight batches (called on shutdown)"""
+        self._closed = True
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_docs": self.max_docs,
+            "max_wait_ms": self.max_wait * 1000,
+            "pending": len(self._pending),
+            "flushes": self.flushes,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "avg_batch_size": (self.inserted + self.failed) / self.flushes if self.flushes else 0.0,
+        }
@@ -0,0 +1,30 @@
+"""ASGI app for benchmarks/bench_workers.py: server.app with the fake LLM and seeded data.
+
+Uses mongomock unless BENCH_MONGO_URL is set. With mongomock every worker
+process has its own in-memory database (seeded identically), which measures
+the CPU side of scaling; point it at a mongod to include cross-worker sync.
+"""
+import os
+import random
+
+from load_benchmark import fake_llm, load_app, seed
+
+SEED_DOCS = int(os.environ.get("BENCH_SEED_DOCS", "2000"))
+
+server = load_app(os.environ.get("BENCH_MONGO_URL"), os.environ["BENCH_DB_NAME"])
+fake_llm.configure(fake_llm.LlmProfile(median_seconds=0.05, sigma=0.3, slow_rate=0.0))
+app = server.app
+
+
+async def seed_benchmark_data():
+    from cluster_sync import WORKER_ID, acquire_lease
+
+    if await server.feedback_store.find_one():
+        return
+    # With a shared mongod, only one of the workers starting together seeds
+    if await acquire_lease(server.db.app_state, "benchmark_seed", WORKER_ID, 600):
+        await seed(server, SEED_DOCS, random.Random(0))
+
+
+# Seed before server.py's warm-up runs, so it finds the rollups already recorded instead of rebuilding them
+app.router.on_startup.insert(0, seed_benchmark_data)
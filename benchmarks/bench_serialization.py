@@ -0,0 +1,116 @@
+"""Serialization cost of feedback list responses, per 1000 documents.
+
+    python benchmarks/bench_serialization.py --docs 1000 --repeat 20
+
+Compares the ways a page of stored feedback has been turned into a response
+body, on identical documents:
+
+  response_model   validate each doc, revalidate through the response model, jsonable_encoder, json.dumps
+  validated        validate each doc, jsonable_encoder, json.dumps (the response cache's former path)
+  fast             projected docs, model_construct, orjson (server.feedback_from_db / encode_model)
+
+and checks that `validated` and `fast` produce identical bytes. Gzip cost and
+size of the fast body are reported for the compression middleware.
+"""
+import gzip
+import json
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import typer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from load_benchmark import DEPARTMENTS, FEEDBACK_TEMPLATES, load_app  # noqa: E402
+
+
+def stored_documents(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """Documents as they sit in employee_feedback, including _id and queue bookkeeping"""
+    from bson import ObjectId
+
+    now = datetime.utcnow().replace(microsecond=0)
+    docs = []
+    for n in range(count):
+        docs.append({
+            "_id": ObjectId(),
+            "id": str(uuid.uuid4()),
+            "employee_id": f"emp-{rng.randint(1, 500)}",
+            "feedback_text": rng.choice(FEEDBACK_TEMPLATES).format(n=n),
+            "department": rng.choice(DEPARTMENTS),
+            "timestamp": now - timedelta(milliseconds=rng.randint(0, 30 * 86400 * 1000)),
+            "sentiment": rng.choice(["Positive", "Neutral", "Negative"]),
+            "confidence_score": round(rng.random(), 3),
+            "processed": True,
+            "analysis_tier": rng.choice(["local", "llm"]),
+            "analysis_attempts": 1,
+            "analysis_worker": "worker-0",
+        })
+    return docs
+
+
+def timed(fn: Callable[[], bytes], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main(
+    docs: int = typer.Option(1000, help="Documents per response"),
+    repeat: int = typer.Option(20, help="Runs per variant; the median is reported"),
+):
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+
+    server = load_app(None)
+    stored = stored_documents(docs, random.Random(0))
+    projected = [{key: doc[key] for key in server.FEEDBACK_PROJECTION if key in doc} for doc in stored]
+    response_model = TypeAdapter(List[server.EmployeeFeedback])
+
+    def dumps(payload) -> bytes:
+        return json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+    def via_response_model() -> bytes:
+        items = [server.EmployeeFeedback(**doc) for doc in stored]
+        checked = response_model.validate_python([item.model_dump() for item in items])
+        return dumps(jsonable_encoder(checked))
+
+    def validated() -> bytes:
+        return dumps(jsonable_encoder([server.EmployeeFeedback(**doc) for doc in stored]))
+
+    def fast() -> bytes:
+        import orjson
+        return orjson.dumps([server.feedback_from_db(doc) for doc in projected], default=server.encode_model)
+
+    body = fast()
+    if body != validated():
+        typer.echo("fast path output differs from the validated path", err=True)
+        raise typer.Exit(code=1)
+
+    per_k = 1000 / docs
+    rows = [
+        ("response_model", timed(via_response_model, repeat)),
+        ("validated", timed(validated, repeat)),
+        ("fast", timed(fast, repeat)),
+    ]
+    typer.echo(f"{docs} documents, {len(body)} bytes, median of {repeat} runs")
+    typer.echo(f"{'variant':<16}{'ms / 1k docs':>14}{'speedup':>9}")
+    for name, seconds in rows:
+        typer.echo(f"{name:<16}{seconds * 1000 * per_k:>14.2f}{rows[0][1] / seconds:>8.1f}x")
+
+    compressed = gzip.compress(body, compresslevel=6)
+    gzip_seconds = timed(lambda: gzip.compress(body, compresslevel=6), repeat)
+    typer.echo(f"gzip level 6: {len(compressed)} bytes ({len(compressed) / len(body):.0%}), "
+               f"{gzip_seconds * 1000 * per_k:.2f} ms / 1k docs")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,171 @@
+"""Throughput of the API as the number of uvicorn worker processes grows.
+
+    python benchmarks/bench_workers.py --workers 1,2,4 --duration 15
+    python benchmarks/bench_workers.py --mongo-url mongodb://localhost:27017   # shared mongod, cluster sync on
+
+For each worker count, starts `uvicorn bench_app:app --workers N`, drives a
+closed-loop mix of dashboard, insights, list and submit requests from several
+client processes, and reports requests/s with the speedup over one worker.
+Scaling is bounded by the cores on the machine (printed first); run the load
+generator on a separate machine for numbers past half the cores.
+"""
+import asyncio
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import typer
+
+BENCH_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCH_DIR.parent / "backend"
+
+DEPARTMENTS = ["Engineering", "Sales", "HR", "Marketing", "Operations", "Finance"]
+MIX = {"dashboard": 0.45, "insights": 0.15, "list": 0.3, "submit": 0.1}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def next_request(rng: random.Random) -> Tuple[str, str, Dict[str, Any]]:
+    kind = rng.choices(list(MIX), list(MIX.values()))[0]
+    if kind == "dashboard":
+        # Distinct windows keep most dashboards out of the response cache, so they cost real CPU
+        days = rng.randint(1, 30)
+        params = {"start_date": f"{time.strftime('%Y-%m-%d', time.gmtime(time.time() - days * 86400))}T00:00:00"}
+        departments = rng.sample(DEPARTMENTS, rng.randint(0, 2))
+        if departments:
+            params["departments"] = ",".join(departments)
+        return "GET", "/api/dashboard", {"params": params}
+    if kind == "insights":
+        return "GET", "/api/insights", {}
+    if kind == "list":
+        return "GET", "/api/feedback", {"params": {"limit": 50, "department": rng.choice(DEPARTMENTS)}}
+    return "POST", "/api/feedback", {"json": {
+        "feedback_text": f"Benchmark comment {rng.randint(0, 10 ** 9)} about the release",
+        "department": rng.choice(DEPARTMENTS),
+    }}
+
+
+def client_process(args) -> Tuple[int, int, List[float]]:
+    """One load-generator process: `concurrency` closed-loop clients for `duration` seconds"""
+    base_url, concurrency, duration, seed = args
+
+    async def run():
+        import httpx
+
+        rng = random.Random(seed)
+        latencies: List[float] = []
+        errors = 0
+        deadline = time.monotonic() + duration
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) as client:
+            async def loop():
+                nonlocal errors
+                while time.monotonic() < deadline:
+                    method, path, kwargs = next_request(rng)
+                    started = time.perf_counter()
+                    try:
+                        response = await client.request(method, path, **kwargs)
+                        errors += response.status_code >= 400
+                    except Exception:
+                        errors += 1
+                    latencies.append(time.perf_counter() - started)
+            await asyncio.gather(*(loop() for _ in range(concurrency)))
+        return len(latencies), errors, latencies
+
+    return asyncio.run(run())
+
+
+def wait_until_serving(base_url: str, process: subprocess.Popen, timeout: float = 60.0):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            if httpx.get(f"{base_url}/api/health/ready", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("uvicorn did not start in time")
+
+
+def measure(workers: int, mongo_url: Optional[str], duration: float, concurrency: int,
+            client_processes: int, warmup: float) -> Dict[str, Any]:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(BENCH_DIR), str(BACKEND_DIR), os.environ.get("PYTHONPATH", "")]),
+        "BENCH_DB_NAME": f"msemobora_bench_{uuid.uuid4().hex[:8]}",
+        "WEB_CONCURRENCY": str(workers),
+        "SENTIMENT_WORKER_POOL_SIZE": "0",
+        # Separate in-memory databases have nothing to synchronize
+        "CLUSTER_SYNC": "true" if mongo_url else "false",
+    }
+    if mongo_url:
+        env["BENCH_MONGO_URL"] = mongo_url
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "bench_app:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BENCH_DIR, env=env,
+    )
+    try:
+        wait_until_serving(base_url, process)
+        time.sleep(warmup)
+        jobs = [(base_url, concurrency, duration, seed) for seed in range(client_processes)]
+        with multiprocessing.Pool(client_processes) as pool:
+            results = pool.map(client_process, jobs)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+        if mongo_url:
+            from pymongo import MongoClient
+            MongoClient(mongo_url).drop_database(env["BENCH_DB_NAME"])
+
+    latencies = sorted(latency for _, _, samples in results for latency in samples)
+    requests = sum(count for count, _, _ in results)
+    return {
+        "workers": workers,
+        "requests": requests,
+        "errors": sum(errors for _, errors, _ in results),
+        "rps": requests / duration,
+        "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+    }
+
+
+def main(
+    workers: str = typer.Option("1,2,4", help="Comma-separated worker counts to compare"),
+    mongo_url: Optional[str] = typer.Option(None, help="Shared mongod; default is one mongomock per worker"),
+    duration: float = typer.Option(15.0),
+    concurrency: int = typer.Option(32, help="Closed-loop clients per load-generator process"),
+    client_processes: int = typer.Option(2, help="Load-generator processes"),
+    warmup: float = typer.Option(2.0),
+):
+    typer.echo(f"cores: {os.cpu_count()}   backend: {'mongod' if mongo_url else 'mongomock per worker'}")
+    typer.echo(f"{'workers':>8}{'req/s':>10}{'speedup':>9}{'p50 ms':>9}{'p95 ms':>9}{'errors':>8}")
+    baseline = None
+    for count in [int(part) for part in workers.split(",")]:
+        row = measure(count, mongo_url, duration, concurrency, client_processes, warmup)
+        baseline = baseline or row["rps"]
+        typer.echo(
+            f"{row['workers']:>8}{row['rps']:>10.1f}{row['rps'] / baseline:>8.2f}x"
+            f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
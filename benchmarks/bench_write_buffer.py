@@ -0,0 +1,83 @@
+"""Compare feedback inserts per second with and without the write-behind buffer.
+
+    python benchmarks/bench_write_buffer.py --mongo-url mongodb://localhost:27017 --docs 20000 --concurrency 500
+
+Writes to a throwaway database that is dropped afterwards.
+"""
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import typer
+from motor.motor_asyncio import AsyncIOMotorClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from write_buffer import WriteBuffer  # noqa: E402
+
+
+def make_doc(i: int):
+    return {
+        "id": str(uuid.uuid4()),
+        "employee_id": f"emp-{i % 1000}",
+        "feedback_text": f"Benchmark feedback number {i}",
+        "department": ["Engineering", "Sales", "HR", "Marketing"][i % 4],
+        "timestamp": datetime.utcnow(),
+        "sentiment": "Neutral",
+        "confidence_score": 0.9,
+        "processed": True,
+    }
+
+
+async def run_concurrently(docs, concurrency: int, insert) -> float:
+    """Insert every doc with at most `concurrency` callers waiting at once, as concurrent requests would"""
+    work = iter(docs)
+
+    async def caller():
+        for doc in work:
+            await insert(doc)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(concurrency)))
+    return time.perf_counter() - started
+
+
+async def benchmark(mongo_url: str, docs: int, concurrency: int, max_docs: int, max_wait_ms: float):
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[f"msemobora_bench_{uuid.uuid4().hex[:8]}"]
+    try:
+        await db.employee_feedback.create_index("id", unique=True)
+
+        elapsed = await run_concurrently([make_doc(i) for i in range(docs)], concurrency, db.employee_feedback.insert_one)
+        typer.echo(f"insert_one:    {docs / elapsed:10.0f} docs/s  ({elapsed:.2f}s)")
+
+        buffer = WriteBuffer(db.employee_feedback, max_docs=max_docs, max_wait_ms=max_wait_ms)
+        elapsed = await run_concurrently([make_doc(i) for i in range(docs)], concurrency, buffer.insert)
+        await buffer.close()
+        stats = buffer.stats()
+        typer.echo(
+            f"write buffer:  {docs / elapsed:10.0f} docs/s  ({elapsed:.2f}s, "
+            f"{stats['flushes']} insert_many calls, avg batch {stats['avg_batch_size']:.1f})"
+        )
+        assert await db.employee_feedback.count_documents({}) == 2 * docs
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+def main(
+    mongo_url: str = typer.Option(os.environ.get("TEST_MONGO_URL", "mongodb://localhost:27017")),
+    docs: int = typer.Option(20000),
+    concurrency: int = typer.Option(500, help="Simultaneous callers, i.e. in-flight POST /feedback requests"),
+    max_docs: int = typer.Option(500),
+    max_wait_ms: float = typer.Option(10.0),
+):
+    asyncio.run(benchmark(mongo_url, docs, concurrency, max_docs, max_wait_ms))
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,97 @@
+"""Stand-in for emergentintegrations.llm.chat with configurable latency and failure distributions"""
+import asyncio
+import json
+import random
+import re
+import sys
+import types
+from dataclasses import dataclass
+
+_ITEM_RE = re.compile(r'^(\d+)\. (".*")$', re.M)
+
+
+@dataclass
+class LlmProfile:
+    median_seconds: float = 0.4   # lognormal latency
+    sigma: float = 0.5
+    slow_rate: float = 0.01       # share of calls that take `slow_seconds` on top (tail outliers)
+    slow_seconds: float = 5.0
+    failure_rate: float = 0.0     # share of calls that raise a retryable provider error
+    malformed_rate: float = 0.0   # share of answers that are not valid JSON
+    seed: int = 0
+
+
+PROFILE = LlmProfile()
+_rng = random.Random(0)
+calls = {"single": 0, "batch": 0, "failed": 0}
+
+
+def configure(profile: LlmProfile):
+    global PROFILE, _rng
+    PROFILE = profile
+    _rng = random.Random(profile.seed)
+    for key in calls:
+        calls[key] = 0
+
+
+class OverloadedError(Exception):
+    """Shaped like a provider 529 so the retry policy treats it as transient"""
+    status_code = 529
+
+
+class UserMessage:
+    def __init__(self, text: str):
+        self.text = text
+
+
+def _label(text: str) -> str:
+    text = text.lower()
+    if any(word in text for word in ("frustrat", "terrible", "overworked", "unfair")):
+        return "Negative"
+    if any(word in text for word in ("love", "great", "appreciate", "happy")):
+        return "Positive"
+    return "Neutral"
+
+
+class LlmChat:
+    def __init__(self, api_key=None, session_id=None, system_message=""):
+        self.session_id = session_id
+        self.messages = [{"role": "system", "content": system_message}]
+
+    def with_model(self, provider, model):
+        return self
+
+    async def send_message(self, message: UserMessage) -> str:
+        profile = PROFILE
+        latency = _rng.lognormvariate(0, profile.sigma) * profile.median_seconds
+        if _rng.random() < profile.slow_rate:
+            latency += profile.slow_seconds
+        await asyncio.sleep(latency)
+
+        if _rng.random() < profile.failure_rate:
+            calls["failed"] += 1
+            raise OverloadedError("overloaded")
+        if _rng.random() < profile.malformed_rate:
+            return "The sentiment seems mostly Neutral."
+
+        self.messages.append({"role": "user", "content": message.text})
+        items = _ITEM_RE.findall(message.text)
+        if "JSON array" in message.text and items:
+            calls["batch"] += 1
+            return json.dumps([
+                {"index": int(index), "sentiment": _label(json.loads(text)), "confidence_score": 0.9, "reasoning": "benchmark"}
+                for index, text in items
+            ])
+        calls["single"] += 1
+        return json.dumps({"sentiment": _label(message.text), "confidence_score": 0.9, "reasoning": "benchmark"})
+
+
+def install():
+    """Register this module as emergentintegrations.llm.chat before server.py is imported"""
+    package = types.ModuleType("emergentintegrations")
+    llm = types.ModuleType("emergentintegrations.llm")
+    package.llm = llm
+    llm.chat = sys.modules[__name__]
+    sys.modules["emergentintegrations"] = package
+    sys.modules["emergentintegrations.llm"] = llm
+    sys.modules["emergentintegrations.llm.chat"] = sys.modules[__name__]
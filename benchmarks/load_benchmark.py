@@ -0,0 +1,282 @@
+"""In-process load benchmark for the API with stand-ins for Mongo and the LLM provider.
+
+    python benchmarks/load_benchmark.py --scenario mixed             # run and compare with baselines.json
+    python benchmarks/load_benchmark.py --scenario mixed --update-baseline
+    python benchmarks/load_benchmark.py --mongo-url mongodb://localhost:27017   # local mongod instead of mongomock
+
+The app, the load generator and the fake LLM share one event loop, so absolute
+numbers are lower than a deployed server's; they are meant for comparing
+builds on the same machine. Exits with status 1 when a result regresses past
+its baseline by more than the tolerance.
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import typer
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+sys.path.insert(0, str(BENCH_DIR.parent / "backend"))
+
+import fake_llm  # noqa: E402
+
+BASELINES_PATH = BENCH_DIR / "baselines.json"
+
+DEPARTMENTS = ["Engineering", "Sales", "HR", "Marketing", "Operations", "Finance"]
+FEEDBACK_TEMPLATES = [
+    "I love the flexibility my team gives me #{n}",
+    "Really appreciate the new onboarding process #{n}",
+    "Constantly overworked and frustrated with the deadlines #{n}",
+    "The quarterly planning meeting moved to Thursday #{n}",
+    "Unfair on-call rotation again this month #{n}",
+    "Great support from my manager during the release #{n}",
+    "Parking badge renewal is due next week #{n}",
+]
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    # Steady mixed traffic: mostly reads, a quarter submissions
+    "mixed": {
+        "rps": 40,
+        "duration": 15,
+        "seed_docs": 1000,
+        "mix": {"submit": 0.25, "dashboard": 0.3, "insights": 0.15, "list": 0.3},
+        "llm": fake_llm.LlmProfile(median_seconds=0.3, sigma=0.5, slow_rate=0.01, slow_seconds=4.0),
+    },
+    # Survey burst: submissions dominate while the provider is slow and flaky
+    "submit_burst": {
+        "rps": 80,
+        "duration": 10,
+        "seed_docs": 500,
+        "mix": {"submit": 0.8, "dashboard": 0.15, "list": 0.05},
+        "llm": fake_llm.LlmProfile(median_seconds=0.8, sigma=0.7, slow_rate=0.03, slow_seconds=6.0, failure_rate=0.05),
+    },
+    # Dashboards only, to isolate the read path
+    "read_heavy": {
+        "rps": 100,
+        "duration": 10,
+        "seed_docs": 3000,
+        "mix": {"dashboard": 0.5, "insights": 0.2, "list": 0.3},
+        "llm": fake_llm.LlmProfile(),
+    },
+}
+
+
+def load_app(mongo_url: Optional[str], db_name: Optional[str] = None):
+    """Import server.py against the fake LLM and either mongomock or a real mongod"""
+    fake_llm.install()
+    if mongo_url is None:
+        import mongomock_motor
+        import motor.motor_asyncio
+        motor.motor_asyncio.AsyncIOMotorClient = mongomock_motor.AsyncMongoMockClient
+    os.environ["MONGO_URL"] = mongo_url or "mongodb://benchmark"
+    os.environ["DB_NAME"] = db_name or f"msemobora_bench_{uuid.uuid4().hex[:8]}"
+    os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+    import server
+    return server
+
+
+async def seed(server, count: int, rng: random.Random):
+    import rollups
+
+    now = datetime.utcnow()
+    docs = []
+    for n in range(count):
+        text = rng.choice(FEEDBACK_TEMPLATES).format(n=n)
+        docs.append({
+            "id": str(uuid.uuid4()),
+            "employee_id": f"emp-{rng.randint(1, 500)}",
+            "feedback_text": text,
+            "department": rng.choice(DEPARTMENTS),
+            "timestamp": now - timedelta(minutes=rng.randint(0, 60 * 24 * 30)),
+            "sentiment": fake_llm._label(text),
+            "confidence_score": 0.9,
+            "processed": True,
+            "analysis_tier": "llm",
+        })
+    if docs:
+        await server.feedback_store.insert_many(docs)
+        await rollups.record_inserted(server.db.sentiment_rollups, docs)
+
+
+def request_for(kind: str, rng: random.Random):
+    if kind == "submit":
+        return "POST", "/api/feedback", {"json": {
+            "feedback_text": rng.choice(FEEDBACK_TEMPLATES).format(n=rng.randint(0, 10 ** 6)),
+            "department": rng.choice(DEPARTMENTS),
+            "employee_id": f"emp-{rng.randint(1, 500)}",
+        }}
+    if kind == "dashboard":
+        departments = rng.sample(DEPARTMENTS, rng.randint(0, 2))
+        return "GET", "/api/dashboard", {"params": {"departments": ",".join(departments)} if departments else {}}
+    if kind == "insights":
+        return "GET", "/api/insights", {}
+    if kind == "list":
+        params = {"limit": 50}
+        if rng.random() < 0.5:
+            params["department"] = rng.choice(DEPARTMENTS)
+        return "GET", "/api/feedback", {"params": params}
+    raise ValueError(f"Unknown request kind: {kind}")
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def drive(server, scenario: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    """Open-loop load: requests start on schedule whether or not earlier ones finished"""
+    import httpx
+
+    kinds = list(scenario["mix"])
+    weights = [scenario["mix"][kind] for kind in kinds]
+    samples: Dict[str, List[float]] = {kind: [] for kind in kinds}
+    errors: Dict[str, int] = {kind: 0 for kind in kinds}
+
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60) as client:
+        async def one(kind: str):
+            method, path, kwargs = request_for(kind, rng)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, **kwargs)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            samples[kind].append(time.perf_counter() - started)
+            errors[kind] += failed
+
+        loop = asyncio.get_running_loop()
+        total = int(scenario["rps"] * scenario["duration"])
+        interval = 1 / scenario["rps"]
+        started = loop.time()
+        tasks = []
+        for i in range(total):
+            delay = started + i * interval - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(one(rng.choices(kinds, weights)[0])))
+        await asyncio.gather(*tasks)
+        elapsed = loop.time() - started
+
+    results = {}
+    for kind in kinds:
+        latencies = sorted(samples[kind])
+        results[kind] = {
+            "requests": len(latencies),
+            "error_rate": round(errors[kind] / len(latencies), 4) if latencies else 0.0,
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        }
+    return results
+
+
+# A percentile is only gated when at least this many samples lie beyond it (p95: 100 requests, p99: 500)
+MIN_TAIL_SAMPLES = 5
+TAIL_QUANTILES = {"p95_ms": 0.95, "p99_ms": 0.99}
+# Latency changes smaller than this are scheduling noise, whatever the ratio
+MIN_REGRESSION_MS = 50
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Regressions: slower p95/p99 or lower throughput beyond the tolerance, or more errors"""
+    regressions = []
+    for kind, expected in baseline.items():
+        actual = results.get(kind)
+        if actual is None:
+            continue
+        gated = [metric for metric, q in TAIL_QUANTILES.items() if actual["requests"] * (1 - q) >= MIN_TAIL_SAMPLES]
+        for metric in gated:
+            if actual[metric] > expected[metric] * tolerance and actual[metric] - expected[metric] > MIN_REGRESSION_MS:
+                regressions.append(f"{kind} {metric}: {actual[metric]} > {expected[metric]} x {tolerance}")
+        if actual["throughput_rps"] < expected["throughput_rps"] / tolerance:
+            regressions.append(f"{kind} throughput_rps: {actual['throughput_rps']} < {expected['throughput_rps']} / {tolerance}")
+        if actual["error_rate"] > expected["error_rate"] + 0.01:
+            regressions.append(f"{kind} error_rate: {actual['error_rate']} > {expected['error_rate']} + 0.01")
+    return regressions
+
+
+async def run(scenario_name: str, scenario: Dict[str, Any], mongo_url: Optional[str]) -> Dict[str, Any]:
+    fake_llm.configure(scenario["llm"])
+    server = load_app(mongo_url)
+    rng = random.Random(scenario["llm"].seed)
+    await seed(server, scenario["seed_docs"], rng)
+    await server.startup_db_client()
+    await server.startup_task
+    try:
+        results = await drive(server, scenario, rng)
+    finally:
+        await server.shutdown_db_client()
+        if mongo_url is not None:
+            from motor.motor_asyncio import AsyncIOMotorClient
+            cleanup = AsyncIOMotorClient(mongo_url)
+            await cleanup.drop_database(os.environ["DB_NAME"])
+            cleanup.close()
+    return {"results": results, "llm_calls": dict(fake_llm.calls)}
+
+
+def print_report(scenario_name: str, report: Dict[str, Any]):
+    typer.echo(f"scenario: {scenario_name}   llm calls: {report['llm_calls']}")
+    typer.echo(f"{'endpoint':<12}{'requests':>10}{'rps':>9}{'errors':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for kind, row in report["results"].items():
+        typer.echo(
+            f"{kind:<12}{row['requests']:>10}{row['throughput_rps']:>9}{row['error_rate']:>9.2%}"
+            f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+        )
+
+
+def main(
+    scenario: str = typer.Option("mixed", help=f"One of: {', '.join(SCENARIOS)}"),
+    mongo_url: Optional[str] = typer.Option(None, help="Use a local mongod instead of the in-memory mongomock backend"),
+    rps: Optional[float] = typer.Option(None, help="Override the scenario's target requests per second"),
+    duration: Optional[float] = typer.Option(None, help="Override the scenario's duration in seconds"),
+    check: bool = typer.Option(True, help="Compare with the stored baseline and exit 1 on regression"),
+    update_baseline: bool = typer.Option(False, help="Store this run as the scenario's baseline"),
+    tolerance: float = typer.Option(2.0, help="Allowed slowdown factor before a result counts as a regression"),
+    json_out: Optional[Path] = typer.Option(None, help="Also write the report as JSON"),
+):
+    if scenario not in SCENARIOS:
+        raise typer.BadParameter(f"Unknown scenario {scenario!r}")
+    config = dict(SCENARIOS[scenario])
+    if rps is not None:
+        config["rps"] = rps
+    if duration is not None:
+        config["duration"] = duration
+
+    report = asyncio.run(run(scenario, config, mongo_url))
+    report["config"] = {**config, "llm": asdict(config["llm"]), "backend": "mongod" if mongo_url else "mongomock"}
+    print_report(scenario, report)
+    if json_out is not None:
+        json_out.write_text(json.dumps(report, indent=2))
+
+    baselines = json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+    if update_baseline:
+        baselines[scenario] = report["results"]
+        BASELINES_PATH.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        typer.echo(f"Baseline for {scenario} written to {BASELINES_PATH}")
+        return
+    if check:
+        if scenario not in baselines:
+            typer.echo(f"No baseline for {scenario}; run with --update-baseline to record one")
+            return
+        regressions = compare(report["results"], baselines[scenario], tolerance)
+        for line in regressions:
+            typer.echo(f"REGRESSION {line}")
+        if regressions:
+            raise typer.Exit(code=1)
+        typer.echo("Within baseline")
+
+
+if __name__ == "__main__":
+    typer.run(main)
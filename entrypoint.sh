@@ -4,18 +4,35 @@ set -e
 # Start the FastAPI backend
 cd /backend || { echo "Backend directory not found"; exit 1; }
 
-echo "Starting FastAPI backend"
+# Worker processes: a number, or "auto" for one per CPU core
+WEB_CONCURRENCY="${WEB_CONCURRENCY:-1}"
+if [ "$WEB_CONCURRENCY" = "auto" ]; then
+    WEB_CONCURRENCY=$(nproc)
+fi
+export WEB_CONCURRENCY
+
+echo "Starting FastAPI backend with $WEB_CONCURRENCY worker(s)"
 # Start Uvicorn with proper host binding
-uvicorn server:app --host 0.0.0.0 --port 8001 &
+uvicorn server:app --host 0.0.0.0 --port 8001 --workers "$WEB_CONCURRENCY" &
 BACKEND_PID=$!
 
-echo "Waiting for backend to start..."
-sleep 30
-
-if ! kill -0 $BACKEND_PID 2>/dev/null; then
-    echo "Backend failed to start at initialization, exiting"
-    exit 1
-fi
+# Wait for the readiness probe (Mongo reachable, LLM client initialized) instead of a fixed delay
+READY_TIMEOUT="${READY_TIMEOUT:-120}"
+echo "Waiting for backend to become ready (up to ${READY_TIMEOUT}s)..."
+START=$(date +%s)
+until wget -q -O /dev/null http://127.0.0.1:8001/api/health/ready 2>/dev/null; do
+    if ! kill -0 $BACKEND_PID 2>/dev/null; then
+        echo "Backend failed to start at initialization, exiting"
+        exit 1
+    fi
+    if [ $(( $(date +%s) - START )) -ge "$READY_TIMEOUT" ]; then
+        echo "Backend not ready after ${READY_TIMEOUT}s, exiting"
+        kill $BACKEND_PID
+        exit 1
+    fi
+    sleep 0.2
+done
+echo "Backend ready after $(( $(date +%s) - START ))s"
 
 # Start Nginx
 nginx -g 'daemon off;' &
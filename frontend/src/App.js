@@ -11,6 +11,7 @@ const App = () => {
   const [insights, setInsights] = useState([]);
   const [feedbackData, setFeedbackData] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [streamConnected, setStreamConnected] = useState(false);
   const [newFeedback, setNewFeedback] = useState({
     employee_id: '',
     feedback_text: '',
@@ -33,6 +34,64 @@ const App = () => {
     fetchFeedbackData();
   }, []);
 
+  // Live dashboard updates: the server pushes count deltas instead of us refetching
+  useEffect(() => {
+    if (typeof EventSource === 'undefined') return undefined;
+    const source = new EventSource(`${API}/stream/dashboard`);
+    source.addEventListener('hello', () => {
+      setStreamConnected(true);
+      // Catch up on anything stored while we were disconnected
+      fetchDashboardData();
+    });
+    source.addEventListener('feedback', (event) => {
+      applyDashboardDelta(JSON.parse(event.data));
+    });
+    source.onerror = () => setStreamConnected(false);
+    return () => source.close();
+  }, []);
+
+  const applyDashboardDelta = (delta) => {
+    setDashboardData((current) => {
+      if (!current) return current;
+      const sentimentDistribution = { ...current.sentiment_distribution };
+      Object.entries(delta.sentiment).forEach(([sentiment, count]) => {
+        sentimentDistribution[sentiment] = (sentimentDistribution[sentiment] || 0) + count;
+      });
+      const departmentBreakdown = { ...current.department_breakdown };
+      Object.entries(delta.department).forEach(([dept, counts]) => {
+        const row = { Positive: 0, Neutral: 0, Negative: 0, ...departmentBreakdown[dept] };
+        Object.entries(counts).forEach(([sentiment, count]) => {
+          row[sentiment] = (row[sentiment] || 0) + count;
+        });
+        departmentBreakdown[dept] = row;
+      });
+      const sentimentTimeline = current.sentiment_timeline.map((bucket) => {
+        const counts = delta.timeline[bucket.date];
+        if (!counts) return bucket;
+        const updated = { ...bucket };
+        Object.entries(counts).forEach(([key, count]) => {
+          updated[key] = (updated[key] || 0) + count;
+        });
+        return updated;
+      });
+      const updatedIds = new Set(delta.recent.map((item) => item.id));
+      const recentFeedback = [
+        ...delta.recent,
+        ...current.recent_feedback.filter((item) => !updatedIds.has(item.id))
+      ]
+        .sort((a, b) => (a.timestamp < b.timestamp ? 1 : -1))
+        .slice(0, 10);
+      return {
+        ...current,
+        total_feedback: current.total_feedback + delta.total,
+        sentiment_distribution: sentimentDistribution,
+        department_breakdown: departmentBreakdown,
+        sentiment_timeline: sentimentTimeline,
+        recent_feedback: recentFeedback
+      };
+    });
+  };
+
   const fetchDashboardData = async () => {
     try {
       const response = await axios.get(`${API}/dashboard`);
@@ -72,8 +131,8 @@ const App = () => {
     try {
       await axios.post(`${API}/feedback`, newFeedback);
       setNewFeedback({ employee_id: '', feedback_text: '', department: 'Engineering' });
-      // Refresh data
-      fetchDashboardData();
+      // Refresh data (the live stream already updates the dashboard when connected)
+      if (!streamConnected) fetchDashboardData();
       fetchFeedbackData();
       fetchInsights();
       alert('Feedback submitted successfully!');
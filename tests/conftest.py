@@ -0,0 +1,123 @@
+import asyncio
+import json
+import os
+import re
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+# server.py and its helper modules are imported as top-level modules from backend/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+TEST_DB_NAME = "msemobora_test"
+BATCH_ITEM_RE = re.compile(r'^(\d+)\. (".*")$', re.M)
+
+
+def keyword_reply(text: str) -> str:
+    """Answer a prompt the way the real model is asked to, labelling items by a keyword"""
+    def label(item: str) -> str:
+        item = item.lower()
+        if "love" in item or "great" in item:
+            return "Positive"
+        if "hate" in item or "terrible" in item:
+            return "Negative"
+        return "Neutral"
+
+    items = BATCH_ITEM_RE.findall(text)
+    if "JSON array" in text and items:
+        return json.dumps([
+            {"index": int(index), "sentiment": label(json.loads(item)), "confidence_score": 0.9, "reasoning": "test"}
+            for index, item in items
+        ])
+    return json.dumps({"sentiment": label(text), "confidence_score": 0.9, "reasoning": "test"})
+
+
+def fake_chat_module() -> types.ModuleType:
+    """Stand-in for emergentintegrations.llm.chat; tests swap `respond` to script the provider"""
+    chat = types.ModuleType("emergentintegrations.llm.chat")
+    chat.respond = keyword_reply
+    chat.prompts = []
+
+    class UserMessage:
+        def __init__(self, text: str):
+            self.text = text
+
+    class LlmChat:
+        def __init__(self, api_key=None, session_id=None, system_message=""):
+            self.session_id = session_id
+
+        def with_model(self, provider, model):
+            return self
+
+        async def send_message(self, message):
+            chat.prompts.append(message.text)
+            reply = chat.respond(message.text)
+            if asyncio.iscoroutine(reply):
+                reply = await reply
+            return reply
+
+    chat.UserMessage = UserMessage
+    chat.LlmChat = LlmChat
+    return chat
+
+
+@pytest.fixture(scope="session")
+def server_module():
+    """server.py imported against mongomock and the fake LLM integration"""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    motor_asyncio = pytest.importorskip("motor.motor_asyncio")
+    pytest.importorskip("fastapi")
+
+    chat = fake_chat_module()
+    package = types.ModuleType("emergentintegrations")
+    package.llm = types.ModuleType("emergentintegrations.llm")
+    package.llm.chat = chat
+    sys.modules.update({
+        "emergentintegrations": package,
+        "emergentintegrations.llm": package.llm,
+        "emergentintegrations.llm.chat": chat,
+    })
+    os.environ.update({
+        "MONGO_URL": "mongodb://test",
+        "DB_NAME": TEST_DB_NAME,
+        "SENTIMENT_MODEL_PATH": str(Path(__file__).resolve().parent / "no-model.npz"),
+        "SENTIMENT_BATCH_MAX_ITEMS": "1",
+        "LLM_HEDGE_ENABLED": "false",
+        "LLM_RETRY_BASE_SECONDS": "0.01",
+        "LLM_RETRY_MAX_SECONDS": "0.01",
+    })
+
+    # server.py binds the client class at import time, so the patch only needs to last that long
+    real_client = motor_asyncio.AsyncIOMotorClient
+    motor_asyncio.AsyncIOMotorClient = mongomock_motor.AsyncMongoMockClient
+    try:
+        import server
+    finally:
+        motor_asyncio.AsyncIOMotorClient = real_client
+    return server
+
+
+@pytest.fixture
+def server(server_module):
+    """The server module with an empty database and the default fake LLM replies"""
+    chat = sys.modules["emergentintegrations.llm.chat"]
+    yield server_module
+    chat.respond = keyword_reply
+    chat.prompts.clear()
+    server_module.sentiment_cache.forget_local()
+    server_module.response_cache.clear()
+
+    async def drop_collections():
+        database = server_module.client[TEST_DB_NAME]
+        for name in await database.list_collection_names():
+            await database.drop_collection(name)
+
+    asyncio.run(drop_collections())
+
+
+@pytest.fixture
+def llm_chat(server):
+    """The fake emergentintegrations.llm.chat module used by `server`"""
+    return sys.modules["emergentintegrations.llm.chat"]
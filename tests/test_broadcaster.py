@@ -0,0 +1,75 @@
+"""Dashboard event fan-out to Server-Sent Events subscribers"""
+import asyncio
+import json
+from datetime import datetime
+
+from broadcaster import Broadcaster, sse_events
+
+
+def parse_event(message: str):
+    fields = dict(line.split(": ", 1) for line in message.strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+
+def test_every_subscriber_gets_each_event_once():
+    broadcaster = Broadcaster()
+    first, second = broadcaster.subscribe(), broadcaster.subscribe()
+
+    broadcaster.publish("feedback", {"total": 1})
+    broadcaster.publish("feedback", {"total": 2})
+
+    for subscription in (first, second):
+        messages = [subscription.queue.get_nowait() for _ in range(subscription.queue.qsize())]
+        assert [parse_event(m) for m in messages] == [("feedback", {"total": 1}), ("feedback", {"total": 2})]
+        assert messages[0].startswith("id: 1\n") and messages[1].startswith("id: 2\n")
+
+
+def test_a_stalled_subscriber_drops_its_oldest_events():
+    broadcaster = Broadcaster(max_pending=2)
+    stalled = broadcaster.subscribe()
+
+    for total in range(5):
+        broadcaster.publish("feedback", {"total": total})
+
+    assert [parse_event(stalled.queue.get_nowait())[1]["total"] for _ in range(2)] == [3, 4]
+    assert stalled.dropped == 3
+    assert broadcaster.stats() == {"subscribers": 1, "published": 5, "dropped": 3}
+
+
+def test_stream_says_hello_sends_heartbeats_and_unsubscribes_on_close():
+    broadcaster = Broadcaster()
+
+    async def scenario():
+        stream = sse_events(broadcaster, {"feedback_version": 3}, heartbeat_seconds=0.01)
+        hello = await stream.__anext__()
+        subscribed = broadcaster.stats()["subscribers"]
+        heartbeat = await stream.__anext__()
+        broadcaster.publish("feedback", {"total": 1})
+        event = await stream.__anext__()
+        await stream.aclose()
+        return hello, subscribed, heartbeat, event
+
+    hello, subscribed, heartbeat, event = asyncio.run(scenario())
+
+    assert parse_event(hello) == ("hello", {"feedback_version": 3})
+    assert subscribed == 1
+    assert heartbeat == ": keep-alive\n\n"
+    assert parse_event(event) == ("feedback", {"total": 1})
+    assert broadcaster.stats()["subscribers"] == 0
+
+
+def test_feedback_delta_counts_sentiments_by_department_and_day(server):
+    docs = [
+        {"id": "a", "feedback_text": "x", "department": "HR", "sentiment": "Positive", "timestamp": datetime(2026, 3, 1, 9)},
+        {"id": "b", "feedback_text": "y", "department": "HR", "sentiment": "Negative", "timestamp": datetime(2026, 3, 2, 9)},
+        {"id": "c", "feedback_text": "z", "department": "Sales", "sentiment": None, "timestamp": datetime(2026, 3, 2, 10)},
+    ]
+
+    delta = server.feedback_delta(docs)
+
+    assert delta["total"] == 3
+    assert delta["sentiment"] == {"Positive": 1, "Negative": 1}
+    assert delta["department"] == {"HR": {"Positive": 1, "Negative": 1}}
+    assert delta["timeline"] == {"2026-03-01": {"positive": 1}, "2026-03-02": {"negative": 1}}
+    assert [item["id"] for item in delta["recent"]] == ["c", "b", "a"]
+    assert server.feedback_delta(docs, counted_in_total=False)["total"] == 0
@@ -0,0 +1,59 @@
+"""POST /api/feedback/bulk against mongomock and the fake LLM"""
+import asyncio
+import json
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+
+async def post_bulk(server, body: str, content_type: str = "application/x-ndjson"):
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post("/api/feedback/bulk", content=body, headers={"content-type": content_type})
+
+
+async def stored_feedback(server):
+    return await server.db.employee_feedback.find({}).to_list(None)
+
+
+def test_bulk_reports_each_item_and_stores_clean_documents(server):
+    items = [
+        {"feedback_text": "I love the new schedule", "department": "Engineering"},
+        {"department": "Sales"},
+        {"feedback_text": "Meetings are terrible", "department": "HR"},
+    ]
+    body = "\n".join(json.dumps(item) for item in items)
+
+    response = asyncio.run(post_bulk(server, body))
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert (payload["total"], payload["created"], payload["failed"]) == (3, 2, 1)
+    assert [result["status"] for result in payload["results"]] == ["created", "invalid", "created"]
+    assert [result["sentiment"] for result in payload["results"]] == ["Positive", None, "Negative"]
+
+    stored = asyncio.run(stored_feedback(server))
+    assert sorted(doc["id"] for doc in stored) == sorted(r["id"] for r in payload["results"] if r["id"])
+    expected_keys = set(server.EmployeeFeedback.model_fields) | {"_id"}
+    assert all(set(doc) == expected_keys for doc in stored)
+
+
+def test_bulk_marks_rejected_writes_at_their_own_position(server, monkeypatch):
+    monkeypatch.setattr(server, "BULK_INSERT_CHUNK_SIZE", 2)
+    asyncio.run(server.db.employee_feedback.create_index("feedback_text", unique=True))
+    asyncio.run(server.db.employee_feedback.insert_one({"id": "existing", "feedback_text": "duplicate text"}))
+    items = [
+        {"feedback_text": "first", "department": "Engineering"},
+        {"feedback_text": "duplicate text", "department": "Engineering"},
+        {"feedback_text": "third", "department": "Sales"},
+    ]
+
+    response = asyncio.run(post_bulk(server, json.dumps(items), "application/json"))
+
+    payload = response.json()
+    assert [result["status"] for result in payload["results"]] == ["created", "failed", "created"]
+    assert payload["results"][1]["error"]
+    stored = asyncio.run(stored_feedback(server))
+    assert sorted(doc["feedback_text"] for doc in stored) == ["duplicate text", "first", "third"]
+    assert not any("_bulk_index" in doc for doc in stored)
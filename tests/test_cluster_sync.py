@@ -0,0 +1,189 @@
+"""Coordination between worker processes: leases, event dedupe and the rollup build marker"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from cluster_sync import ClusterSync, LeaseLostError, acquire_lease, run_with_lease  # noqa: E402
+
+
+def new_db():
+    return mongomock_motor.AsyncMongoMockClient()["cluster_test"]
+
+
+def test_lease_is_exclusive_until_it_expires():
+    async def scenario():
+        state = new_db().app_state
+        first = await acquire_lease(state, "rollup_rebuild", "worker-a", 300)
+        taken = await acquire_lease(state, "rollup_rebuild", "worker-b", 300)
+        renewed = await acquire_lease(state, "rollup_rebuild", "worker-a", 300)
+        await state.update_one({"_id": "rollup_rebuild"}, {"$set": {"expires_at": datetime.utcnow() - timedelta(seconds=1)}})
+        expired = await acquire_lease(state, "rollup_rebuild", "worker-b", 300)
+        return first, taken, renewed, expired, await state.find_one({"_id": "rollup_rebuild"})
+
+    first, taken, renewed, expired, lease = asyncio.run(scenario())
+
+    assert (first, taken, renewed, expired) == (True, False, True, True)
+    assert lease["owner"] == "worker-b"
+
+
+def test_lease_is_renewed_while_long_work_runs():
+    async def scenario():
+        state = new_db().app_state
+        await acquire_lease(state, "rollup_rebuild", "worker-a", 0.06)
+
+        async def work():
+            await asyncio.sleep(0.2)  # several lease terms
+            return "built"
+
+        running = asyncio.ensure_future(run_with_lease(state, "rollup_rebuild", "worker-a", 0.06, work))
+        taken_over = []
+        while not running.done():
+            taken_over.append(await acquire_lease(state, "rollup_rebuild", "worker-b", 0.06))
+            await asyncio.sleep(0.03)
+        return await running, taken_over
+
+    result, taken_over = asyncio.run(scenario())
+
+    assert result == "built"
+    assert taken_over and not any(taken_over)
+
+
+def test_work_is_cancelled_once_the_lease_is_lost():
+    cancelled = []
+
+    async def scenario():
+        state = new_db().app_state
+        await acquire_lease(state, "rollup_rebuild", "worker-a", 0.06)
+
+        async def work():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        running = asyncio.ensure_future(run_with_lease(state, "rollup_rebuild", "worker-a", 0.06, work))
+        await asyncio.sleep(0)
+        await state.update_one({"_id": "rollup_rebuild"}, {"$set": {"owner": "worker-b"}})
+        with pytest.raises(LeaseLostError):
+            await running
+
+    asyncio.run(scenario())
+
+    assert cancelled == [True]
+
+
+def test_events_are_dispatched_once_and_never_back_to_their_origin():
+    received = []
+
+    async def scenario():
+        sync = ClusterSync(new_db(), worker_id="worker-a")
+        sync.on("feedback", lambda data: received.append(data))
+        for event_id, origin in ((1, "worker-b"), (1, "worker-b"), (2, "worker-a"), (3, "worker-c")):
+            if sync._remember(event_id) and origin != sync.worker_id:
+                await sync._dispatch({"_id": event_id, "origin": origin, "type": "feedback", "data": {"n": event_id}})
+        return sync
+
+    sync = asyncio.run(scenario())
+
+    assert received == [{"n": 1}, {"n": 3}]
+    assert sync.received == 2
+
+
+def test_remembered_events_are_bounded():
+    sync = ClusterSync(new_db(), worker_id="worker-a")
+    sync._seen = type(sync._seen)(maxlen=2)
+
+    assert all(sync._remember(event_id) for event_id in (1, 2, 3))
+    assert sync._remember(1)  # forgotten once it fell out of the window
+    assert not sync._remember(3)
+
+
+def test_peer_states_skip_this_worker_and_stale_peers():
+    async def scenario():
+        db = new_db()
+        sync = ClusterSync(db, worker_id="worker-a")
+        now = datetime.utcnow()
+        await db.worker_state.insert_many([
+            {"_id": "worker-a", "state": {"name": "self"}, "updated_at": now},
+            {"_id": "worker-b", "state": {"name": "live"}, "updated_at": now},
+            {"_id": "worker-c", "state": {"name": "stale"}, "updated_at": now - timedelta(minutes=5)},
+        ])
+        return await sync.peer_states(max_age_seconds=30)
+
+    assert asyncio.run(scenario()) == [{"name": "live"}]
+
+
+def test_lease_losers_serve_raw_feedback_until_rollups_are_built(server, monkeypatch):
+    monkeypatch.setattr(server, "STARTUP_RETRY_SECONDS", 0.01)
+    monkeypatch.setattr(server, "rollups_built", False)
+    rebuilds = []
+
+    async def rebuild(db, feedback):
+        rebuilds.append(feedback)
+        await asyncio.sleep(0.05)
+        return 7
+
+    monkeypatch.setattr(server.rollups, "rebuild", rebuild)
+
+    async def scenario():
+        await server.feedback_store.insert_one({"id": "a", "feedback_text": "x", "department": "HR", "timestamp": datetime.utcnow()})
+        await acquire_lease(server.db.app_state, "rollup_rebuild", "another-worker", 300)
+        waiting = asyncio.ensure_future(server.prepare_rollups())
+        await asyncio.sleep(0.05)
+        served_while_rebuilding = server.rollups_can_serve(None, None, "day", "UTC")
+
+        # The lease holder finishes its rebuild
+        await server.rollups.mark_built(server.db.app_state, 7)
+        await asyncio.wait_for(waiting, timeout=1)
+        return served_while_rebuilding
+
+    served_while_rebuilding = asyncio.run(scenario())
+
+    assert not served_while_rebuilding
+    assert rebuilds == []
+    assert server.rollups_built
+    assert server.rollups_can_serve(None, None, "day", "UTC")
+
+
+def test_lease_holder_rebuilds_and_marks_rollups_built(server, monkeypatch):
+    monkeypatch.setattr(server, "rollups_built", False)
+    monkeypatch.setattr(server.rollups, "rebuild", lambda db, feedback: asyncio.sleep(0, result=3))
+
+    async def scenario():
+        await server.feedback_store.insert_one({"id": "a", "feedback_text": "x", "department": "HR", "timestamp": datetime.utcnow()})
+        await server.prepare_rollups()
+        return await server.db.app_state.find_one({"_id": server.rollups.BUILT_STATE_ID})
+
+    marker = asyncio.run(scenario())
+
+    assert marker["rows"] == 3
+    assert server.rollups_built
+
+
+def test_lease_holder_rebuilds_even_when_increments_already_created_rows(server, monkeypatch):
+    monkeypatch.setattr(server, "rollups_built", False)
+    rebuilds = []
+
+    async def rebuild(db, feedback):
+        rebuilds.append(feedback)
+        return 2
+
+    monkeypatch.setattr(server.rollups, "rebuild", rebuild)
+
+    async def scenario():
+        old = {"id": "old", "feedback_text": "x", "department": "HR", "timestamp": datetime.utcnow() - timedelta(days=3)}
+        new = {"id": "new", "feedback_text": "y", "department": "HR", "timestamp": datetime.utcnow()}
+        await server.feedback_store.insert_one(old)
+        # Stored by this process before the rollups were built: only `new` is counted
+        await server.feedback_store.insert_one(new)
+        await server.rollups.record_inserted(server.db.sentiment_rollups, [new])
+        await server.prepare_rollups()
+
+    asyncio.run(scenario())
+
+    assert rebuilds == [server.feedback_store]
+    assert server.rollups_built
@@ -0,0 +1,88 @@
+"""Keyset cursor pagination of GET /api/feedback"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+
+def seed_documents(count: int):
+    """Pairs of documents share a timestamp, so pages have to break ties on id"""
+    base = datetime(2026, 3, 1, 12, 0, 0)
+    return [
+        {
+            "id": f"fb-{n:03d}",
+            "employee_id": "emp-1",
+            "feedback_text": f"feedback {n}",
+            "department": "Sales" if n % 3 else "HR",
+            "timestamp": base - timedelta(minutes=n // 2),
+            "sentiment": "Neutral",
+            "confidence_score": 0.9,
+            "processed": True,
+        }
+        for n in range(count)
+    ]
+
+
+async def fetch_all_pages(server, params):
+    transport = httpx.ASGITransport(app=server.app)
+    pages = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        cursor = None
+        while True:
+            query = dict(params, paginate="true", **({"cursor": cursor} if cursor else {}))
+            response = await client.get("/api/feedback", params=query)
+            assert response.status_code == 200
+            page = response.json()
+            pages.append([item["id"] for item in page["items"]])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return pages
+
+
+def test_cursor_round_trips_to_a_filter_after_the_document(server):
+    doc = {"timestamp": datetime(2026, 3, 1, 12, 0, 0, 123000), "id": "fb-007"}
+
+    query = server.decode_feedback_cursor(server.encode_feedback_cursor(doc))
+
+    assert query == {"$or": [
+        {"timestamp": {"$lt": doc["timestamp"]}},
+        {"timestamp": doc["timestamp"], "id": {"$lt": "fb-007"}},
+    ]}
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "e30", "eyJ0IjogIm5vdC1hLWRhdGUiLCAiaWQiOiAxfQ"])
+def test_malformed_cursors_are_rejected(server, cursor):
+    with pytest.raises(ValueError):
+        server.decode_feedback_cursor(cursor)
+
+
+def test_pages_cover_every_document_once_in_order(server):
+    docs = seed_documents(11)
+    asyncio.run(server.feedback_store.insert_many([dict(doc) for doc in docs]))
+
+    pages = asyncio.run(fetch_all_pages(server, {"limit": 4}))
+
+    assert [len(page) for page in pages] == [4, 4, 3]
+    expected = [doc["id"] for doc in sorted(docs, key=lambda d: (d["timestamp"], d["id"]), reverse=True)]
+    assert [doc_id for page in pages for doc_id in page] == expected
+
+
+def test_pages_respect_filters(server):
+    docs = seed_documents(12)
+    asyncio.run(server.feedback_store.insert_many([dict(doc) for doc in docs]))
+
+    pages = asyncio.run(fetch_all_pages(server, {"limit": 3, "department": "Sales"}))
+
+    sales = sorted((d for d in docs if d["department"] == "Sales"), key=lambda d: (d["timestamp"], d["id"]), reverse=True)
+    assert [doc_id for page in pages for doc_id in page] == [doc["id"] for doc in sales]
+
+
+def test_invalid_cursor_is_a_bad_request(server):
+    async def request():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/api/feedback", params={"cursor": "garbage"})
+
+    assert asyncio.run(request()).status_code == 400
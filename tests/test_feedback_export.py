@@ -0,0 +1,130 @@
+"""Streaming feedback exports: the NDJSON, CSV and Parquet encoders and the export endpoint"""
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+import feedback_export
+from feedback_export import EXPORT_FIELDS, csv_stream, ndjson_stream, parquet_stream
+
+DOCS = [
+    {"id": "fb-1", "employee_id": "e1", "feedback_text": "Great team, \"honest\" leads", "department": "HR",
+     "timestamp": datetime(2026, 3, 1, 9, 30), "sentiment": "Positive", "confidence_score": 0.9,
+     "processed": True, "analysis_tier": "llm"},
+    {"id": "fb-2", "employee_id": None, "feedback_text": "Too many meetings,\nno focus time", "department": "IT",
+     "timestamp": datetime(2026, 3, 2, 17), "sentiment": None, "confidence_score": None,
+     "processed": False, "analysis_tier": None},
+]
+
+
+async def documents(docs):
+    for doc in docs:
+        yield doc
+
+
+def encode(stream, docs, **options):
+    async def scenario():
+        return [chunk async for chunk in stream(documents(docs), **options)]
+
+    return asyncio.run(scenario())
+
+
+def test_ndjson_writes_one_object_per_document():
+    lines = b"".join(encode(ndjson_stream, DOCS)).decode().splitlines()
+
+    rows = [json.loads(line) for line in lines]
+    assert [list(row) for row in rows] == [EXPORT_FIELDS, EXPORT_FIELDS]
+    assert rows[0]["timestamp"] == "2026-03-01T09:30:00"
+    assert rows[1]["feedback_text"] == "Too many meetings,\nno focus time"
+    assert rows[1]["sentiment"] is None
+
+
+def test_csv_quotes_text_and_leaves_missing_values_empty():
+    rows = list(csv.reader(io.StringIO(b"".join(encode(csv_stream, DOCS)).decode())))
+
+    assert rows[0] == EXPORT_FIELDS
+    assert len(rows) == 3
+    assert rows[1][2] == 'Great team, "honest" leads'
+    assert rows[2][2] == "Too many meetings,\nno focus time"
+    assert rows[2][EXPORT_FIELDS.index("sentiment")] == ""
+    assert rows[1][EXPORT_FIELDS.index("timestamp")] == "2026-03-01T09:30:00"
+
+
+@pytest.mark.parametrize("stream", [ndjson_stream, csv_stream])
+def test_text_exports_are_yielded_in_bounded_chunks(stream, monkeypatch):
+    monkeypatch.setattr(feedback_export, "CHUNK_BYTES", 200)
+    docs = [dict(DOCS[0], id=f"fb-{n}") for n in range(20)]
+
+    chunks = encode(stream, docs)
+
+    assert len(chunks) > 1
+    assert sum(chunk.count(b"fb-") for chunk in chunks) == 20
+
+
+def test_parquet_writes_a_row_group_per_batch():
+    pq = pytest.importorskip("pyarrow.parquet")
+    docs = [dict(DOCS[n % 2], id=f"fb-{n}") for n in range(5)]
+
+    chunks = encode(parquet_stream, docs, row_group_size=2)
+
+    table_file = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert table_file.metadata.num_row_groups == 3
+    table = table_file.read()
+    assert table.column_names == EXPORT_FIELDS
+    assert table.column("id").to_pylist() == [f"fb-{n}" for n in range(5)]
+    assert table.column("timestamp").to_pylist()[0] == datetime(2026, 3, 1, 9, 30)
+    assert table.column("sentiment").to_pylist()[1] is None
+    assert len(chunks) == 3  # two full row groups streamed early, then the rest with the footer
+
+
+def export(server, **params):
+    httpx = pytest.importorskip("httpx")
+
+    async def request():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/api/feedback/export", params=params)
+
+    return asyncio.run(request())
+
+
+@pytest.mark.parametrize("params", [{"format": "xlsx"}, {"start_date": "last tuesday"}, {"end_date": "2026-13-01"}])
+def test_bad_format_or_date_is_rejected(server, params):
+    response = export(server, **params)
+
+    assert response.status_code == 400
+
+
+def test_export_reads_every_partition_in_the_range_oldest_first(server, monkeypatch):
+    pytest.importorskip("mongomock_motor")
+    from partitions import FeedbackStore
+
+    store = FeedbackStore(server.db, partitioned=True)
+    monkeypatch.setattr(server, "feedback_store", store)
+    monkeypatch.setattr(server, "EXPORT_BATCH_SIZE", 1)
+
+    asyncio.run(store.insert_many([
+        dict(DOCS[0], id="january", timestamp=datetime(2026, 1, 20)),
+        dict(DOCS[0], id="february", timestamp=datetime(2026, 2, 20)),
+        dict(DOCS[0], id="march-late", timestamp=datetime(2026, 3, 5)),
+        dict(DOCS[0], id="march-early", timestamp=datetime(2026, 3, 1)),
+    ]))
+
+    ndjson = export(server, start_date="2026-02-01T00:00:00", end_date="2026-03-31T00:00:00")
+    csv_export = export(server, format="csv", start_date="2026-02-01T00:00:00", departments="HR")
+    parquet = export(server, format="parquet", start_date="2026-02-01T00:00:00")
+
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="employee_feedback_' in ndjson.headers["content-disposition"]
+    assert [json.loads(line)["id"] for line in ndjson.text.splitlines()] == ["february", "march-early", "march-late"]
+    assert [row[0] for row in csv.reader(io.StringIO(csv_export.text))] == ["id", "february", "march-early", "march-late"]
+    if feedback_export.parquet_available():
+        import pyarrow.parquet as pq
+
+        assert pq.read_table(io.BytesIO(parquet.content)).column("id").to_pylist() == ["february", "march-early", "march-late"]
+    else:
+        assert parquet.status_code == 501
@@ -0,0 +1,82 @@
+"""Liveness and readiness probes around the startup warm-up"""
+import asyncio
+import json
+import logging
+
+import pytest
+
+
+@pytest.fixture
+def startup(server, monkeypatch):
+    """Run startup_db_client with stand-in warm-up steps, returning the readiness payload afterwards"""
+    monkeypatch.setattr(server, "startup_task", None)
+    monkeypatch.setattr(server, "startup_error", None)
+    monkeypatch.setattr(server, "rollups_built", False)
+    monkeypatch.setitem(server.readiness, "mongo", False)
+    monkeypatch.setitem(server.readiness, "llm", False)
+
+    def run(prepare_database):
+        async def prepare_llm():
+            server.readiness["llm"] = True
+
+        monkeypatch.setattr(server, "prepare_database", prepare_database)
+        monkeypatch.setattr(server, "prepare_llm", prepare_llm)
+
+        async def scenario():
+            await server.startup_db_client()
+            await asyncio.wait([server.startup_task])
+            await asyncio.sleep(0)  # let done callbacks run
+            response = await server.health_ready()
+            return response.status_code, json.loads(response.body)
+
+        return asyncio.run(scenario())
+
+    return run
+
+
+def test_ready_once_the_warm_up_has_finished_even_before_rollups_are_built(server, startup):
+    async def prepare_database():
+        server.readiness["mongo"] = True
+
+    status, payload = startup(prepare_database)
+
+    assert status == 200
+    assert payload == {"status": "ready", "checks": {"startup": True, "mongo": True, "llm": True}}
+
+
+def test_database_warm_up_does_not_wait_for_the_rollup_build(server, monkeypatch):
+    monkeypatch.setattr(server, "SENTIMENT_WORKER_POOL_SIZE", 0)
+    monkeypatch.setattr(server, "rollups_task", None)
+    monkeypatch.setitem(server.readiness, "mongo", False)
+
+    async def slow_rebuild():
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(server, "prepare_rollups", slow_rebuild)
+
+    async def scenario():
+        await asyncio.wait_for(server.prepare_database(), timeout=1)
+        building = not server.rollups_task.done()
+        server.rollups_task.cancel()
+        return building
+
+    assert asyncio.run(scenario())
+    assert server.readiness["mongo"]
+
+
+def test_failed_warm_up_is_logged_and_reported(server, startup, caplog):
+    async def prepare_database():
+        raise RuntimeError("could not create indexes")
+
+    with caplog.at_level(logging.ERROR):
+        status, payload = startup(prepare_database)
+
+    assert status == 503
+    assert payload["status"] == "failed"
+    assert payload["error"] == "could not create indexes"
+    assert payload["checks"]["startup"] is False
+    assert "could not create indexes" in caplog.text
+
+
+def test_liveness_does_not_depend_on_startup(server):
+    assert asyncio.run(server.health_live())["status"] == "alive"
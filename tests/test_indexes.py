@@ -0,0 +1,143 @@
+"""Check that the hot read queries are served by indexes (requires TEST_MONGO_URL)"""
+import asyncio
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+pymongo = pytest.importorskip("pymongo")
+motor_asyncio = pytest.importorskip("motor.motor_asyncio")
+
+from indexes import FEEDBACK_INDEXES, ensure_indexes  # noqa: E402
+
+TEST_MONGO_URL = os.environ.get("TEST_MONGO_URL")
+pytestmark = pytest.mark.skipif(not TEST_MONGO_URL, reason="TEST_MONGO_URL is not set")
+
+DEPARTMENTS = ["Engineering", "Sales", "HR", "Marketing"]
+SENTIMENTS = ["Positive", "Neutral", "Negative"]
+
+
+@pytest.fixture(scope="module")
+def feedback_db():
+    db_name = f"msemobora_index_test_{uuid.uuid4().hex[:8]}"
+    client = pymongo.MongoClient(TEST_MONGO_URL)
+    db = client[db_name]
+    now = datetime.utcnow()
+    db.employee_feedback.insert_many([
+        {
+            "id": str(uuid.uuid4()),
+            "feedback_text": f"feedback {i}",
+            "department": random.choice(DEPARTMENTS),
+            "sentiment": random.choice(SENTIMENTS),
+            "confidence_score": 0.9,
+            "timestamp": now - timedelta(minutes=i),
+            "processed": True,
+        }
+        for i in range(2000)
+    ])
+
+    async def create():
+        motor_client = motor_asyncio.AsyncIOMotorClient(TEST_MONGO_URL)
+        try:
+            await ensure_indexes(motor_client[db_name])
+        finally:
+            motor_client.close()
+
+    asyncio.run(create())
+    yield db
+    client.drop_database(db_name)
+    client.close()
+
+
+def plan_stages(explain):
+    """All plan stage names anywhere in an explain document"""
+    stages = []
+    if isinstance(explain, dict):
+        if "stage" in explain:
+            stages.append(explain["stage"])
+        for value in explain.values():
+            stages.extend(plan_stages(value))
+    elif isinstance(explain, list):
+        for value in explain:
+            stages.extend(plan_stages(value))
+    return stages
+
+
+def winning_stages(explain):
+    planner = explain.get("queryPlanner") or explain["stages"][0]["$cursor"]["queryPlanner"]
+    return plan_stages(planner["winningPlan"])
+
+
+def assert_index_scan(stages):
+    assert "COLLSCAN" not in stages, stages
+    assert {"IXSCAN", "DISTINCT_SCAN"} & set(stages), stages
+
+
+def test_ensure_indexes_is_idempotent(feedback_db):
+    client = motor_asyncio.AsyncIOMotorClient(TEST_MONGO_URL)
+    try:
+        asyncio.run(ensure_indexes(client[feedback_db.name]))
+    finally:
+        client.close()
+    names = set(feedback_db.employee_feedback.index_information())
+    assert {model.document["name"] for model in FEEDBACK_INDEXES} <= names
+
+
+@pytest.mark.parametrize("query", [
+    {},
+    {"department": "Sales"},
+    {"sentiment": "Negative"},
+    {"department": "Sales", "sentiment": "Negative"},
+])
+def test_get_feedback_uses_index(feedback_db, query):
+    explain = feedback_db.employee_feedback.find(query).sort([("timestamp", -1), ("id", -1)]).limit(100).explain()
+    stages = winning_stages(explain)
+    assert_index_scan(stages)
+    # The index also provides the order, so there is no in-memory sort
+    assert "SORT" not in stages, stages
+
+
+def test_feedback_cursor_page_uses_index(feedback_db):
+    last = feedback_db.employee_feedback.find({"department": "Sales"}).sort([("timestamp", -1), ("id", -1)]).skip(100).limit(1)[0]
+    query = {
+        "department": "Sales",
+        "$or": [
+            {"timestamp": {"$lt": last["timestamp"]}},
+            {"timestamp": last["timestamp"], "id": {"$lt": last["id"]}},
+        ],
+    }
+    explain = feedback_db.employee_feedback.find(query).sort([("timestamp", -1), ("id", -1)]).limit(100).explain()
+    stages = winning_stages(explain)
+    assert_index_scan(stages)
+    assert "SORT" not in stages, stages
+
+
+def test_dashboard_match_uses_index(feedback_db):
+    since = datetime.utcnow() - timedelta(days=1)
+    explain = feedback_db.command(
+        "aggregate",
+        "employee_feedback",
+        pipeline=[
+            {"$match": {"department": {"$in": ["Sales", "HR"]}, "timestamp": {"$gte": since}}},
+            {"$group": {"_id": {"department": "$department", "sentiment": "$sentiment"}, "count": {"$sum": 1}}},
+        ],
+        explain=True,
+    )
+    assert_index_scan(winning_stages(explain))
+
+
+def test_insights_negative_scan_uses_index(feedback_db):
+    explain = feedback_db.employee_feedback.find({"sentiment": "Negative"}).explain()
+    assert_index_scan(winning_stages(explain))
+
+
+def test_distinct_departments_uses_index(feedback_db):
+    explain = feedback_db.command({"explain": {"distinct": "employee_feedback", "key": "department"}})
+    assert_index_scan(winning_stages(explain))
+
+
+def test_sentiment_queue_claim_uses_index(feedback_db):
+    explain = feedback_db.employee_feedback.find({"processed": False}).sort("timestamp", 1).limit(1).explain()
+    assert_index_scan(winning_stages(explain))
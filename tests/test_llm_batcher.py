@@ -0,0 +1,88 @@
+"""Micro-batching of concurrent sentiment requests"""
+import asyncio
+import json
+
+import pytest
+
+from llm_batcher import MicroBatcher
+from llm_resilience import CircuitOpenError
+
+
+class FakeProvider:
+    """Batch and single calls that answer with the upper-cased item unless told otherwise"""
+
+    def __init__(self, batch_error=None, batch_results=None):
+        self.batch_error = batch_error
+        self.batch_results = batch_results
+        self.batches = []
+        self.singles = []
+
+    async def send_batch(self, items):
+        self.batches.append(list(items))
+        if self.batch_error is not None:
+            raise self.batch_error
+        if self.batch_results is not None:
+            return self.batch_results
+        return [item.upper() for item in items]
+
+    async def send_one(self, item):
+        self.singles.append(item)
+        return item.upper()
+
+
+def submit_all(batcher, items):
+    async def scenario():
+        results = await asyncio.gather(*(batcher.submit(item) for item in items), return_exceptions=True)
+        await batcher.close()
+        return results
+
+    return asyncio.run(scenario())
+
+
+def test_concurrent_items_share_one_batch():
+    provider = FakeProvider()
+    batcher = MicroBatcher(provider.send_batch, provider.send_one, max_items=4, max_wait_ms=5)
+
+    assert submit_all(batcher, ["a", "b", "c", "d", "e"]) == ["A", "B", "C", "D", "E"]
+    assert provider.batches == [["a", "b", "c", "d"]]
+    assert provider.singles == ["e"]
+    assert batcher.stats()["batches"] == 1
+
+
+def test_missing_answers_are_retried_individually():
+    provider = FakeProvider(batch_results=["A", None, "C"])
+    batcher = MicroBatcher(provider.send_batch, provider.send_one, max_items=3)
+
+    assert submit_all(batcher, ["a", "b", "c"]) == ["A", "B", "C"]
+    assert provider.singles == ["b"]
+    assert batcher.fallback_items == 1
+
+
+@pytest.mark.parametrize("error", [ValueError("no JSON array in batch response"), json.JSONDecodeError("bad", "[", 0)])
+def test_malformed_batch_answers_are_split_into_single_calls(error):
+    provider = FakeProvider(batch_error=error)
+    batcher = MicroBatcher(provider.send_batch, provider.send_one, max_items=2)
+
+    assert submit_all(batcher, ["a", "b"]) == ["A", "B"]
+    assert sorted(provider.singles) == ["a", "b"]
+
+
+@pytest.mark.parametrize("error", [asyncio.TimeoutError("budget"), CircuitOpenError("open"), ConnectionError("reset")])
+def test_provider_failures_fail_every_item_without_single_calls(error):
+    provider = FakeProvider(batch_error=error)
+    batcher = MicroBatcher(provider.send_batch, provider.send_one, max_items=3)
+
+    results = submit_all(batcher, ["a", "b", "c"])
+
+    assert all(result is error for result in results)
+    assert provider.singles == []
+    assert batcher.stats()["failed_items"] == 3
+
+
+def test_max_items_of_one_disables_batching():
+    provider = FakeProvider()
+    batcher = MicroBatcher(provider.send_batch, provider.send_one, max_items=1)
+
+    assert submit_all(batcher, ["a", "b"]) == ["A", "B"]
+    assert provider.batches == []
+    assert batcher.single_calls == 2
@@ -0,0 +1,209 @@
+"""Circuit breaker, adaptive concurrency limit and the guard around LLM calls"""
+import asyncio
+
+import pytest
+
+import llm_resilience
+from llm_resilience import (
+    AdaptiveLimit, CircuitBreaker, CircuitOpenError, ConcurrencyLimitError, HedgedCaller, LlmGuard, is_retryable
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_resilience.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_breaker_opens_once_the_failure_rate_is_reached(clock):
+    breaker = CircuitBreaker(failure_rate=0.5, window_size=10, min_calls=4, slow_call_seconds=5)
+    for ok in (True, False, True):
+        breaker.record(ok, 0.1)
+    assert breaker.state == "closed"
+
+    breaker.record(True, 6.0)  # slow calls count as failures
+
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_half_open_probe_closes_or_reopens_the_breaker(clock):
+    breaker = CircuitBreaker(min_calls=1, failure_rate=0.5, open_seconds=30)
+    breaker.record(False, 0.1)
+    clock[0] += 30
+
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record(False, 0.1)
+    assert breaker.state == "open"
+    assert breaker.times_opened == 2
+
+    clock[0] += 30
+    assert breaker.allow()
+    breaker.record(True, 0.1)
+    assert breaker.state == "closed"
+
+
+def test_released_probe_can_be_used_again(clock):
+    breaker = CircuitBreaker(min_calls=1, open_seconds=30)
+    breaker.record(False, 0.1)
+    clock[0] += 30
+
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_limit_grows_additively_and_halves_on_failure():
+    limit = AdaptiveLimit(initial=4, min_limit=1, max_limit=5, slow_call_seconds=5)
+    limit.record(True, 0.1)
+    assert limit.limit == 4.25  # +1/limit per good call
+    for _ in range(10):
+        limit.record(True, 0.1)
+    assert limit.limit == 5  # capped at max_limit
+    limit.record(True, 6.0)
+    assert limit.limit == 2.5
+    for _ in range(5):
+        limit.record(False, 0.1)
+    assert limit.limit == 1  # floored at min_limit
+
+
+def test_callers_over_the_limit_wait_and_then_give_up():
+    async def scenario():
+        limit = AdaptiveLimit(initial=1, max_limit=1, queue_timeout=0.05)
+        async with limit.slot():
+            with pytest.raises(ConcurrencyLimitError):
+                async with limit.slot():
+                    pass
+        async with limit.slot():
+            return limit.stats()
+
+    stats = asyncio.run(scenario())
+
+    assert stats["in_flight"] == 1
+    assert stats["rejected"] == 1
+
+
+def test_guard_records_outcomes_and_fails_fast_when_open():
+    async def failing():
+        raise ConnectionError("reset")
+
+    async def scenario():
+        guard = LlmGuard(CircuitBreaker(min_calls=2, failure_rate=0.5), AdaptiveLimit(initial=4))
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await guard.call(failing)
+        with pytest.raises(CircuitOpenError):
+            await guard.call(failing)
+        with pytest.raises(CircuitOpenError):
+            guard.check()
+        return guard.stats()
+
+    stats = asyncio.run(scenario())
+
+    assert stats["breaker"]["state"] == "open"
+    assert stats["concurrency"]["limit"] == 1
+    assert stats["concurrency"]["in_flight"] == 0
+
+
+def test_cancelled_calls_are_not_recorded():
+    async def scenario():
+        guard = LlmGuard(CircuitBreaker(min_calls=1), AdaptiveLimit(initial=4))
+        call = asyncio.ensure_future(guard.call(lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0.01)
+        call.cancel()
+        await asyncio.gather(call, return_exceptions=True)
+        return guard.stats()
+
+    stats = asyncio.run(scenario())
+
+    assert stats["breaker"]["state"] == "closed"
+    assert stats["breaker"]["window_calls"] == 0
+    assert stats["concurrency"]["limit"] == 4
+
+
+def new_caller(**options) -> HedgedCaller:
+    guard = LlmGuard(CircuitBreaker(min_calls=100), AdaptiveLimit(initial=8, max_limit=8))
+    options = {"budget_seconds": 1.0, "hedge": False, "backoff_base": 0.001, "backoff_max": 0.001, **options}
+    return HedgedCaller(guard, **options)
+
+
+class ScriptedCalls:
+    """Each call takes the next (delay, outcome) step; an exception outcome is raised"""
+
+    def __init__(self, *steps):
+        self.steps = list(steps)
+        self.calls = 0
+
+    async def __call__(self):
+        delay, outcome = self.steps[min(self.calls, len(self.steps) - 1)]
+        self.calls += 1
+        await asyncio.sleep(delay)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def test_provider_timeouts_are_retried_and_recorded_once():
+    caller = new_caller()
+    fn = ScriptedCalls((0, TimeoutError("read timed out")), (0, "ok"))
+
+    assert asyncio.run(caller.call(fn)) == "ok"
+
+    assert fn.calls == 2
+    assert (caller.retries, caller.timeouts, caller.failures) == (1, 0, 0)
+    breaker = caller.guard.breaker.stats()
+    assert breaker["window_calls"] == 2
+    assert breaker["window_failure_rate"] == 0.5
+
+
+def test_running_out_of_budget_is_a_timeout_recorded_once():
+    caller = new_caller(budget_seconds=0.05)
+    fn = ScriptedCalls((1.0, "too late"))
+
+    with pytest.raises(asyncio.TimeoutError, match="budget"):
+        asyncio.run(caller.call(fn))
+
+    assert (caller.timeouts, caller.failures, caller.retries) == (1, 1, 0)
+    assert caller.guard.breaker.stats()["window_calls"] == 1
+
+
+def test_non_retryable_errors_are_raised_at_once():
+    class BadRequestError(Exception):
+        status_code = 400
+
+    caller = new_caller()
+    fn = ScriptedCalls((0, BadRequestError("invalid prompt")))
+
+    with pytest.raises(BadRequestError):
+        asyncio.run(caller.call(fn))
+
+    assert fn.calls == 1
+    assert not is_retryable(BadRequestError())
+    assert is_retryable(TimeoutError()) and is_retryable(ConnectionError())
+
+
+def test_retries_stop_after_max_attempts():
+    caller = new_caller(max_attempts=3)
+    fn = ScriptedCalls((0, ConnectionError("reset")))
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(caller.call(fn))
+
+    assert fn.calls == 3
+    assert (caller.retries, caller.failures) == (2, 1)
+
+
+def test_slow_primary_is_hedged_and_the_hedge_wins():
+    caller = new_caller(hedge=True, hedge_min_delay=0.01)
+    for _ in range(20):
+        caller._tracker("single").observe(0.001)
+    fn = ScriptedCalls((0.5, "primary"), (0, "hedge"))
+
+    assert asyncio.run(caller.call(fn, kind="single")) == "hedge"
+
+    assert (caller.hedges, caller.hedge_wins) == (1, 1)
+    assert caller.guard.limiter.in_flight == 0
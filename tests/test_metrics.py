@@ -0,0 +1,62 @@
+"""Prometheus text exposition for one process and for several workers"""
+from metrics import Registry, sample_lines
+
+
+def new_registry():
+    registry = Registry()
+    counter = registry.counter("analyses_total", "Analyses by outcome", ("outcome",))
+    histogram = registry.histogram("call_seconds", "Call latency", buckets=(0.1, 1.0))
+    return registry, counter, histogram
+
+
+def samples(text: str):
+    return [line for line in text.splitlines() if not line.startswith("#")]
+
+
+def test_a_single_process_renders_unlabelled_series():
+    registry, counter, histogram = new_registry()
+    counter.inc("success", amount=3)
+    histogram.observe(0.5)
+
+    assert samples(registry.render()) == [
+        'analyses_total{outcome="success"} 3',
+        'call_seconds_bucket{le="0.1"} 0',
+        'call_seconds_bucket{le="1.0"} 1',
+        'call_seconds_bucket{le="+Inf"} 1',
+        "call_seconds_sum 0.5",
+        "call_seconds_count 1",
+    ]
+
+
+def test_workers_keep_their_own_series_instead_of_a_sum():
+    registry, counter, histogram = new_registry()
+    counter.inc("success", amount=3)
+    peer_registry, peer_counter, peer_histogram = new_registry()
+    peer_counter.inc("success", amount=5)
+    peer_histogram.observe(2.0)
+
+    text = registry.render(peers=[("host:2", peer_registry.snapshot())], worker="host:1")
+
+    assert text.count("# TYPE analyses_total counter") == 1
+    assert samples(text) == [
+        'analyses_total{outcome="success",worker="host:1"} 3',
+        'analyses_total{outcome="success",worker="host:2"} 5',
+        'call_seconds_bucket{worker="host:2",le="0.1"} 0',
+        'call_seconds_bucket{worker="host:2",le="1.0"} 0',
+        'call_seconds_bucket{worker="host:2",le="+Inf"} 1',
+        'call_seconds_sum{worker="host:2"} 2.0',
+        'call_seconds_count{worker="host:2"} 1',
+    ]
+
+
+def test_peer_histograms_with_other_buckets_are_skipped():
+    registry, _, _ = new_registry()
+
+    text = registry.render(peers=[("host:2", {"call_seconds": [[[], [1, 0], 0.05]]})], worker="host:1")
+
+    assert not any(line.startswith("call_seconds") for line in samples(text))
+
+
+def test_extra_samples_carry_the_worker_label_only_with_several_workers():
+    assert sample_lines("llm_retries_total", "counter", "Retries", 2)[-1] == "llm_retries_total 2"
+    assert sample_lines("llm_retries_total", "counter", "Retries", 2, "host:1")[-1] == 'llm_retries_total{worker="host:1"} 2'
@@ -0,0 +1,150 @@
+"""Monthly feedback partitions: routing, source pruning, reads across partitions and archiving"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from pymongo.errors import BulkWriteError  # noqa: E402
+
+from partitions import FeedbackStore, add_months, month_start  # noqa: E402
+
+SORT = [("timestamp", -1), ("id", -1)]
+PROJECTION = {"_id": 0, "id": 1, "timestamp": 1}
+
+
+def months_ago(count: int, day: int = 10) -> datetime:
+    return add_months(month_start(datetime.utcnow()), -count).replace(day=day, hour=12)
+
+
+def store_name(count: int) -> str:
+    return f"employee_feedback_{months_ago(count):%Y%m}"
+
+
+def feedback(doc_id: str, timestamp: datetime, **fields):
+    return {"id": doc_id, "feedback_text": doc_id, "department": "HR", "timestamp": timestamp, "processed": True, **fields}
+
+
+def run(scenario):
+    db = mongomock_motor.AsyncMongoMockClient()["partitions_test"]
+    return asyncio.run(scenario(db, FeedbackStore(db, partitioned=True)))
+
+
+def test_documents_are_written_to_their_month_partition():
+    async def scenario(db, store):
+        await store.insert_one(feedback("old", months_ago(2)))
+        await store.insert_many([feedback("new", months_ago(0)), feedback("newer", months_ago(0, day=11))])
+        return sorted(await db.list_collection_names())
+
+    assert run(scenario) == sorted([store_name(2), store_name(0)])
+
+
+def test_sources_only_cover_partitions_overlapping_the_range():
+    async def scenario(db, store):
+        for count in range(4):
+            await store.insert_one(feedback(f"m{count}", months_ago(count)))
+        await store.refresh(force=True)
+        recent = await store.sources({"timestamp": {"$gte": months_ago(1, day=1)}})
+        cursor_page = await store.sources({}, end=months_ago(2, day=20))
+        everything = await store.sources({})
+        return [[collection.name for collection, _ in sources] for sources in (recent, cursor_page, everything)]
+
+    recent, cursor_page, everything = run(scenario)
+
+    assert recent == [store_name(0), store_name(1)]
+    assert cursor_page == [store_name(2), store_name(3)]
+    assert everything == [store_name(count) for count in range(4)]
+
+
+def test_find_newest_reads_partitions_newest_first_until_the_limit():
+    async def scenario(db, store):
+        await store.insert_many([feedback(f"fb-{n}", months_ago(n // 2, day=10 + n % 2)) for n in range(6)])
+        await store.refresh(force=True)
+        return (
+            await store.find_newest({}, PROJECTION, SORT, 3),
+            await store.find_newest({}, PROJECTION, SORT, 100),
+        )
+
+    first_three, everything = run(scenario)
+
+    assert [doc["id"] for doc in first_three] == ["fb-1", "fb-0", "fb-3"]
+    assert [doc["id"] for doc in everything] == ["fb-1", "fb-0", "fb-3", "fb-2", "fb-5", "fb-4"]
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_find_newest_without_a_positive_limit_reads_nothing(limit):
+    async def scenario(db, store):
+        async def no_sources(*args, **kwargs):
+            raise AssertionError("sources() should not be consulted")
+
+        await store.insert_one(feedback("fb", months_ago(0)))
+        store.sources = no_sources
+        return await store.find_newest({}, PROJECTION, SORT, limit)
+
+    assert run(scenario) == []
+
+
+def test_insert_many_reports_errors_at_their_position_in_the_batch():
+    async def scenario(db, store):
+        await store.insert_one(feedback("taken", months_ago(0)))
+        docs = [feedback("a", months_ago(1)), feedback("taken", months_ago(0)), feedback("b", months_ago(1))]
+        with pytest.raises(BulkWriteError) as raised:
+            await store.insert_many(docs)
+        return raised.value.details
+
+    details = run(scenario)
+
+    assert [error["index"] for error in details["writeErrors"]] == [1]
+    assert details["nInserted"] == 2
+
+
+def test_queue_view_claims_the_oldest_unprocessed_document_across_partitions():
+    async def scenario(db, store):
+        await store.insert_many([
+            feedback("this-month", months_ago(0), processed=False),
+            feedback("last-month", months_ago(1), processed=False),
+        ])
+        queue = store.queue
+        claimed = await queue.find_one_and_update({"processed": False}, {"$set": {"processed": True}})
+        return claimed["id"], await queue.count_documents({"processed": False})
+
+    assert run(scenario) == ("last-month", 1)
+
+
+def test_archived_months_are_read_from_the_archive_up_to_the_boundary():
+    async def scenario(db, store):
+        await store.insert_many([feedback("archived", months_ago(3), analysis_attempts=1), feedback("live", months_ago(0))])
+        moved = await store.archive(before=months_ago(1, day=1))
+        names = [collection.name for collection, _ in await store.sources({})]
+        docs = await store.find_newest({}, {"_id": 0}, SORT, 10)
+        return moved, names, docs
+
+    moved, names, docs = run(scenario)
+
+    assert moved == {f"{months_ago(3):%Y-%m}": 1}
+    assert names[-1] == "employee_feedback_archive"
+    assert store_name(3) not in names
+    assert [doc["id"] for doc in docs] == ["live", "archived"]
+    assert "analysis_attempts" not in docs[1]
+
+
+def test_unpartitioned_store_uses_one_collection():
+    async def scenario(db, store):
+        store = FeedbackStore(db)
+        await store.insert_one(feedback("fb", datetime.utcnow() - timedelta(days=90)))
+        return [collection.name for collection, _ in await store.sources({})], await db.list_collection_names()
+
+    assert run(scenario) == (["employee_feedback"], ["employee_feedback"])
+
+
+@pytest.mark.parametrize("limit", [0, 100000])
+def test_get_feedback_rejects_limits_out_of_range(server, limit):
+    httpx = pytest.importorskip("httpx")
+
+    async def request():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/api/feedback", params={"limit": limit})
+
+    assert asyncio.run(request()).status_code == 422
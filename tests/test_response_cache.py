@@ -0,0 +1,118 @@
+"""Serialized response cache: keys, versions, TTL, LRU and conditional GETs"""
+import asyncio
+import gzip
+
+import pytest
+
+import response_cache
+from response_cache import ResponseCache, etag_for, etag_matches, gzip_etag, normalize_params
+
+
+def test_params_are_normalized_into_one_key():
+    assert normalize_params({"departments": "Sales, HR", "start_date": None, "end_date": ""}) == \
+        normalize_params({"departments": "HR,Sales"})
+    assert ResponseCache.key("dashboard", {"b": 1, "a": 2}) == ResponseCache.key("dashboard", {"a": 2, "b": 1})
+    assert ResponseCache.key("dashboard", {"a": 1}) != ResponseCache.key("insights", {"a": 1})
+
+
+def test_etag_comparison_is_weak_and_accepts_lists():
+    etag = etag_for(b"body")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_gzip_coding_has_its_own_etag_that_also_matches():
+    etag = etag_for(b"body")
+    assert gzip_etag(etag) != etag
+    assert gzip_etag(etag).startswith('"') and gzip_etag(etag).endswith('-gz"')
+    assert etag_matches(gzip_etag(etag), etag)
+    assert etag_matches(f"W/{gzip_etag(etag)}", etag)
+
+
+def test_a_newer_version_is_a_miss():
+    cache = ResponseCache()
+    cache.put("k", 1, b"old")
+
+    assert cache.get("k", 1).body == b"old"
+    assert cache.get("k", 2) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    cache = ResponseCache(ttl_seconds=60)
+    cache.put("k", 1, b"body")
+
+    now[0] += 59
+    assert cache.get("k", 1) is not None
+    now[0] += 2
+    assert cache.get("k", 1) is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", 1, b"a")
+    cache.put("b", 1, b"b")
+    cache.get("a", 1)
+    cache.put("c", 1, b"c")
+
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) is not None
+    assert cache.get("c", 1) is not None
+
+
+def test_large_bodies_are_stored_compressed_once():
+    cache = ResponseCache(gzip_min_bytes=100)
+    small = cache.put("small", 1, b"x" * 10)
+    large = cache.put("large", 1, b"x" * 1000)
+
+    assert small.gzip_body is None
+    assert gzip.decompress(large.gzip_body) == b"x" * 1000
+
+
+def test_if_none_match_gets_304_until_feedback_changes(server):
+    httpx = pytest.importorskip("httpx")
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.get("/api/feedback")
+            etag = first.headers["etag"]
+            unchanged = await client.get("/api/feedback", headers={"If-None-Match": etag})
+            await client.post("/api/feedback", json={"feedback_text": "I love the team", "department": "HR"})
+            changed = await client.get("/api/feedback", headers={"If-None-Match": etag})
+            return first, unchanged, changed
+
+    first, unchanged, changed = asyncio.run(scenario())
+
+    assert first.status_code == 200 and first.json() == []
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+    assert [item["feedback_text"] for item in changed.json()] == ["I love the team"]
+
+
+def test_gzip_and_identity_responses_carry_different_etags(server, monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    monkeypatch.setattr(server.response_cache, "gzip_min_bytes", 1)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            gzipped = await client.get("/api/feedback", headers={"Accept-Encoding": "gzip"})
+            identity = await client.get("/api/feedback", headers={"Accept-Encoding": "identity"})
+            revalidated = await client.get(
+                "/api/feedback", headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["etag"]}
+            )
+            return gzipped, identity, revalidated
+
+    gzipped, identity, revalidated = asyncio.run(scenario())
+
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in identity.headers
+    assert gzipped.headers["etag"] == gzip_etag(identity.headers["etag"])
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == gzipped.headers["etag"]
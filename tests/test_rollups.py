@@ -0,0 +1,47 @@
+"""Dashboard reads fall back to raw feedback until the sentiment rollups are built"""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+
+def feedback(doc_id: str, department: str, sentiment: str):
+    return {"id": doc_id, "feedback_text": doc_id, "department": department, "sentiment": sentiment,
+            "timestamp": datetime.utcnow(), "processed": True}
+
+
+def get(server, *paths):
+    httpx = pytest.importorskip("httpx")
+
+    async def scenario():
+        await server.feedback_store.insert_many([
+            feedback("a", "HR", "Negative"), feedback("b", "HR", "Negative"), feedback("c", "Sales", "Positive"),
+        ])
+        # Counted by an increment before the first rebuild: only part of the existing feedback
+        await server.db.sentiment_rollups.insert_one(
+            {"department": "Sales", "day": datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0),
+             "sentiment": "Positive", "count": 1}
+        )
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return [(await client.get(path)).json() for path in paths]
+
+    return asyncio.run(scenario())
+
+
+def test_unbuilt_rollups_are_not_read_for_departments_or_insights(server, monkeypatch):
+    monkeypatch.setattr(server, "rollups_built", False)
+    monkeypatch.setitem(server.insights_cache, "version", None)
+
+    departments, insights = get(server, "/api/departments", "/api/insights")
+
+    assert sorted(departments["departments"]) == ["HR", "Sales"]
+    assert [insight["affected_departments"] for insight in insights] == [["HR"], ["HR", "Sales"]]
+
+
+def test_built_rollups_answer_departments(server, monkeypatch):
+    monkeypatch.setattr(server, "rollups_built", True)
+
+    departments, = get(server, "/api/departments")
+
+    assert departments["departments"] == ["Sales"]
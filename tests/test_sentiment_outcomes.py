@@ -0,0 +1,53 @@
+"""sentiment_analysis_total records exactly one outcome per analysis handed out"""
+import asyncio
+from collections import Counter
+
+
+def outcome_counts(server) -> Counter:
+    return Counter({labels[0]: value for labels, value in server.metrics.SENTIMENT_OUTCOMES.snapshot()})
+
+
+def analyze(server, *texts):
+    async def scenario():
+        return await asyncio.gather(*(server.analyze_sentiment_with_llm(text) for text in texts))
+
+    return asyncio.run(scenario())
+
+
+def test_unparseable_answer_counts_once_then_hits_the_cache(server, llm_chat):
+    llm_chat.respond = lambda text: "Overall this reads as Positive."
+    before = outcome_counts(server)
+
+    first, second = analyze(server, "The offsite was fun"), analyze(server, "The offsite was fun")
+
+    assert first[0].sentiment == second[0].sentiment == "Positive"
+    assert outcome_counts(server) - before == Counter({"json_parse_fallback": 1, "cache_hit": 1})
+    assert "outcome" not in first[0].model_dump()
+
+
+def test_joined_callers_are_counted_as_coalesced(server, llm_chat):
+    async def slow_reply(text):
+        await asyncio.sleep(0.05)
+        return '{"sentiment": "Negative", "confidence_score": 0.9, "reasoning": "test"}'
+
+    llm_chat.respond = slow_reply
+    before = outcome_counts(server)
+
+    results = analyze(server, *["Too many meetings"] * 4)
+
+    assert {result.sentiment for result in results} == {"Negative"}
+    assert len(llm_chat.prompts) == 1
+    assert outcome_counts(server) - before == Counter({"success": 1, "coalesced": 3})
+
+
+def test_provider_failure_counts_only_the_keyword_fallback(server, llm_chat):
+    def unavailable(text):
+        raise ValueError("provider rejected the request")
+
+    llm_chat.respond = unavailable
+    before = outcome_counts(server)
+
+    result, = analyze(server, "I hate the commute")
+
+    assert result.tier == "fallback"
+    assert outcome_counts(server) - before == Counter({"keyword_fallback": 1})
@@ -0,0 +1,119 @@
+"""Retries and the final keyword fallback of the background sentiment workers"""
+import asyncio
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from sentiment_worker import SentimentWorkerPool  # noqa: E402
+
+
+def fake_analysis(sentiment: str, tier: str) -> SimpleNamespace:
+    return SimpleNamespace(sentiment=sentiment, confidence_score=0.9, tier=tier)
+
+
+class FlakyAnalyzer:
+    """Raises for the first `failures` calls, then answers Positive"""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    async def __call__(self, text: str):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("provider unavailable")
+        return fake_analysis("Positive", "llm")
+
+
+async def drain(pool: SentimentWorkerPool, collection, doc_id: str, rounds: int):
+    """Claim and process the document up to `rounds` times, as a worker loop would"""
+    for _ in range(rounds):
+        doc = await pool._claim("test-worker")
+        if doc is None:
+            break
+        await pool._process(doc)
+    return await collection.find_one({"id": doc_id})
+
+
+def run_pool(analyze, max_attempts: int, fallback=None, rounds: int = 5):
+    async def scenario():
+        collection = mongomock_motor.AsyncMongoMockClient()["worker_test"]["employee_feedback"]
+        doc_id = str(uuid.uuid4())
+        await collection.insert_one({
+            "id": doc_id,
+            "feedback_text": "I love working here",
+            "timestamp": datetime.utcnow(),
+            "processed": False,
+        })
+        pool = SentimentWorkerPool(collection, analyze, max_attempts=max_attempts, retry_backoff=0, fallback=fallback)
+        return pool, await drain(pool, collection, doc_id, rounds)
+
+    return asyncio.run(scenario())
+
+
+def test_failed_attempts_are_retried_until_one_succeeds():
+    analyzer = FlakyAnalyzer(failures=2)
+
+    pool, doc = run_pool(analyzer, max_attempts=3, fallback=lambda text: fake_analysis("Neutral", "fallback"))
+
+    assert analyzer.calls == 3
+    assert (doc["processed"], doc["sentiment"], doc["analysis_tier"]) == (True, "Positive", "llm")
+    assert doc["analysis_attempts"] == 3
+    assert "analysis_error" not in doc
+    assert (pool.retry_count, pool.fallback_count, pool.failed_count) == (2, 0, 0)
+
+
+def test_fallback_answers_only_after_the_last_attempt():
+    analyzer = FlakyAnalyzer(failures=10)
+
+    pool, doc = run_pool(analyzer, max_attempts=3, fallback=lambda text: fake_analysis("Neutral", "fallback"))
+
+    assert analyzer.calls == 3
+    assert (doc["processed"], doc["sentiment"], doc["analysis_tier"]) == (True, "Neutral", "fallback")
+    assert (pool.retry_count, pool.fallback_count, pool.failed_count) == (2, 1, 0)
+
+
+def test_without_fallback_the_document_becomes_a_dead_letter():
+    analyzer = FlakyAnalyzer(failures=10)
+
+    pool, doc = run_pool(analyzer, max_attempts=2)
+
+    assert analyzer.calls == 2
+    assert doc["processed"] is False
+    assert doc["analysis_error"] == "provider unavailable"
+    assert (pool.retry_count, pool.failed_count) == (1, 1)
+
+
+def test_a_failure_after_the_lease_expired_leaves_the_next_claim_alone():
+    async def scenario():
+        collection = mongomock_motor.AsyncMongoMockClient()["worker_test"]["employee_feedback"]
+        await collection.insert_one({"id": "fb", "feedback_text": "I love working here", "timestamp": datetime.utcnow(), "processed": False})
+        slow = SentimentWorkerPool(collection, FlakyAnalyzer(failures=10), max_attempts=3, retry_backoff=0)
+        fast = SentimentWorkerPool(collection, FlakyAnalyzer(failures=0), max_attempts=3)
+        stale = await slow._claim("slow-worker")
+        await collection.update_one({"id": "fb"}, {"$set": {"analysis_lease_until": datetime.utcnow()}})
+        await fast._process(await fast._claim("fast-worker"))
+        await slow._process(stale)
+        return await collection.find_one({"id": "fb"})
+
+    doc = asyncio.run(scenario())
+
+    assert (doc["processed"], doc["sentiment"]) == (True, "Positive")
+    assert "analysis_error" not in doc
+    assert "analysis_lease_until" not in doc
+
+
+def test_strict_analysis_raises_instead_of_falling_back(server, llm_chat):
+    def unavailable(text):
+        raise ValueError("provider rejected the request")
+
+    llm_chat.respond = unavailable
+
+    with pytest.raises(ValueError):
+        asyncio.run(server.analyze_sentiment_with_llm("The rota is fine I suppose", fallback=False))
+    analysis = asyncio.run(server.analyze_sentiment_with_llm("The rota is fine I suppose"))
+    assert analysis.tier == "fallback"
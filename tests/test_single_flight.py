@@ -0,0 +1,84 @@
+"""Coalescing of concurrent identical calls"""
+import asyncio
+
+from single_flight import SingleFlight
+
+
+class Gate:
+    """A call that blocks until released, counting how often it ran"""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.runs = 0
+        self.released = asyncio.Event()
+
+    async def __call__(self):
+        self.runs += 1
+        await self.released.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def test_concurrent_callers_share_one_execution():
+    async def scenario():
+        flights, gate = SingleFlight(), Gate(result="positive")
+        callers = [asyncio.ensure_future(flights.do("same text", gate)) for _ in range(5)]
+        await asyncio.sleep(0)
+        gate.released.set()
+        return flights, gate, await asyncio.gather(*callers)
+
+    flights, gate, results = asyncio.run(scenario())
+
+    assert results == ["positive"] * 5
+    assert gate.runs == 1
+    assert flights.stats() == {"in_flight": 0, "calls": 5, "executions": 1, "coalesced": 4, "coalesced_ratio": 0.8}
+
+
+def test_different_keys_and_later_calls_run_separately():
+    async def scenario():
+        flights = SingleFlight()
+        runs = []
+
+        async def fn(value):
+            runs.append(value)
+            return value
+
+        await asyncio.gather(flights.do("a", lambda: fn("a")), flights.do("b", lambda: fn("b")))
+        await flights.do("a", lambda: fn("a again"))
+        return runs
+
+    assert asyncio.run(scenario()) == ["a", "b", "a again"]
+
+
+def test_errors_are_shared_and_not_remembered():
+    async def scenario():
+        flights, gate = SingleFlight(), Gate(error=RuntimeError("provider down"))
+        callers = [asyncio.ensure_future(flights.do("k", gate)) for _ in range(3)]
+        await asyncio.sleep(0)
+        gate.released.set()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+        return results, await flights.do("k", lambda: asyncio.sleep(0, result="recovered"))
+
+    results, retried = asyncio.run(scenario())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert retried == "recovered"
+
+
+def test_a_cancelled_caller_does_not_cancel_the_shared_call():
+    async def scenario():
+        flights, gate = SingleFlight(), Gate(result="done")
+        leaver = asyncio.ensure_future(flights.do("k", gate))
+        stayer = asyncio.ensure_future(flights.do("k", gate))
+        await asyncio.sleep(0)
+        leaver.cancel()
+        await asyncio.sleep(0)
+        gate.released.set()
+        return leaver, await stayer
+
+    leaver, result = asyncio.run(scenario())
+
+    assert leaver.cancelled()
+    assert result == "done"
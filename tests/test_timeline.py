@@ -0,0 +1,100 @@
+"""Sentiment timeline buckets across granularities and timezones"""
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from timeline import DEFAULT_BUCKETS, bucket_labels, build_timeline, resolve_range, resolve_timezone, truncate
+
+UTC = resolve_timezone("UTC")
+NAIROBI = resolve_timezone("Africa/Nairobi")  # UTC+3, no DST
+BERLIN = resolve_timezone("Europe/Berlin")
+
+
+@pytest.mark.parametrize("granularity, expected", [
+    ("hour", datetime(2026, 3, 11, 14)),
+    ("day", datetime(2026, 3, 11)),
+    ("week", datetime(2026, 3, 9)),  # weeks start on Monday
+    ("month", datetime(2026, 3, 1)),
+])
+def test_truncate_to_the_start_of_the_bucket(granularity, expected):
+    assert truncate(datetime(2026, 3, 11, 14, 35, 12), granularity) == expected
+
+
+def test_default_range_covers_whole_buckets_in_the_local_timezone():
+    now = datetime(2026, 3, 11, 22, 30)  # already 01:30 on the 12th in Nairobi
+
+    start, end = resolve_range(None, None, "day", NAIROBI, now=now)
+
+    assert end == now
+    assert start == datetime(2026, 3, 5, 21)  # local midnight on the 6th, in naive UTC
+    assert len(bucket_labels(start, end, "day", NAIROBI)) == DEFAULT_BUCKETS["day"]
+
+
+def test_explicit_bounds_are_converted_to_naive_utc():
+    start, end = resolve_range(
+        datetime(2026, 1, 1, 3, tzinfo=timezone.utc).astimezone(NAIROBI), datetime(2026, 2, 1), "month", NAIROBI
+    )
+
+    assert (start, end) == (datetime(2026, 1, 1, 3), datetime(2026, 2, 1))
+
+
+def test_month_labels_roll_over_the_year():
+    assert bucket_labels(datetime(2025, 11, 20), datetime(2026, 2, 3), "month", UTC) == \
+        ["2025-11", "2025-12", "2026-01", "2026-02"]
+
+
+def test_hours_skipped_by_daylight_saving_get_no_bucket():
+    # Clocks in Berlin jump from 02:00 to 03:00 on 29 March 2026 (01:00 UTC)
+    labels = bucket_labels(datetime(2026, 3, 28, 23), datetime(2026, 3, 29, 3), "hour", BERLIN)
+
+    assert labels == ["2026-03-29T00:00", "2026-03-29T01:00", "2026-03-29T03:00", "2026-03-29T04:00", "2026-03-29T05:00"]
+
+
+def test_hours_repeated_by_daylight_saving_share_one_bucket():
+    # Clocks in Berlin go back from 03:00 to 02:00 on 25 October 2026 (01:00 UTC)
+    labels = bucket_labels(datetime(2026, 10, 24, 23), datetime(2026, 10, 25, 2), "hour", BERLIN)
+
+    assert labels == ["2026-10-25T01:00", "2026-10-25T02:00", "2026-10-25T03:00"]
+
+
+def test_too_many_buckets_is_rejected():
+    with pytest.raises(ValueError):
+        bucket_labels(datetime(2000, 1, 1), datetime(2026, 1, 1), "hour", UTC)
+
+
+@pytest.mark.parametrize("name", ["Mars/Olympus_Mons", "localtime", "posixrules", "Factory", "posix/Europe/Berlin"])
+def test_names_mongo_does_not_know_are_rejected(name):
+    with pytest.raises(ValueError):
+        resolve_timezone(name)
+
+
+def test_dashboard_answers_400_for_a_non_olson_timezone(server):
+    httpx = pytest.importorskip("httpx")
+
+    async def request():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/api/dashboard", params={"timezone": "localtime"})
+
+    response = asyncio.run(request())
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown timezone: localtime"
+
+
+def test_grouped_rows_fill_every_bucket_in_the_local_timezone():
+    rows = [
+        # Buckets come back from $dateTrunc as the UTC instant of local midnight
+        {"_id": {"bucket": datetime(2026, 3, 9, 21), "sentiment": "Positive"}, "count": 2},
+        {"_id": {"bucket": datetime(2026, 3, 9, 21), "sentiment": "Negative"}, "count": 1},
+        {"_id": {"bucket": datetime(2026, 3, 11, 21), "sentiment": "Neutral"}, "count": 4},
+    ]
+
+    timeline = build_timeline(rows, datetime(2026, 3, 9, 21), datetime(2026, 3, 12, 20), "day", NAIROBI)
+
+    assert timeline == [
+        {"date": "2026-03-10", "positive": 2, "neutral": 0, "negative": 1},
+        {"date": "2026-03-11", "positive": 0, "neutral": 0, "negative": 0},
+        {"date": "2026-03-12", "positive": 0, "neutral": 4, "negative": 0},
+    ]
@@ -0,0 +1,79 @@
+"""Write-behind batching of single feedback inserts"""
+import asyncio
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from write_buffer import WriteBuffer  # noqa: E402
+
+
+def new_collection():
+    return mongomock_motor.AsyncMongoMockClient()["write_buffer_test"]["employee_feedback"]
+
+
+def test_concurrent_inserts_are_written_in_batches():
+    flushed = []
+
+    async def on_flushed(docs):
+        flushed.append([doc["id"] for doc in docs])
+
+    async def scenario():
+        collection = new_collection()
+        buffer = WriteBuffer(collection, max_docs=3, max_wait_ms=5, on_flushed=on_flushed)
+        await asyncio.gather(*(buffer.insert({"id": f"fb-{n}"}) for n in range(5)))
+        return buffer, await collection.count_documents({})
+
+    buffer, stored = asyncio.run(scenario())
+
+    assert stored == 5
+    assert sorted(len(batch) for batch in flushed) == [2, 3]
+    assert buffer.stats()["flushes"] == 2
+    assert (buffer.inserted, buffer.failed) == (5, 0)
+
+
+def test_only_the_rejected_document_raises():
+    async def scenario():
+        collection = new_collection()
+        await collection.create_index("id", unique=True)
+        await collection.insert_one({"id": "taken"})
+        buffer = WriteBuffer(collection, max_docs=3)
+        results = await asyncio.gather(
+            buffer.insert({"id": "a"}), buffer.insert({"id": "taken"}), buffer.insert({"id": "b"}),
+            return_exceptions=True
+        )
+        return buffer, results, sorted(doc["id"] for doc in await collection.find({}).to_list(None))
+
+    buffer, results, stored = asyncio.run(scenario())
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], RuntimeError)
+    assert stored == ["a", "b", "taken"]
+    assert (buffer.inserted, buffer.failed) == (2, 1)
+
+
+def test_a_failed_batch_fails_every_caller():
+    class Unavailable:
+        async def insert_many(self, docs, ordered=True):
+            raise ConnectionError("primary stepped down")
+
+    async def scenario():
+        buffer = WriteBuffer(Unavailable(), max_docs=2)
+        return await asyncio.gather(buffer.insert({"id": "a"}), buffer.insert({"id": "b"}), return_exceptions=True)
+
+    assert all(isinstance(result, ConnectionError) for result in asyncio.run(scenario()))
+
+
+def test_close_writes_what_is_buffered_and_refuses_more():
+    async def scenario():
+        collection = new_collection()
+        buffer = WriteBuffer(collection, max_docs=100, max_wait_ms=10_000)
+        waiting = asyncio.ensure_future(buffer.insert({"id": "late"}))
+        await asyncio.sleep(0)
+        await buffer.close()
+        await waiting
+        with pytest.raises(RuntimeError):
+            await buffer.insert({"id": "after close"})
+        return await collection.count_documents({})
+
+    assert asyncio.run(scenario()) == 1